@@ -3,5 +3,6 @@ API routes package.
 """
 from .video import router as video_router
 from .jobs import router as jobs_router
+from .metrics import router as metrics_router
 
-__all__ = ["video_router", "jobs_router"]
+__all__ = ["video_router", "jobs_router", "metrics_router"]
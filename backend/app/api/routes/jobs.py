@@ -3,15 +3,21 @@ Job management API routes.
 """
 import logging
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import String, desc, literal, or_, select, tuple_, type_coerce, update
 from pydantic import BaseModel
 
-from ...core.database import get_db
-from ...models import VideoJob, JobStatus
-from ...services import FileManager
+from ...core.database import get_async_db
+from ...models import VideoJob, JobStatus, ArchivedJob
+from ...services.executors import run_blocking, io_executor
+from ...services.job_stats import get_job_stats, count_jobs
+from ...services.leader import NotLeaderError
+from ...services.job_processor import (
+    job_queue, video_pipeline, file_manager, result_cache, progress_registry, retention_manager, disk_quota,
+    notify_job_cancelled
+)
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +38,14 @@ class JobListResponse(BaseModel):
     total: int
     page: int
     per_page: int
+    next_cursor: Optional[str] = None
+
+class ProcessingTimeStats(BaseModel):
+    count: int
+    mean: float
+    p50: float
+    p90: float
+    p99: float
 
 class SystemStatsResponse(BaseModel):
     total_jobs: int
@@ -39,48 +53,94 @@ class SystemStatsResponse(BaseModel):
     processing_jobs: int
     completed_jobs: int
     failed_jobs: int
+    cancelled_jobs: int
+    success_rate: float
+    average_processing_time: Optional[float]
+    processing_time: Optional[ProcessingTimeStats]
     disk_usage: dict
+    queue: dict
+    cache: dict
+    progress: dict
+    retention: dict
+    quota: dict
+
 
-# Global service instances
-file_manager = FileManager()
+def _parse_cursor(after: str) -> Tuple[str, int]:
+    """
+    Split a listing cursor into its created_at key and job row id.
+    
+    Args:
+        after: Cursor in the form ``<created_at>,<id>``
+        
+    Returns:
+        Tuple of (created_at as stored, row id)
+    """
+    created_at_key, _, row_id = after.rpartition(",")
+    if not created_at_key or not row_id.isdigit():
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {after}")
+    return created_at_key, int(row_id)
 
 
 @router.get("/", response_model=JobListResponse)
 async def list_jobs(
-    page: int = Query(1, ge=1, description="Page number"),
+    page: int = Query(1, ge=1, description="Page number (ignored when after is given)"),
     per_page: int = Query(10, ge=1, le=100, description="Items per page"),
     status: Optional[str] = Query(None, description="Filter by status"),
-    db: Session = Depends(get_db)
+    after: Optional[str] = Query(None, description="Cursor from next_cursor of the previous page"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    List video processing jobs with pagination.
+    List video processing jobs, newest first.
+    
+    Pass ``next_cursor`` back as ``after`` to fetch the following page;
+    cursor pages cost the same however deep they are, while ``page``
+    offsets scan every skipped row.
     
     Args:
         page: Page number (1-based)
         per_page: Number of items per page
         status: Optional status filter
+        after: Optional cursor of the last job already seen
         db: Database session
         
     Returns:
         Paginated list of jobs
     """
     try:
-        # Build query
-        query = db.query(VideoJob)
+        # created_at as stored, so the cursor compares exactly like ORDER BY
+        created_at_key = type_coerce(VideoJob.created_at, String).label("created_at_key")
+        query = select(VideoJob, created_at_key)
         
         # Apply status filter if provided
+        status_enum = None
         if status:
             try:
                 status_enum = JobStatus(status.lower())
-                query = query.filter(VideoJob.status == status_enum)
+                query = query.where(VideoJob.status == status_enum)
             except ValueError:
                 raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
         
-        # Get total count
-        total = query.count()
+        # Resume after the cursor, or fall back to offset pagination
+        if after:
+            cursor_created_at, cursor_id = _parse_cursor(after)
+            query = query.where(
+                tuple_(VideoJob.created_at, VideoJob.id) < tuple_(literal(cursor_created_at, String), literal(cursor_id))
+            )
+        else:
+            query = query.offset((page - 1) * per_page)
+        
+        # Fetch one extra row to know whether another page follows
+        rows = (await db.execute(
+            query.order_by(desc(VideoJob.created_at), desc(VideoJob.id)).limit(per_page + 1)
+        )).all()
+        next_cursor = None
+        if len(rows) > per_page:
+            rows = rows[:per_page]
+            last_job, last_created_at = rows[-1]
+            next_cursor = f"{last_created_at},{last_job.id}"
         
-        # Apply pagination and ordering
-        jobs = query.order_by(desc(VideoJob.created_at)).offset((page - 1) * per_page).limit(per_page).all()
+        # Total from the status counters, independent of the table size
+        total = await count_jobs(db, status_enum)
         
         # Convert to response format
         job_summaries = [
@@ -93,14 +153,15 @@ async def list_jobs(
                 video_filename=job.video_filename,
                 error_message=job.error_message
             )
-            for job in jobs
+            for job, _ in rows
         ]
         
         return JobListResponse(
             jobs=job_summaries,
             total=total,
             page=page,
-            per_page=per_page
+            per_page=per_page,
+            next_cursor=next_cursor
         )
         
     except HTTPException:
@@ -110,11 +171,57 @@ async def list_jobs(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.delete("/cache")
+async def invalidate_cache(
+    shortcode: Optional[str] = Query(None, description="Only invalidate this Instagram shortcode"),
+    analysis_type: Optional[str] = Query(None, description="Only invalidate this analysis type")
+):
+    """
+    Invalidate cached analysis results.
+    
+    Args:
+        shortcode: Optional shortcode filter
+        analysis_type: Optional analysis type filter
+        
+    Returns:
+        Number of removed cache entries
+    """
+    try:
+        removed = await run_blocking(
+            io_executor, result_cache.invalidate, shortcode=shortcode, analysis_type=analysis_type
+        )
+        return {"message": "Cache invalidated successfully", "removed": removed}
+        
+    except Exception as e:
+        logger.error(f"Error invalidating cache: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+async def _result_file_in_use(db: AsyncSession, job_id: str) -> bool:
+    """
+    Check whether any job, live or archived, still reads a job's result file.
+    
+    Args:
+        db: Database session
+        job_id: Job owning the result file
+        
+    Returns:
+        True if the job itself or a job sharing its result still exists
+    """
+    for model in (VideoJob, ArchivedJob):
+        row_id = await db.scalar(
+            select(model.id).where(or_(model.job_id == job_id, model.source_job_id == job_id)).limit(1)
+        )
+        if row_id is not None:
+            return True
+    return False
+
+
 @router.delete("/{job_id}")
 async def delete_job(
     job_id: str,
     cleanup_files: bool = Query(True, description="Whether to cleanup associated files"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete a video processing job.
@@ -128,18 +235,25 @@ async def delete_job(
         Success message
     """
     try:
-        job = db.query(VideoJob).filter(VideoJob.job_id == job_id).first()
+        job = await db.scalar(select(VideoJob).where(VideoJob.job_id == job_id))
         
         if not job:
             raise HTTPException(status_code=404, detail="Job not found")
         
-        # Cleanup files if requested
-        if cleanup_files:
-            file_manager.cleanup_job_files(job_id, keep_results=False)
+        source_job_id = job.source_job_id
         
         # Delete job from database
-        db.delete(job)
-        db.commit()
+        await db.delete(job)
+        await db.commit()
+        
+        # Cleanup files if requested. Jobs served from the cache or from an
+        # identical job read another job's result file, which is removed
+        # with the last job still using it
+        if cleanup_files:
+            keep_results = await _result_file_in_use(db, job_id)
+            await run_blocking(io_executor, file_manager.cleanup_job_files, job_id, keep_results=keep_results)
+            if source_job_id and not await _result_file_in_use(db, source_job_id):
+                await run_blocking(io_executor, file_manager.cleanup_job_files, source_job_id, keep_results=False)
         
         logger.info(f"Deleted job: {job_id}")
         
@@ -153,7 +267,7 @@ async def delete_job(
 
 
 @router.get("/stats", response_model=SystemStatsResponse)
-async def get_system_stats(db: Session = Depends(get_db)):
+async def get_system_stats(db: AsyncSession = Depends(get_async_db)):
     """
     Get system statistics.
     
@@ -164,23 +278,38 @@ async def get_system_stats(db: Session = Depends(get_db)):
         System statistics
     """
     try:
-        # Get job counts by status
-        total_jobs = db.query(VideoJob).count()
-        pending_jobs = db.query(VideoJob).filter(VideoJob.status == JobStatus.PENDING).count()
-        processing_jobs = db.query(VideoJob).filter(VideoJob.status == JobStatus.PROCESSING).count()
-        completed_jobs = db.query(VideoJob).filter(VideoJob.status == JobStatus.COMPLETED).count()
-        failed_jobs = db.query(VideoJob).filter(VideoJob.status == JobStatus.FAILED).count()
+        # Counters maintained in each status transition's transaction
+        job_stats = await get_job_stats(db)
+        counts = job_stats["counts"]
+        processing_time = job_stats["processing_time"]
+        finished = counts[JobStatus.COMPLETED] + counts[JobStatus.FAILED]
         
-        # Get disk usage
-        disk_usage = file_manager.get_disk_usage()
+        # Served from the ledger, but the first call may still wait for the
+        # initial scan; keep it off the event loop
+        disk_usage = await run_blocking(io_executor, file_manager.get_disk_usage)
+        quota_stats = await run_blocking(io_executor, disk_quota.get_stats)
         
         return SystemStatsResponse(
-            total_jobs=total_jobs,
-            pending_jobs=pending_jobs,
-            processing_jobs=processing_jobs,
-            completed_jobs=completed_jobs,
-            failed_jobs=failed_jobs,
-            disk_usage=disk_usage
+            total_jobs=sum(counts.values()),
+            pending_jobs=counts[JobStatus.PENDING],
+            processing_jobs=counts[JobStatus.PROCESSING],
+            completed_jobs=counts[JobStatus.COMPLETED],
+            failed_jobs=counts[JobStatus.FAILED],
+            cancelled_jobs=counts[JobStatus.CANCELLED],
+            success_rate=round(counts[JobStatus.COMPLETED] / finished * 100, 2) if finished else 0.0,
+            average_processing_time=processing_time["mean"] if processing_time else None,
+            processing_time=processing_time,
+            disk_usage=disk_usage,
+            # Queue depth is the PENDING counter read above
+            queue={
+                "queue_depth": counts[JobStatus.PENDING],
+                **job_queue.get_stats(),
+                "stages": video_pipeline.get_stats()
+            },
+            cache={**result_cache.get_stats(), "result_files": file_manager.result_cache.get_stats()},
+            progress=progress_registry.get_stats(),
+            retention=retention_manager.get_stats(),
+            quota=quota_stats
         )
         
     except Exception as e:
@@ -188,11 +317,34 @@ async def get_system_stats(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.post("/retention/run")
+async def run_retention():
+    """
+    Apply the retention policies now instead of waiting for the next sweep.
+    
+    Only the maintenance leader sweeps; other worker processes answer 409.
+    
+    Returns:
+        Sweep report with jobs processed and bytes reclaimed per policy
+    """
+    try:
+        return await retention_manager.run_now()
+        
+    except NotLeaderError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error running retention sweep: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
 @router.post("/{job_id}/cancel")
-async def cancel_job(job_id: str, db: Session = Depends(get_db)):
+async def cancel_job(job_id: str, db: AsyncSession = Depends(get_async_db)):
     """
     Cancel a pending or processing job.
     
+    A running job is stopped cooperatively: its current stage is
+    abandoned, its Gemini file deleted and its worker slot freed.
+    
     Args:
         job_id: Unique job identifier
         db: Database session
@@ -201,7 +353,7 @@ async def cancel_job(job_id: str, db: Session = Depends(get_db)):
         Success message
     """
     try:
-        job = db.query(VideoJob).filter(VideoJob.job_id == job_id).first()
+        job = await db.scalar(select(VideoJob).where(VideoJob.job_id == job_id))
         
         if not job:
             raise HTTPException(status_code=404, detail="Job not found")
@@ -212,10 +364,27 @@ async def cancel_job(job_id: str, db: Session = Depends(get_db)):
                 detail=f"Cannot cancel job with status: {job.status.value}"
             )
         
-        # Update job status
-        job.status = JobStatus.CANCELLED
-        job.completed_at = datetime.utcnow()
-        db.commit()
+        # Update job status, unless a worker finished the job meanwhile
+        result = await db.execute(
+            update(VideoJob)
+            .where(
+                VideoJob.job_id == job_id,
+                VideoJob.status.in_([JobStatus.PENDING, JobStatus.PROCESSING])
+            )
+            .values(status=JobStatus.CANCELLED, completed_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        
+        if not result.rowcount:
+            await db.refresh(job)
+            raise HTTPException(
+                status_code=400, 
+                detail=f"Cannot cancel job with status: {job.status.value}"
+            )
+        
+        # Stop the worker; queued jobs are simply never claimed
+        notify_job_cancelled(job_id)
         
         logger.info(f"Cancelled job: {job_id}")
         
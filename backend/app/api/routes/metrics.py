@@ -0,0 +1,45 @@
+"""
+Pipeline metrics API routes.
+"""
+import logging
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+
+from ...core.config import settings
+from ...services.job_processor import metrics_recorder
+from ...services.executors import run_blocking, io_executor
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("/")
+async def get_metrics(
+    window_seconds: Optional[int] = Query(
+        None, ge=1, le=settings.metrics_max_window, description="Sliding window in seconds"
+    )
+):
+    """
+    Get p50/p90/p99 of every pipeline stage metric.
+    
+    Durations cover the Instagram post fetch, download, Gemini upload,
+    file-state wait, generation, response parsing and persistence; byte
+    counts cover downloads and uploads. Every metric is also broken down
+    by analysis type.
+    
+    Args:
+        window_seconds: Only include samples recorded within this window
+        
+    Returns:
+        Metric summaries over the window
+    """
+    try:
+        # Include samples that are still buffered in memory
+        await run_blocking(io_executor, metrics_recorder.flush)
+        summary = await run_blocking(io_executor, metrics_recorder.get_summary, window_seconds)
+        return {**summary, "recorder": metrics_recorder.get_stats()}
+        
+    except Exception as e:
+        logger.error(f"Error getting metrics: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
@@ -1,18 +1,26 @@
 """
 Video processing API routes.
 """
+import json
 import uuid
 import asyncio
 import logging
-from datetime import datetime
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from sqlalchemy.orm import Session
-from pydantic import BaseModel, HttpUrl
+from datetime import datetime, timedelta
+from typing import Optional, List, Dict
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel, HttpUrl, Field
 
-from ...core.database import get_db
-from ...models import VideoJob, JobStatus
-from ...services import InstagramDownloader, VideoAnalyzer, FileManager
+from ...core.config import settings
+from ...core.database import get_async_db, AsyncSessionLocal
+from ...models import VideoJob, JobStatus, ArchivedJob
+from ...services.job_processor import (
+    instagram_downloader, file_manager, job_queue, result_cache, progress_registry, job_events
+)
+from ...services.job_events import is_terminal, TERMINAL_STATUSES
+from ...services.executors import run_blocking, instagram_executor, io_executor
 
 logger = logging.getLogger(__name__)
 
@@ -22,12 +30,31 @@ router = APIRouter(prefix="/video", tags=["video"])
 class VideoAnalysisRequest(BaseModel):
     instagram_url: str
     analysis_type: str = "comprehensive"
+    deadline_seconds: Optional[int] = Field(None, gt=0)
 
 class VideoAnalysisResponse(BaseModel):
     job_id: str
     status: str
     message: str
 
+class BatchAnalysisRequest(BaseModel):
+    instagram_urls: List[str]
+    analysis_type: str = "comprehensive"
+    deadline_seconds: Optional[int] = Field(None, gt=0)
+
+class BatchAnalysisResponse(BaseModel):
+    batch_id: str
+    job_ids: List[str]
+    status: str
+    message: str
+
+class BatchStatusResponse(BaseModel):
+    batch_id: str
+    total_jobs: int
+    status_counts: Dict[str, int]
+    progress: float
+    finished: bool
+
 class JobStatusResponse(BaseModel):
     job_id: str
     status: str
@@ -37,114 +64,74 @@ class JobStatusResponse(BaseModel):
     completed_at: Optional[str]
     error_message: Optional[str]
     analysis_result: Optional[dict]
+    stage: Optional[str] = None
 
 
-# Global service instances
-instagram_downloader = InstagramDownloader()
-video_analyzer = VideoAnalyzer()
-file_manager = FileManager()
-
-
-async def process_video_job(job_id: str, instagram_url: str, analysis_type: str, db: Session):
+async def _find_inflight_job(db: AsyncSession, shortcode: Optional[str], analysis_type: str) -> Optional[VideoJob]:
     """
-    Background task to process video analysis job.
+    Find a queued or running job for the same post and analysis type.
     
     Args:
-        job_id: Unique job identifier
-        instagram_url: Instagram post URL
-        analysis_type: Type of analysis to perform
-        db: Database session
-    """
-    try:
-        # Get job from database
-        job = db.query(VideoJob).filter(VideoJob.job_id == job_id).first()
-        if not job:
-            logger.error(f"Job not found: {job_id}")
-            return
-        
-        # Update job status to processing
-        job.status = JobStatus.PROCESSING
-        job.started_at = datetime.utcnow()
-        db.commit()
-        
-        logger.info(f"Starting video processing for job: {job_id}")
-        
-        # Create job directory
-        job_dir = file_manager.get_job_directory(job_id)
-        
-        # Download video
-        def download_progress(progress: float):
-            job.download_progress = progress
-            db.commit()
-        
-        success, video_path, error_msg = instagram_downloader.download_video(
-            instagram_url, 
-            str(job_dir),
-            progress_callback=download_progress
-        )
+        db: Async database session
+        shortcode: Canonical Instagram shortcode
+        analysis_type: Type of analysis
         
-        if not success:
-            job.status = JobStatus.FAILED
-            job.error_message = error_msg
-            job.completed_at = datetime.utcnow()
-            db.commit()
-            logger.error(f"Video download failed for job {job_id}: {error_msg}")
-            return
-        
-        # Update job with video info
-        job.video_path = video_path
-        video_info = file_manager.get_video_info(video_path)
-        job.video_size = video_info.get("size", 0)
-        job.video_filename = video_info.get("filename", "")
-        db.commit()
-        
-        # Analyze video
-        def analysis_progress(progress: float):
-            job.analysis_progress = progress
-            db.commit()
-        
-        analysis_result = video_analyzer.analyze_video(
-            video_path,
-            analysis_type,
-            progress_callback=analysis_progress
+    Returns:
+        The in-flight job, or None
+    """
+    if not shortcode:
+        return None
+    
+    return await db.scalar(
+        select(VideoJob)
+        .where(
+            VideoJob.shortcode == shortcode,
+            VideoJob.analysis_type == analysis_type,
+            VideoJob.status.in_([JobStatus.PENDING, JobStatus.PROCESSING])
         )
+        .order_by(VideoJob.created_at)
+        .limit(1)
+    )
+
+
+def _deadline_at(deadline_seconds: Optional[int]) -> Optional[datetime]:
+    """
+    Compute the end-to-end deadline a client asked for.
+    
+    Jobs submitted without one get the default budget when a worker
+    claims them, so time spent waiting in the queue does not count.
+    
+    Args:
+        deadline_seconds: Budget requested by the client, if any
         
-        # Save analysis result
-        result_path = file_manager.save_analysis_result(job_id, analysis_result)
-        
-        # Update job with results
-        job.status = JobStatus.COMPLETED
-        job.analysis_result = analysis_result.get("raw_response", "")
-        job.result_path = result_path
-        job.completed_at = datetime.utcnow()
-        db.commit()
-        
-        logger.info(f"Video processing completed for job: {job_id}")
-        
-    except Exception as e:
-        logger.error(f"Error processing video job {job_id}: {e}")
-        
-        # Update job with error
-        job = db.query(VideoJob).filter(VideoJob.job_id == job_id).first()
-        if job:
-            job.status = JobStatus.FAILED
-            job.error_message = str(e)
-            job.completed_at = datetime.utcnow()
-            db.commit()
+    Returns:
+        Deadline, or None if the client did not ask for one
+    """
+    if not deadline_seconds:
+        return None
+    return datetime.utcnow() + timedelta(seconds=deadline_seconds)
+
+
+def _attach_response(job: VideoJob) -> VideoAnalysisResponse:
+    """Build the response for a submission coalesced into an in-flight job."""
+    logger.info(f"Attached submission to in-flight job: {job.job_id}")
+    return VideoAnalysisResponse(
+        job_id=job.job_id,
+        status=job.status.value,
+        message="Attached to in-flight video analysis job"
+    )
 
 
 @router.post("/analyze", response_model=VideoAnalysisResponse)
 async def analyze_video(
     request: VideoAnalysisRequest,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Start video analysis job.
     
     Args:
         request: Video analysis request
-        background_tasks: FastAPI background tasks
         db: Database session
         
     Returns:
@@ -155,43 +142,87 @@ async def analyze_video(
         if "instagram.com" not in request.instagram_url:
             raise HTTPException(status_code=400, detail="Invalid Instagram URL")
         
+        # Generate job ID
+        job_id = str(uuid.uuid4())
+        
+        # Serve repeated submissions straight from the result cache. A miss
+        # is counted by the job's own lookup once it runs
+        shortcode = instagram_downloader.extract_shortcode_from_url(request.instagram_url)
+        source_job_id = await run_blocking(
+            io_executor, result_cache.lookup, shortcode, request.analysis_type, count_miss=False
+        )
+        if source_job_id is not None:
+            # The new job shares the result file of the job that produced it
+            result_path = await run_blocking(io_executor, file_manager.get_result_file, source_job_id)
+            now = datetime.utcnow()
+            job = VideoJob(
+                job_id=job_id,
+                instagram_url=request.instagram_url,
+                analysis_type=request.analysis_type,
+                shortcode=shortcode,
+                status=JobStatus.COMPLETED,
+                started_at=now,
+                completed_at=now,
+                download_progress=1.0,
+                analysis_progress=1.0,
+                result_path=str(result_path),
+                source_job_id=source_job_id
+            )
+            db.add(job)
+            await db.commit()
+            
+            logger.info(f"Created video analysis job from cache: {job_id}")
+            
+            return VideoAnalysisResponse(
+                job_id=job_id,
+                status="completed",
+                message="Video analysis served from cache"
+            )
+        
+        # Coalesce concurrent submissions of the same reel into one job
+        inflight_job = await _find_inflight_job(db, shortcode, request.analysis_type)
+        if inflight_job:
+            return _attach_response(inflight_job)
+        
         # Check if URL contains video
-        post_info = instagram_downloader.get_post_info(request.instagram_url)
+        post_info = await run_blocking(
+            instagram_executor,
+            instagram_downloader.get_post_info,
+            request.instagram_url
+        )
         if not post_info:
             raise HTTPException(status_code=400, detail="Could not access Instagram post")
         
         if not post_info.get("is_video", False):
             raise HTTPException(status_code=400, detail="Instagram post does not contain a video")
         
-        # Generate job ID
-        job_id = str(uuid.uuid4())
+        # Another submission may have created the job while we were waiting
+        inflight_job = await _find_inflight_job(db, shortcode, request.analysis_type)
+        if inflight_job:
+            return _attach_response(inflight_job)
         
         # Create job record
         job = VideoJob(
             job_id=job_id,
             instagram_url=request.instagram_url,
-            status=JobStatus.PENDING
+            analysis_type=request.analysis_type,
+            shortcode=shortcode,
+            status=JobStatus.PENDING,
+            deadline_at=_deadline_at(request.deadline_seconds)
         )
         
         db.add(job)
-        db.commit()
-        db.refresh(job)
-        
-        # Start background processing
-        background_tasks.add_task(
-            process_video_job,
-            job_id,
-            request.instagram_url,
-            request.analysis_type,
-            db
-        )
+        await db.commit()
+        
+        # Wake the workers; the job is picked up from the queue
+        job_queue.notify()
         
         logger.info(f"Created video analysis job: {job_id}")
         
         return VideoAnalysisResponse(
             job_id=job_id,
             status="pending",
-            message="Video analysis job started successfully"
+            message="Video analysis job queued successfully"
         )
         
     except HTTPException:
@@ -201,8 +232,277 @@ async def analyze_video(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.post("/analyze/batch", response_model=BatchAnalysisResponse)
+async def analyze_videos_batch(
+    request: BatchAnalysisRequest,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Queue analysis jobs for many Instagram URLs at once.
+    
+    All jobs are inserted in a single transaction. Instagram is not
+    contacted here: whether a post exists and contains a video is checked
+    by the workers, and failing posts end up as failed jobs. Repeated URLs
+    of the same post share one job.
+    
+    Args:
+        request: Batch analysis request
+        db: Database session
+        
+    Returns:
+        Batch identifier and one job ID per submitted URL, in order
+    """
+    try:
+        if not request.instagram_urls:
+            raise HTTPException(status_code=400, detail="No Instagram URLs given")
+        
+        if len(request.instagram_urls) > settings.batch_max_urls:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Batch too large (maximum {settings.batch_max_urls} URLs)"
+            )
+        
+        invalid_urls = [url for url in request.instagram_urls if "instagram.com" not in url]
+        if invalid_urls:
+            raise HTTPException(status_code=400, detail=f"Invalid Instagram URL: {invalid_urls[0]}")
+        
+        batch_id = str(uuid.uuid4())
+        # A requested deadline covers the whole batch; otherwise every job
+        # gets the default budget from its own claim
+        deadline_at = _deadline_at(request.deadline_seconds)
+        job_ids = []
+        jobs = []
+        job_by_post: Dict[str, str] = {}
+        
+        for url in request.instagram_urls:
+            shortcode = instagram_downloader.extract_shortcode_from_url(url)
+            post_key = shortcode or url
+            if post_key in job_by_post:
+                job_ids.append(job_by_post[post_key])
+                continue
+            
+            job_id = str(uuid.uuid4())
+            job_by_post[post_key] = job_id
+            job_ids.append(job_id)
+            jobs.append(VideoJob(
+                job_id=job_id,
+                batch_id=batch_id,
+                instagram_url=url,
+                analysis_type=request.analysis_type,
+                shortcode=shortcode,
+                status=JobStatus.PENDING,
+                deadline_at=deadline_at
+            ))
+        
+        db.add_all(jobs)
+        await db.commit()
+        
+        # Wake the workers; the jobs are picked up from the queue
+        job_queue.notify()
+        
+        logger.info(f"Created video analysis batch {batch_id} with {len(jobs)} jobs")
+        
+        return BatchAnalysisResponse(
+            batch_id=batch_id,
+            job_ids=job_ids,
+            status="pending",
+            message=f"{len(jobs)} video analysis jobs queued successfully"
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"Error creating video analysis batch: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/batch/{batch_id}", response_model=BatchStatusResponse)
+async def get_batch_status(batch_id: str, db: AsyncSession = Depends(get_async_db)):
+    """
+    Get aggregate progress of a batch.
+    
+    Args:
+        batch_id: Batch identifier returned by the batch endpoint
+        db: Database session
+        
+    Returns:
+        Job counts per status and overall progress
+    """
+    try:
+        rows = (await db.execute(
+            select(
+                VideoJob.job_id,
+                VideoJob.status,
+                VideoJob.download_progress,
+                VideoJob.analysis_progress
+            )
+            .where(VideoJob.batch_id == batch_id)
+        )).all()
+        
+        if not rows:
+            raise HTTPException(status_code=404, detail="Batch not found")
+        
+        status_counts = {status.value: 0 for status in JobStatus}
+        total_progress = 0.0
+        
+        for job_id, status, download_progress, analysis_progress in rows:
+            status_counts[status.value] += 1
+            
+            if status in [JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED]:
+                total_progress += 1.0
+            elif status == JobStatus.PROCESSING:
+                # Running jobs report their live progress from memory
+                record = progress_registry.get(job_id)
+                if record:
+                    total_progress += record.progress
+                else:
+                    total_progress += ((download_progress or 0.0) + (analysis_progress or 0.0)) / 2
+        
+        unfinished = status_counts[JobStatus.PENDING.value] + status_counts[JobStatus.PROCESSING.value]
+        
+        return BatchStatusResponse(
+            batch_id=batch_id,
+            total_jobs=len(rows),
+            status_counts=status_counts,
+            progress=total_progress / len(rows),
+            finished=unfinished == 0
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting batch status: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+async def _load_job_status(job_id: str, db: AsyncSession) -> Optional[JobStatusResponse]:
+    """
+    Build the status of a job.
+    
+    Args:
+        job_id: Unique job identifier
+        db: Async database session
+        
+    Returns:
+        Job status information, or None if the job does not exist
+    """
+    # Running jobs are answered from memory without touching the database
+    record = progress_registry.get(job_id)
+    if record:
+        return JobStatusResponse(
+            job_id=job_id,
+            status=JobStatus.PROCESSING.value,
+            progress=record.progress,
+            created_at=record.created_at.isoformat() if record.created_at else None,
+            started_at=record.started_at.isoformat() if record.started_at else None,
+            completed_at=None,
+            error_message=None,
+            analysis_result=None,
+            stage=record.stage
+        )
+    
+    job = await db.scalar(select(VideoJob).where(VideoJob.job_id == job_id))
+    
+    if not job:
+        return await _load_archived_job_status(job_id, db)
+    
+    # Calculate overall progress
+    if job.status == JobStatus.PENDING:
+        progress = 0.0
+    elif job.status == JobStatus.PROCESSING:
+        progress = (job.download_progress + job.analysis_progress) / 2
+    elif job.status in [JobStatus.COMPLETED, JobStatus.FAILED]:
+        progress = 1.0
+    else:
+        progress = 0.0
+    
+    # Load full analysis result if completed
+    analysis_result = None
+    if job.status == JobStatus.COMPLETED and job.result_path:
+        analysis_result = await run_blocking(io_executor, file_manager.load_analysis_result, job.result_job_id)
+    
+    return JobStatusResponse(
+        job_id=job.job_id,
+        status=job.status.value,
+        progress=progress,
+        created_at=job.created_at.isoformat() if job.created_at else None,
+        started_at=job.started_at.isoformat() if job.started_at else None,
+        completed_at=job.completed_at.isoformat() if job.completed_at else None,
+        error_message=job.error_message,
+        analysis_result=analysis_result,
+        stage=job.stage
+    )
+
+
+async def _load_archived_job_status(job_id: str, db: AsyncSession) -> Optional[JobStatusResponse]:
+    """
+    Build the status of a job moved to the archive by the retention sweeper.
+    
+    Args:
+        job_id: Unique job identifier
+        db: Async database session
+        
+    Returns:
+        Job status information, or None if the job was never archived
+    """
+    job = await db.scalar(select(ArchivedJob).where(ArchivedJob.job_id == job_id))
+    
+    if not job:
+        return None
+    
+    analysis_result = None
+    if job.status == JobStatus.COMPLETED and job.result_path:
+        analysis_result = await run_blocking(io_executor, file_manager.load_analysis_result, job.result_job_id)
+    
+    return JobStatusResponse(
+        job_id=job.job_id,
+        status=job.status.value,
+        progress=1.0 if job.status in [JobStatus.COMPLETED, JobStatus.FAILED] else 0.0,
+        created_at=job.created_at.isoformat() if job.created_at else None,
+        started_at=job.started_at.isoformat() if job.started_at else None,
+        completed_at=job.completed_at.isoformat() if job.completed_at else None,
+        error_message=job.error_message,
+        analysis_result=analysis_result,
+        stage=None
+    )
+
+
+def _is_final(event: dict) -> bool:
+    """Check whether an event ends a job's stream."""
+    return is_terminal(event) or event.get("status") == "not_found"
+
+
+async def _recheck_job_status(job_id: str) -> Optional[dict]:
+    """
+    Re-read a watched job to catch ends that were never published here.
+    
+    Events only reach subscribers in the process running the job, and a
+    deleted job publishes nothing, so idle streams check the row themselves.
+    
+    Args:
+        job_id: Unique job identifier
+        
+    Returns:
+        Final-state or not-found event, or None while the job is unfinished
+    """
+    async with AsyncSessionLocal() as db:
+        status = await _load_job_status(job_id, db)
+    
+    if not status:
+        return {"event": "error", "job_id": job_id, "status": "not_found"}
+    if status.status in TERMINAL_STATUSES:
+        return {"event": status.status, **status.model_dump()}
+    return None
+
+
+def _format_sse(event: dict) -> str:
+    """Encode an event as a Server-Sent Events message."""
+    return f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+
 @router.get("/status/{job_id}", response_model=JobStatusResponse)
-async def get_job_status(job_id: str, db: Session = Depends(get_db)):
+async def get_job_status(job_id: str, db: AsyncSession = Depends(get_async_db)):
     """
     Get job status and results.
     
@@ -214,39 +514,153 @@ async def get_job_status(job_id: str, db: Session = Depends(get_db)):
         Job status information
     """
     try:
-        job = db.query(VideoJob).filter(VideoJob.job_id == job_id).first()
+        status = await _load_job_status(job_id, db)
         
-        if not job:
+        if not status:
             raise HTTPException(status_code=404, detail="Job not found")
         
-        # Calculate overall progress
-        if job.status == JobStatus.PENDING:
-            progress = 0.0
-        elif job.status == JobStatus.PROCESSING:
-            progress = (job.download_progress + job.analysis_progress) / 2
-        elif job.status in [JobStatus.COMPLETED, JobStatus.FAILED]:
-            progress = 1.0
-        else:
-            progress = 0.0
-        
-        # Load full analysis result if completed
-        analysis_result = None
-        if job.status == JobStatus.COMPLETED and job.result_path:
-            analysis_result = file_manager.load_analysis_result(job_id)
-        
-        return JobStatusResponse(
-            job_id=job.job_id,
-            status=job.status.value,
-            progress=progress,
-            created_at=job.created_at.isoformat() if job.created_at else None,
-            started_at=job.started_at.isoformat() if job.started_at else None,
-            completed_at=job.completed_at.isoformat() if job.completed_at else None,
-            error_message=job.error_message,
-            analysis_result=analysis_result
-        )
+        return status
         
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error getting job status: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/stream/{job_id}")
+async def stream_job_status(job_id: str):
+    """
+    Stream job stage and progress events as Server-Sent Events.
+    
+    The first event is a snapshot of the current status. The stream ends
+    after the event carrying the final state, which includes the analysis
+    result exactly once for completed jobs. The snapshot is read in its own
+    session, closed before streaming starts, so open streams never hold a
+    pooled connection. Every keepalive re-reads the job, so the stream also
+    ends when the job finishes in another worker process or is deleted.
+    
+    Args:
+        job_id: Unique job identifier
+        
+    Returns:
+        text/event-stream response
+    """
+    # Subscribe before taking the snapshot so no transition is missed
+    queue = job_events.new_queue()
+    job_events.subscribe(job_id, queue)
+    
+    try:
+        async with AsyncSessionLocal() as db:
+            snapshot = await _load_job_status(job_id, db)
+    except Exception as e:
+        job_events.unsubscribe(job_id, queue)
+        logger.error(f"Error getting job status: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+    
+    if not snapshot:
+        job_events.unsubscribe(job_id, queue)
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    async def event_stream():
+        try:
+            event = {"event": "snapshot", **snapshot.model_dump()}
+            yield _format_sse(event)
+            
+            while not _is_final(event):
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=settings.stream_keepalive_interval)
+                except asyncio.TimeoutError:
+                    final_event = await _recheck_job_status(job_id)
+                    if final_event:
+                        yield _format_sse(final_event)
+                        break
+                    yield ": keepalive\n\n"
+                    continue
+                yield _format_sse(event)
+        finally:
+            job_events.unsubscribe(job_id, queue)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.websocket("/ws")
+async def stream_jobs_websocket(websocket: WebSocket):
+    """
+    Multiplex live events of many jobs over one WebSocket.
+    
+    Clients send ``{"subscribe": [job_id, ...]}`` or
+    ``{"unsubscribe": [job_id, ...]}``. Every subscription starts with a
+    snapshot event and ends after the job's final-state event. Subscribed
+    jobs are re-read every keepalive interval, so jobs finishing in another
+    worker process or deleted meanwhile still get their final event.
+    
+    Args:
+        websocket: WebSocket connection
+    """
+    await websocket.accept()
+    queue = job_events.new_queue()
+    subscribed = set()
+    
+    async def receive_commands():
+        while True:
+            message = await websocket.receive_json()
+            
+            for job_id in message.get("unsubscribe", []):
+                job_events.unsubscribe(job_id, queue)
+                subscribed.discard(job_id)
+            
+            for job_id in message.get("subscribe", []):
+                if job_id in subscribed:
+                    continue
+                job_events.subscribe(job_id, queue)
+                subscribed.add(job_id)
+                
+                async with AsyncSessionLocal() as db:
+                    snapshot = await _load_job_status(job_id, db)
+                
+                if snapshot:
+                    await queue.put({"event": "snapshot", **snapshot.model_dump()})
+                else:
+                    await queue.put({"event": "error", "job_id": job_id, "status": "not_found"})
+    
+    async def recheck_jobs():
+        while True:
+            await asyncio.sleep(settings.stream_keepalive_interval)
+            for job_id in list(subscribed):
+                final_event = await _recheck_job_status(job_id)
+                if final_event:
+                    await queue.put(final_event)
+    
+    async def send_events():
+        while True:
+            event = await queue.get()
+            job_id = event.get("job_id")
+            # Leftovers of ended or dropped subscriptions
+            if job_id not in subscribed:
+                continue
+            await websocket.send_json(event)
+            if _is_final(event):
+                job_events.unsubscribe(job_id, queue)
+                subscribed.discard(job_id)
+    
+    tasks = [
+        asyncio.create_task(receive_commands()),
+        asyncio.create_task(recheck_jobs()),
+        asyncio.create_task(send_events())
+    ]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            error = task.exception()
+            if error and not isinstance(error, WebSocketDisconnect):
+                logger.error(f"Error in job event WebSocket: {error}")
+    finally:
+        for task in tasks:
+            task.cancel()
+        for job_id in subscribed:
+            job_events.unsubscribe(job_id, queue)
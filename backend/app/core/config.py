@@ -21,14 +21,80 @@ class Settings(BaseSettings):
     
     # Database
     database_url: str = "sqlite:///./video_analyzer.db"
+    async_database_url: Optional[str] = None  # defaults to database_url with its async driver
+    database_echo: bool = False
+    sqlite_busy_timeout: float = 30.0  # seconds a writer waits for the file lock
     
     # File Storage
     upload_dir: str = "../data/videos"
     results_dir: str = "../data/results"
     temp_dir: str = "../data/temp"
+    blob_dir: str = "../data/blobs"  # deduplicated videos; same filesystem as upload_dir
+    video_dedup_enabled: bool = True  # hard-link identical videos to one blob
+    video_quota_bytes: int = 0  # budget for downloaded videos, 0 = unlimited
+    video_quota_check_interval: float = 300.0  # seconds between quota checks
     max_file_size: int = 100_000_000  # 100MB
+    disk_usage_reconcile_interval: float = 900.0  # seconds between disk usage rescans
+    result_compression: bool = True  # gzip result files when writing them
+    result_compression_level: int = 1  # gzip level, 1 (fastest) to 9 (smallest)
+    result_pretty_json: bool = False  # indent result JSON, for debugging
+    result_file_cache_max_bytes: int = 64_000_000  # parsed results kept in memory, by JSON size
+    
+    # Retention (days after job creation; 0 disables a policy)
+    retention_enabled: bool = True
+    retention_interval: int = 3600  # seconds between sweeps
+    retention_batch_size: int = 200  # jobs per transaction
+    retention_video_days: int = 7  # delete downloaded videos
+    retention_compress_days: int = 30  # gzip result files
+    retention_archive_days: int = 90  # move job rows to video_jobs_archive
+    
+    # Job Queue
+    worker_pool_size: int = 8  # maximum jobs in flight across all stages
+    queue_poll_interval: float = 2.0  # seconds between idle PENDING scans
+    batch_max_urls: int = 1000  # URLs accepted by one batch submission
+    job_lease_seconds: int = 60  # a claim lapses unless renewed within this many seconds
+    
+    # End-to-end job deadline (0 disables); submissions may ask for less or more
+    job_deadline_seconds: int = 900
+    
+    # Pipeline stages (workers per stage)
+    stage_fetch_concurrency: int = 2
+    stage_download_concurrency: int = 2
+    stage_upload_concurrency: int = 2
+    stage_wait_concurrency: int = 8
+    stage_generate_concurrency: int = 2
+    stage_persist_concurrency: int = 2
+    stage_queue_size: int = 4  # hand-off queue bound between stages
+    
+    # Progress persistence
+    progress_flush_interval: float = 5.0  # seconds between progress writes per job
+    
+    # Stage timing metrics
+    metrics_enabled: bool = True
+    metrics_flush_interval: float = 5.0  # seconds between batched writes
+    metrics_batch_size: int = 200  # buffered samples that force a write
+    metrics_window: int = 3600  # default /api/metrics window in seconds
+    metrics_max_window: int = 604800  # longest /api/metrics window; older samples are deleted
+    prometheus_multiproc_dir: Optional[str] = None  # shared by uvicorn workers; empty it before start
+    
+    # Live job event streams
+    stream_keepalive_interval: float = 15.0  # seconds between stream keepalives and job re-reads
+    
+    # Blocking work executors (threads per pool)
+    instagram_executor_workers: int = 4
+    gemini_executor_workers: int = 8
+    io_executor_workers: int = 4
+    
+    # Gemini file processing
+    gemini_file_max_wait: int = 120  # seconds
+    gemini_file_poll_interval: float = 3.0
+    
+    # Analysis result cache
+    result_cache_enabled: bool = True
+    result_cache_ttl: int = 7 * 24 * 3600  # seconds, 0 = never expire
     
     # Instagram Configuration
+    instagram_request_timeout: float = 60.0  # seconds per Instaloader HTTP request
     instagram_username: Optional[str] = None
     instagram_password: Optional[str] = None
     
@@ -47,7 +113,7 @@ class Settings(BaseSettings):
     # CORS
     allowed_origins: str = "http://localhost:3000,http://localhost:5173"
     
-    @validator("upload_dir", "results_dir", "temp_dir")
+    @validator("upload_dir", "results_dir", "temp_dir", "blob_dir")
     def create_directories(cls, v):
         """Create directories if they don't exist."""
         path = Path(v)
@@ -1,25 +1,85 @@
 """
 Database configuration and session management.
+
+The application uses a single engine and a single declarative Base. On
+SQLite every connection runs in WAL mode, so readers never block the
+writer, and concurrent writers queue on SQLite's own write lock for up to
+the busy timeout. The sqlite3 driver only opens a transaction right before
+its first write statement, so every write transaction starts by asking for
+that lock and waits in the busy handler instead of failing on a stale read
+snapshot. No lock is held in Python, which keeps writers in worker threads
+and on the event loop from ever waiting on each other outside SQLite.
+
+API routes use an async engine over the same database (aiosqlite for
+SQLite), so a query awaits its result instead of blocking the event loop.
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
 from .config import settings
 
+is_sqlite = settings.database_url.startswith("sqlite")
+
 # Create SQLAlchemy engine
 engine = create_engine(
     settings.database_url,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {}
+    echo=settings.database_echo,
+    pool_pre_ping=True,
+    connect_args={
+        "check_same_thread": False,
+        "timeout": settings.sqlite_busy_timeout
+    } if is_sqlite else {}
 )
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async drivers for the synchronous URL schemes
+_ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+
+def _async_database_url(database_url: str) -> str:
+    """
+    Derive the async engine URL from the configured database URL.
+
+    Args:
+        database_url: Synchronous SQLAlchemy URL
+
+    Returns:
+        URL using the matching async driver
+    """
+    url = make_url(database_url)
+    driver = _ASYNC_DRIVERS.get(url.drivername)
+    return url.set(drivername=driver).render_as_string(hide_password=False) if driver else database_url
+
+
+async_engine = create_async_engine(
+    settings.async_database_url or _async_database_url(settings.database_url),
+    echo=settings.database_echo,
+    pool_pre_ping=True,
+    connect_args={"timeout": settings.sqlite_busy_timeout} if is_sqlite else {}
+)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+
 # Create Base class for models
 Base = declarative_base()
 
+if is_sqlite:
+    @event.listens_for(engine, "connect")
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def _configure_sqlite(dbapi_connection, connection_record):
+        """Tune every new SQLite connection for concurrent readers."""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout * 1000)}")
+        cursor.close()
+
 
 def get_db() -> Generator[Session, None, None]:
     """
@@ -32,6 +92,14 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency to get an async database session.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def create_tables():
     """
     Create all tables in the database.
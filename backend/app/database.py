@@ -1,46 +1,169 @@
 """
-Database configuration and session management.
+Database initialization and health checks.
 """
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.ext.declarative import declarative_base
-from app.core.config import settings
-from .models import Base
+from sqlalchemy import inspect, text
+from app.core.database import engine, SessionLocal, Base, get_db
+from . import models  # noqa: F401  (registers every table on Base)
+from .models import JobStatus
+from .models.job_stats import DURATION_BUCKETS
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Create database engine
-engine = create_engine(
-    settings.database_url,
-    echo=settings.debug,
-    pool_pre_ping=True,
-    pool_recycle=300
-)
-
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
 
 def create_tables():
     """Create all database tables."""
     try:
         Base.metadata.create_all(bind=engine)
+        add_missing_columns()
+        drop_removed_columns()
+        install_job_counters()
         logger.info("Database tables created successfully")
     except Exception as e:
         logger.error(f"Error creating database tables: {e}")
         raise
 
 
-def get_db() -> Session:
+def add_missing_columns():
     """
-    Dependency to get database session.
+    Add columns and indexes introduced after a table was first created.
+    
+    create_all() never alters existing tables, so databases created by an
+    older release would otherwise lack newly mapped nullable columns.
     """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+    inspector = inspect(engine)
+    
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(dialect=engine.dialect)
+            with engine.begin() as connection:
+                connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+            logger.info(f"Added column {table.name}.{column.name}")
+        
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
+# Columns no longer mapped whose constraints would reject new rows; the
+# analysis cache now references the source job's result file instead of
+# holding a copy of the payload
+_REMOVED_COLUMNS = {
+    "analysis_cache": ("result",),
+}
+
+
+def drop_removed_columns():
+    """
+    Drop columns that were removed from a mapped table.
+    
+    Old databases would otherwise keep the columns, and their NOT NULL
+    constraints, after the model stopped writing them.
+    """
+    inspector = inspect(engine)
+    
+    for table_name, columns in _REMOVED_COLUMNS.items():
+        if not inspector.has_table(table_name):
+            continue
+        
+        existing = {column["name"] for column in inspector.get_columns(table_name)}
+        for column_name in columns:
+            if column_name not in existing:
+                continue
+            with engine.begin() as connection:
+                connection.execute(text(f"ALTER TABLE {table_name} DROP COLUMN {column_name}"))
+            logger.info(f"Dropped column {table_name}.{column_name}")
+
+
+# Seconds between a job's start and completion
+_DURATION_SQL = "(julianday(NEW.completed_at) - julianday(NEW.started_at)) * 86400.0"
+
+# Keep job_status_counts and job_duration_buckets in step with video_jobs.
+# Triggers run inside the transaction of every insert, status change and
+# delete, including bulk and conditional updates whose previous status the
+# application never sees.
+_COUNTER_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS video_jobs_count_insert AFTER INSERT ON video_jobs
+    BEGIN
+        UPDATE job_status_counts SET job_count = job_count + 1 WHERE status = NEW.status;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS video_jobs_count_delete AFTER DELETE ON video_jobs
+    BEGIN
+        UPDATE job_status_counts SET job_count = job_count - 1 WHERE status = OLD.status;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS video_jobs_count_update AFTER UPDATE OF status ON video_jobs
+    WHEN OLD.status <> NEW.status
+    BEGIN
+        UPDATE job_status_counts SET job_count = job_count - 1 WHERE status = OLD.status;
+        UPDATE job_status_counts SET job_count = job_count + 1 WHERE status = NEW.status;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS video_jobs_duration AFTER UPDATE OF status ON video_jobs
+    WHEN NEW.status = '{JobStatus.COMPLETED.name}' AND OLD.status <> NEW.status
+        AND NEW.started_at IS NOT NULL AND NEW.completed_at IS NOT NULL
+    BEGIN
+        UPDATE job_duration_buckets
+        SET job_count = job_count + 1, total_seconds = total_seconds + {_DURATION_SQL}
+        WHERE upper_bound = (
+            SELECT MIN(upper_bound) FROM job_duration_buckets WHERE upper_bound >= {_DURATION_SQL}
+        );
+    END
+    """
+)
+
+
+def install_job_counters():
+    """
+    Install the job statistics triggers and rebuild the counters.
+    
+    The counters are recomputed from video_jobs in the same write
+    transaction, so they are exact after every start even if the triggers
+    were missing or rows were edited by hand. Only SQLite is supported;
+    elsewhere statistics are aggregated from video_jobs on read.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    
+    duration = "(julianday(completed_at) - julianday(started_at)) * 86400.0"
+    with engine.begin() as connection:
+        for trigger in _COUNTER_TRIGGERS:
+            connection.execute(text(trigger))
+        
+        connection.execute(text("DELETE FROM job_status_counts"))
+        for status in JobStatus:
+            connection.execute(
+                text(
+                    "INSERT INTO job_status_counts (status, job_count) "
+                    "SELECT :status, COUNT(*) FROM video_jobs WHERE status = :status"
+                ),
+                {"status": status.name}
+            )
+        
+        # Cache hits are created already completed and took no processing
+        connection.execute(text("DELETE FROM job_duration_buckets"))
+        lower = float("-inf")
+        for upper in DURATION_BUCKETS:
+            connection.execute(
+                text(
+                    "INSERT INTO job_duration_buckets (upper_bound, job_count, total_seconds) "
+                    f"SELECT :upper, COUNT(*), COALESCE(SUM({duration}), 0.0) FROM video_jobs "
+                    f"WHERE status = :status AND started_at IS NOT NULL AND completed_at > started_at "
+                    f"AND {duration} > :lower AND {duration} <= :upper"
+                ),
+                {"upper": upper, "lower": lower, "status": JobStatus.COMPLETED.name}
+            )
+            lower = upper
 
 
 def init_db():
@@ -58,7 +181,7 @@ def check_db_health() -> bool:
     """Check if database is accessible."""
     try:
         db = SessionLocal()
-        db.execute("SELECT 1")
+        db.execute(text("SELECT 1"))
         db.close()
         return True
     except Exception as e:
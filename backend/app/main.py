@@ -5,11 +5,18 @@ import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 from .core.config import settings
 from .database import init_db
-from .api.routes import video_router, jobs_router
+from .core.database import async_engine
+from .api.routes import video_router, jobs_router, metrics_router
+from .services.job_processor import (
+    job_queue, video_pipeline, file_manager, progress_registry, job_events, metrics_recorder, recover_orphaned_jobs,
+    release_inline_results, retention_manager, disk_quota, result_cache, maintenance_leader
+)
+from .services.executors import shutdown_executors, run_blocking, io_executor
+from .services.prometheus import PrometheusMiddleware, render_latest, mark_process_dead
 
 # Configure logging
 logging.basicConfig(
@@ -36,10 +43,47 @@ async def lifespan(app: FastAPI):
     init_db()
     logger.info("Database initialized")
     
+    # Requeue jobs whose worker died in a crash or restart; they resume
+    # after their last completed stage. Jobs still leased by another live
+    # worker process are left to it, and leases that lapse later are
+    # picked up by the job queue
+    recover_orphaned_jobs()
+    
+    # Payloads live in result files only; drop copies older releases kept
+    # in the job rows
+    release_inline_results()
+    
+    # Seed the running count of analysis cache entries reported in stats
+    result_cache.load_entry_count()
+    
+    # Elect the worker process running the maintenance tasks before
+    # starting them
+    await maintenance_leader.start()
+    
+    # Start pipeline stages, then the workers feeding them
+    job_events.start()
+    await file_manager.start()
+    await metrics_recorder.start()
+    await video_pipeline.start()
+    await job_queue.start()
+    await retention_manager.start()
+    await disk_quota.start()
+    
     yield
     
     # Shutdown
     logger.info("Shutting down Instagram Video Analyzer API")
+    await retention_manager.stop()
+    await disk_quota.stop()
+    await job_queue.stop()
+    await video_pipeline.stop()
+    await metrics_recorder.stop()
+    await file_manager.stop()
+    await maintenance_leader.stop()
+    progress_registry.flush_all()
+    shutdown_executors()
+    await async_engine.dispose()
+    mark_process_dead()
 
 
 # Create FastAPI application
@@ -59,9 +103,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Time every HTTP request for the Prometheus exporter
+app.add_middleware(PrometheusMiddleware)
+
 # Include routers
 app.include_router(video_router, prefix="/api")
 app.include_router(jobs_router, prefix="/api")
+app.include_router(metrics_router, prefix="/api")
 
 
 @app.get("/")
@@ -83,6 +131,13 @@ async def health_check():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus scrape endpoint."""
+    body, content_type = await run_blocking(io_executor, render_latest)
+    return Response(content=body, media_type=content_type)
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Global exception handler."""
@@ -2,6 +2,10 @@
 Database models package.
 """
 from .video_job import VideoJob, JobStatus
+from .archived_job import ArchivedJob
+from .analysis_cache import AnalysisCacheEntry
+from .job_stats import JobStatusCount, JobDurationBucket
+from .maintenance import LeaderLease, RetentionState, DiskUsageSnapshot
 from .models import Base, AnalysisResult, UserSession, SystemMetrics
 
-__all__ = ["VideoJob", "JobStatus", "Base", "AnalysisResult", "UserSession", "SystemMetrics"]
+__all__ = ["VideoJob", "JobStatus", "ArchivedJob", "AnalysisCacheEntry", "JobStatusCount", "JobDurationBucket", "LeaderLease", "RetentionState", "DiskUsageSnapshot", "Base", "AnalysisResult", "UserSession", "SystemMetrics"]
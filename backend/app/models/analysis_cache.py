@@ -0,0 +1,34 @@
+"""
+Database model for cached analysis results.
+"""
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+
+from ..core.database import Base
+
+
+class AnalysisCacheEntry(Base):
+    """Analysis result cached by shortcode, analysis type, model and prompt."""
+    
+    __tablename__ = "analysis_cache"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    
+    # sha256 over the fields below
+    cache_key = Column(String(64), unique=True, index=True, nullable=False)
+    
+    # Key components, kept for targeted invalidation
+    shortcode = Column(String(64), index=True, nullable=False)
+    analysis_type = Column(String(50), nullable=False)
+    model = Column(String(100), nullable=False)
+    prompt_hash = Column(String(64), nullable=False)
+    
+    # Job whose result file holds the cached analysis
+    source_job_id = Column(String(36), nullable=True)
+    hit_count = Column(Integer, default=0)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=True)
+    
+    def __repr__(self):
+        return f"<AnalysisCacheEntry(shortcode='{self.shortcode}', type='{self.analysis_type}')>"
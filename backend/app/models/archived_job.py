@@ -0,0 +1,43 @@
+"""
+Database model for archived video processing jobs.
+"""
+from sqlalchemy import Column, Integer, String, DateTime, Text, Enum
+from sqlalchemy.sql import func
+
+from ..core.database import Base
+from .video_job import JobStatus
+
+
+class ArchivedJob(Base):
+    """Finished job moved out of video_jobs by the retention engine."""
+    
+    __tablename__ = "video_jobs_archive"
+    
+    id = Column(Integer, primary_key=True)
+    job_id = Column(String(36), unique=True, index=True, nullable=False)
+    batch_id = Column(String(36), nullable=True)
+    
+    instagram_url = Column(String(500), nullable=False)
+    analysis_type = Column(String(50), nullable=True)
+    shortcode = Column(String(64), nullable=True)
+    
+    status = Column(Enum(JobStatus), nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=True)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+    error_message = Column(Text, nullable=True)
+    
+    # Result file, kept (compressed) after archival; source_job_id names
+    # the job owning it when the result was shared
+    result_path = Column(String(500), nullable=True)
+    source_job_id = Column(String(36), index=True, nullable=True)
+    
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    @property
+    def result_job_id(self) -> str:
+        """Job whose result file holds this job's analysis."""
+        return self.source_job_id or self.job_id
+    
+    def __repr__(self):
+        return f"<ArchivedJob(job_id='{self.job_id}', status='{self.status}')>"
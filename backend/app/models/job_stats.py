@@ -0,0 +1,40 @@
+"""
+Database models for incrementally maintained job statistics.
+"""
+from sqlalchemy import Column, Integer, Float, Enum
+
+from ..core.database import Base
+from .video_job import JobStatus
+
+# Upper bounds (seconds) of the processing time histogram; the buckets are
+# rebuilt from video_jobs on startup, so they can be changed freely
+DURATION_BUCKETS = (
+    1.0, 2.5, 5.0, 7.5, 10.0, 15.0, 20.0, 30.0, 45.0, 60.0, 90.0, 120.0,
+    180.0, 240.0, 300.0, 450.0, 600.0, 900.0, 1200.0, 1800.0, 3600.0, float("inf")
+)
+
+
+class JobStatusCount(Base):
+    """Number of jobs currently in a status."""
+
+    __tablename__ = "job_status_counts"
+
+    status = Column(Enum(JobStatus), primary_key=True)
+    job_count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<JobStatusCount(status='{self.status}', job_count={self.job_count})>"
+
+
+class JobDurationBucket(Base):
+    """Histogram bucket of the processing time of completed jobs."""
+
+    __tablename__ = "job_duration_buckets"
+
+    # Inclusive upper bound in seconds; the last bucket is unbounded
+    upper_bound = Column(Float, primary_key=True)
+    job_count = Column(Integer, nullable=False, default=0)
+    total_seconds = Column(Float, nullable=False, default=0.0)
+
+    def __repr__(self):
+        return f"<JobDurationBucket(upper_bound={self.upper_bound}, job_count={self.job_count})>"
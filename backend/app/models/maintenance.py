@@ -0,0 +1,49 @@
+"""
+Database models for state shared by the background maintenance tasks.
+"""
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Text
+
+from ..core.database import Base
+
+
+class LeaderLease(Base):
+    """Lease naming the process that runs a group of background tasks."""
+
+    __tablename__ = "leader_leases"
+
+    name = Column(String(50), primary_key=True)
+    owner = Column(String(100), nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<LeaderLease(name='{self.name}', owner='{self.owner}')>"
+
+
+class RetentionState(Base):
+    """Progress of a retention policy, kept across sweeps and restarts."""
+
+    __tablename__ = "retention_state"
+
+    policy = Column(String(50), primary_key=True)
+    # Last (created_at as stored, id) examined
+    watermark_created_at = Column(String(50), nullable=True)
+    watermark_id = Column(Integer, nullable=True)
+    # JSON list of row ids behind the watermark that were not finished yet
+    deferred = Column(Text, nullable=False, default="[]")
+
+    def __repr__(self):
+        return f"<RetentionState(policy='{self.policy}', watermark_id={self.watermark_id})>"
+
+
+class DiskUsageSnapshot(Base):
+    """Disk usage of a managed directory from the last full rescan."""
+
+    __tablename__ = "disk_usage_snapshots"
+
+    directory = Column(String(50), primary_key=True)
+    total_size = Column(BigInteger, nullable=False, default=0)
+    file_count = Column(Integer, nullable=False, default=0)
+    reconciled_at = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<DiskUsageSnapshot(directory='{self.directory}', total_size={self.total_size})>"
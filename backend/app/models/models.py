@@ -1,54 +1,10 @@
 """
 Database models for Instagram Video Analyzer.
 """
-import enum
-from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Text, Float, Enum, Boolean
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy import Column, Integer, String, DateTime, Text, Float
 from sqlalchemy.sql import func
 
-Base = declarative_base()
-
-
-class JobStatus(enum.Enum):
-    """Job status enumeration."""
-    PENDING = "pending"
-    PROCESSING = "processing"
-    COMPLETED = "completed"
-    FAILED = "failed"
-
-
-class VideoJob(Base):
-    """Video analysis job model."""
-    __tablename__ = "video_jobs"
-    
-    id = Column(Integer, primary_key=True, index=True)
-    job_id = Column(String(36), unique=True, index=True, nullable=False)
-    instagram_url = Column(String(500), nullable=False)
-    analysis_type = Column(String(50), default="comprehensive")
-    status = Column(Enum(JobStatus), default=JobStatus.PENDING)
-    
-    # Progress tracking
-    download_progress = Column(Float, default=0.0)
-    analysis_progress = Column(Float, default=0.0)
-    
-    # File information
-    video_path = Column(String(500))
-    video_filename = Column(String(255))
-    video_size = Column(Integer)
-    result_path = Column(String(500))
-    
-    # Analysis results
-    analysis_result = Column(Text)
-    error_message = Column(Text)
-    
-    # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    started_at = Column(DateTime(timezone=True))
-    completed_at = Column(DateTime(timezone=True))
-    
-    def __repr__(self):
-        return f"<VideoJob(job_id='{self.job_id}', status='{self.status}')>"
+from ..core.database import Base
 
 
 class AnalysisResult(Base):
@@ -109,7 +65,7 @@ class SystemMetrics(Base):
     __tablename__ = "system_metrics"
     
     id = Column(Integer, primary_key=True, index=True)
-    metric_name = Column(String(100), nullable=False)
+    metric_name = Column(String(100), index=True, nullable=False)
     metric_value = Column(Float, nullable=False)
     metric_unit = Column(String(20))
     
@@ -117,7 +73,7 @@ class SystemMetrics(Base):
     job_id = Column(String(36))
     analysis_type = Column(String(50))
     
-    timestamp = Column(DateTime(timezone=True), server_default=func.now())
+    timestamp = Column(DateTime(timezone=True), index=True, server_default=func.now())
     
     def __repr__(self):
         return f"<SystemMetrics(name='{self.metric_name}', value={self.metric_value})>"
@@ -1,7 +1,8 @@
 """
 Database models for video processing jobs.
 """
-from sqlalchemy import Column, Integer, String, DateTime, Text, Enum, Float
+from sqlalchemy import Column, Integer, String, DateTime, Text, Enum, Float, Index
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 from datetime import datetime
 import enum
@@ -22,14 +23,23 @@ class VideoJob(Base):
     """Video processing job model."""
     
     __tablename__ = "video_jobs"
+    __table_args__ = (
+        # Newest-first listings (optionally per status) and the queue's
+        # oldest-pending claim, with id breaking created_at ties
+        Index("ix_video_jobs_status_created_at", "status", "created_at", "id"),
+        Index("ix_video_jobs_created_at", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     
     # Job identification
     job_id = Column(String(36), unique=True, index=True, nullable=False)
+    batch_id = Column(String(36), index=True, nullable=True)
     
     # Input information
     instagram_url = Column(String(500), nullable=False)
+    analysis_type = Column(String(50), default="comprehensive")
+    shortcode = Column(String(64), index=True, nullable=True)
     video_filename = Column(String(255), nullable=True)
     
     # Job status and timing
@@ -37,23 +47,42 @@ class VideoJob(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     started_at = Column(DateTime(timezone=True), nullable=True)
     completed_at = Column(DateTime(timezone=True), nullable=True)
+    deadline_at = Column(DateTime(timezone=True), nullable=True)
+    
+    # Worker process holding a PROCESSING job, renewed while it runs
+    lease_owner = Column(String(100), nullable=True)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
     
     # Processing information
+    stage = Column(String(50), nullable=True)
     download_progress = Column(Float, default=0.0)
     analysis_progress = Column(Float, default=0.0)
     
-    # Results
-    analysis_result = Column(Text, nullable=True)
+    # Results; the analysis payload is stored once, in the result file at
+    # result_path. analysis_result only holds payloads of older releases
+    # and is never loaded unless accessed explicitly.
+    analysis_result = deferred(Column(Text, nullable=True))
     error_message = Column(Text, nullable=True)
     
     # File paths
     video_path = Column(String(500), nullable=True)
     result_path = Column(String(500), nullable=True)
+    gemini_file_name = Column(String(255), nullable=True)
+    
+    # Job whose result file result_path points at, for jobs completed from
+    # the analysis cache or from an identical in-flight job; None when the
+    # job wrote its own
+    source_job_id = Column(String(36), index=True, nullable=True)
     
     # Metadata
     video_duration = Column(Float, nullable=True)
     video_size = Column(Integer, nullable=True)
     
+    @property
+    def result_job_id(self) -> str:
+        """Job whose result file holds this job's analysis."""
+        return self.source_job_id or self.job_id
+    
     def __repr__(self):
         return f"<VideoJob(id={self.id}, job_id='{self.job_id}', status='{self.status}')>"
     
@@ -62,18 +91,24 @@ class VideoJob(Base):
         return {
             "id": self.id,
             "job_id": self.job_id,
+            "batch_id": self.batch_id,
             "instagram_url": self.instagram_url,
+            "analysis_type": self.analysis_type,
+            "shortcode": self.shortcode,
             "video_filename": self.video_filename,
             "status": self.status.value,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "started_at": self.started_at.isoformat() if self.started_at else None,
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            "deadline_at": self.deadline_at.isoformat() if self.deadline_at else None,
+            "stage": self.stage,
             "download_progress": self.download_progress,
             "analysis_progress": self.analysis_progress,
-            "analysis_result": self.analysis_result,
             "error_message": self.error_message,
             "video_path": self.video_path,
             "result_path": self.result_path,
+            "source_job_id": self.source_job_id,
+            "gemini_file_name": self.gemini_file_name,
             "video_duration": self.video_duration,
             "video_size": self.video_size,
         }
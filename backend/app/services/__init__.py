@@ -4,5 +4,6 @@ Services package.
 from .instagram_downloader import InstagramDownloader
 from .video_analyzer import VideoAnalyzer
 from .file_manager import FileManager
+from .job_queue import JobQueue
 
-__all__ = ["InstagramDownloader", "VideoAnalyzer", "FileManager"]
+__all__ = ["InstagramDownloader", "VideoAnalyzer", "FileManager", "JobQueue"]
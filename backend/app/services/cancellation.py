@@ -0,0 +1,59 @@
+"""
+Cooperative cancellation of running jobs.
+"""
+import asyncio
+import threading
+from typing import Optional
+
+
+class JobCancelled(Exception):
+    """Raised when work is abandoned because its job was cancelled."""
+
+
+class CancellationToken:
+    """
+    Cancellation flag shared by a job's coroutines and worker threads.
+
+    Blocking code polls it (``raise_if_cancelled``) or sleeps on it
+    (``sleep``), so a cancel interrupts waits immediately; coroutines can
+    await ``wait`` to race a cancel against other work.
+    """
+
+    def __init__(self):
+        """Initialize the token; must be created on the event loop thread."""
+        self._event = threading.Event()
+        self._async_event = asyncio.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the job was cancelled."""
+        return self._event.is_set()
+
+    def cancel(self):
+        """Cancel the job; safe to call from any thread."""
+        self._event.set()
+        try:
+            self._loop.call_soon_threadsafe(self._async_event.set)
+        except RuntimeError:
+            # Loop already closed during shutdown
+            pass
+
+    def raise_if_cancelled(self):
+        """Raise JobCancelled if the job was cancelled."""
+        if self._event.is_set():
+            raise JobCancelled("Job cancelled")
+
+    def sleep(self, seconds: float):
+        """
+        Block for up to the given time, waking up on cancellation.
+
+        Args:
+            seconds: Time to sleep
+        """
+        if self._event.wait(seconds):
+            raise JobCancelled("Job cancelled")
+
+    async def wait(self):
+        """Wait until the job is cancelled."""
+        await self._async_event.wait()
@@ -0,0 +1,317 @@
+"""
+Disk quota for downloaded videos with least-recently-used eviction.
+"""
+import os
+import time
+import asyncio
+import logging
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+
+from sqlalchemy import select, update
+
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models import VideoJob, JobStatus
+from .executors import run_blocking, io_executor
+from .file_manager import FileManager
+from .leader import LeaderElection, leads
+from .prometheus import QUOTA_EVICTIONS, QUOTA_RECLAIMED_BYTES
+
+logger = logging.getLogger(__name__)
+
+# Job directories checked against the database per eviction round
+EVICTION_BATCH = 100
+
+
+class DiskQuotaManager:
+    """
+    Keeps downloaded videos within ``video_quota_bytes``.
+
+    Usage is the FileManager ledger for job directories plus the blob
+    store, so checking it never scans the disk. Job directories are kept
+    in least-recently-used order: a directory is used when a video is
+    downloaded or linked into it and when its job finishes. Jobs being
+    processed are pinned and never evicted; of the rest, only videos of
+    completed jobs are deleted, oldest first, whenever usage is over
+    budget or a download reserves room for a new video. A video shared
+    with other jobs through the blob store only frees space once its last
+    job directory is evicted. With an election, only its leader runs the
+    periodic check; every process still makes room for its own downloads.
+    """
+
+    def __init__(self, file_manager: FileManager, leader: Optional[LeaderElection] = None):
+        """
+        Initialize the quota manager.
+
+        Args:
+            file_manager: File manager owning the job directories
+            leader: Election deciding which process runs the periodic check; None checks here
+        """
+        self.file_manager = file_manager
+        self.leader = leader
+        self.budget = settings.video_quota_bytes
+        self.enabled = self.budget > 0
+        self.interval = settings.video_quota_check_interval
+        self.reservation = settings.max_file_size
+
+        # job_id -> last access time, least recently used first
+        self._access: "OrderedDict[str, float]" = OrderedDict()
+        self._pinned: Dict[str, int] = {}
+        self._reserved: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._evict_lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+        self.evictions = {"over_budget": 0, "reserve": 0}
+        self.reclaimed_bytes = {"over_budget": 0, "reserve": 0}
+        self.recent_evictions: deque = deque(maxlen=50)
+
+    async def start(self):
+        """Load access times from the job directories and start the periodic check."""
+        if self._task or not self.enabled:
+            return
+
+        await run_blocking(io_executor, self.load_access_times)
+        self._task = asyncio.create_task(self._checker())
+        logger.info(f"Disk quota manager started with a budget of {self.budget} bytes")
+
+    async def stop(self):
+        """Stop the periodic check."""
+        if not self._task:
+            return
+
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        logger.info("Disk quota manager stopped")
+
+    def load_access_times(self):
+        """Seed the access order from the modification times of the job directories."""
+        found = []
+        for job_id, job_dir in self.file_manager.iter_job_directories():
+            try:
+                found.append((os.stat(job_dir).st_mtime, job_id))
+            except FileNotFoundError:
+                continue
+
+        with self._lock:
+            known = self._access
+            self._access = OrderedDict((job_id, mtime) for mtime, job_id in sorted(found) if job_id not in known)
+            self._access.update(known)
+
+    def touch(self, job_id: str):
+        """
+        Mark a job directory as used now.
+
+        Args:
+            job_id: Unique job identifier
+        """
+        with self._lock:
+            self._access[job_id] = time.time()
+            self._access.move_to_end(job_id)
+
+    def pin(self, job_id: str):
+        """
+        Protect a job's directory from eviction while the job is processed.
+
+        Args:
+            job_id: Unique job identifier
+        """
+        with self._lock:
+            self._pinned[job_id] = self._pinned.get(job_id, 0) + 1
+
+    def unpin(self, job_id: str):
+        """
+        Release a pin taken by ``pin``; the directory counts as used now.
+
+        Args:
+            job_id: Unique job identifier
+        """
+        with self._lock:
+            count = self._pinned.pop(job_id, 0) - 1
+            if count > 0:
+                self._pinned[job_id] = count
+            self._reserved.pop(job_id, None)
+            if job_id in self._access:
+                self._access[job_id] = time.time()
+                self._access.move_to_end(job_id)
+
+    def reserve(self, job_id: str, size: Optional[int] = None):
+        """
+        Make room for a download before it starts.
+
+        Evicts videos until current usage plus all pending reservations
+        fits the budget. If only pinned videos are left the download goes
+        ahead anyway and the quota is exceeded until they are released.
+
+        Args:
+            job_id: Job about to download
+            size: Expected bytes; defaults to ``max_file_size``
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._reserved[job_id] = size or self.reservation
+        self.enforce(reason="reserve")
+
+    def release(self, job_id: str):
+        """
+        Drop a job's reservation once its download is on disk and in the ledger.
+
+        Args:
+            job_id: Unique job identifier
+        """
+        with self._lock:
+            self._reserved.pop(job_id, None)
+        self.touch(job_id)
+
+    def get_usage(self) -> int:
+        """Bytes used by downloaded videos, from the disk usage ledger."""
+        usage = self.file_manager.get_disk_usage()
+        return sum(usage.get(name, {}).get("total_size", 0) for name in ("upload", "blobs"))
+
+    def enforce(self, reason: str = "over_budget") -> int:
+        """
+        Evict least recently used videos of completed jobs until within budget.
+
+        Args:
+            reason: Why eviction runs, recorded with every eviction
+
+        Returns:
+            Bytes reclaimed
+        """
+        if not self.enabled:
+            return 0
+
+        reclaimed = 0
+        with self._evict_lock:
+            while True:
+                with self._lock:
+                    reserved = sum(self._reserved.values())
+                excess = self.get_usage() + reserved - self.budget
+                if excess <= 0:
+                    break
+
+                candidates = self._eviction_candidates()
+                if not candidates:
+                    logger.warning(f"Video quota exceeded by {excess} bytes; only videos of active jobs are left")
+                    break
+
+                for job_id in candidates:
+                    freed = self._evict(job_id, reason)
+                    reclaimed += freed
+                    excess -= freed
+                    if excess <= 0:
+                        break
+
+        return reclaimed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get budget, usage and eviction statistics."""
+        with self._lock:
+            tracked = len(self._access)
+            pinned = len(self._pinned)
+            reserved = sum(self._reserved.values())
+
+        usage = self.get_usage()
+        return {
+            "enabled": self.enabled,
+            "budget_bytes": self.budget,
+            "used_bytes": usage,
+            "reserved_bytes": reserved,
+            "utilisation": round(usage / self.budget, 4) if self.enabled else 0.0,
+            "tracked_jobs": tracked,
+            "pinned_jobs": pinned,
+            "evictions": dict(self.evictions),
+            "reclaimed_bytes": dict(self.reclaimed_bytes),
+            "recent_evictions": list(self.recent_evictions)
+        }
+
+    def _eviction_candidates(self) -> List[str]:
+        """
+        Get the least recently used unpinned directories of completed jobs.
+
+        Directories of jobs that are not completed are skipped in this pass;
+        directories without a job row are dropped from tracking.
+        """
+        with self._lock:
+            unpinned = [
+                job_id for job_id in self._access
+                if job_id not in self._pinned and job_id not in self._reserved
+            ]
+
+        for start in range(0, len(unpinned), EVICTION_BATCH):
+            batch = unpinned[start:start + EVICTION_BATCH]
+            db = SessionLocal()
+            try:
+                statuses = dict(db.execute(
+                    select(VideoJob.job_id, VideoJob.status).where(VideoJob.job_id.in_(batch))
+                ).all())
+            finally:
+                db.close()
+
+            with self._lock:
+                for job_id in batch:
+                    if job_id not in statuses:
+                        self._access.pop(job_id, None)
+
+            completed = [job_id for job_id in batch if statuses.get(job_id) == JobStatus.COMPLETED]
+            if completed:
+                return completed
+        return []
+
+    def _evict(self, job_id: str, reason: str) -> int:
+        """
+        Delete a job's video directory.
+
+        Returns:
+            Bytes freed on disk
+        """
+        with self._lock:
+            if job_id in self._pinned:
+                return 0
+            last_access = self._access.pop(job_id, None)
+
+        if not self.file_manager.find_job_directory(job_id).exists():
+            # Already removed, e.g. by retention
+            return 0
+        freed = self.file_manager.remove_job_directory(job_id)
+
+        db = SessionLocal()
+        try:
+            db.execute(
+                update(VideoJob)
+                .where(VideoJob.job_id == job_id, VideoJob.video_path.isnot(None))
+                .values(video_path=None)
+            )
+            db.commit()
+        finally:
+            db.close()
+
+        self.evictions[reason] += 1
+        self.reclaimed_bytes[reason] += freed
+        QUOTA_EVICTIONS.labels(reason).inc()
+        QUOTA_RECLAIMED_BYTES.labels(reason).inc(freed)
+        self.recent_evictions.append({
+            "job_id": job_id,
+            "reason": reason,
+            "bytes": freed,
+            "last_access": datetime.utcfromtimestamp(last_access).isoformat() if last_access else None,
+            "evicted_at": datetime.utcnow().isoformat()
+        })
+        logger.info(f"Evicted video of job {job_id} ({reason}), {freed} bytes freed")
+        return freed
+
+    async def _checker(self):
+        """Enforce the quota now and then every interval, while leading."""
+        while True:
+            try:
+                if leads(self.leader):
+                    await run_blocking(io_executor, self.enforce)
+            except Exception as e:
+                logger.error(f"Error enforcing video quota: {e}")
+            await asyncio.sleep(self.interval)
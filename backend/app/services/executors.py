@@ -0,0 +1,54 @@
+"""
+Dedicated thread pools for blocking work.
+
+Instaloader, the google-genai client, SQLite and file I/O are all
+synchronous. Running them on the event loop stalls every request, and
+sharing the default executor lets one slow service starve the others, so
+each kind of work gets its own bounded pool.
+"""
+import asyncio
+import functools
+import logging
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+instagram_executor = ThreadPoolExecutor(
+    max_workers=settings.instagram_executor_workers,
+    thread_name_prefix="instagram"
+)
+gemini_executor = ThreadPoolExecutor(
+    max_workers=settings.gemini_executor_workers,
+    thread_name_prefix="gemini"
+)
+io_executor = ThreadPoolExecutor(
+    max_workers=settings.io_executor_workers,
+    thread_name_prefix="io"
+)
+
+
+async def run_blocking(executor: Executor, func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a blocking callable on an executor without blocking the event loop.
+
+    Args:
+        executor: Pool to run the call on
+        func: Blocking callable
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Return value of func
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
+
+def shutdown_executors():
+    """Shut down all pools without waiting for abandoned calls."""
+    for executor in (instagram_executor, gemini_executor, io_executor):
+        executor.shutdown(wait=False, cancel_futures=True)
+    logger.info("Blocking executors shut down")
@@ -2,30 +2,557 @@
 File management service for handling video files and results.
 """
 import os
+import gzip
 import json
 import shutil
+import asyncio
+import re
+import hashlib
 import logging
+import tempfile
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple, Iterator
 from datetime import datetime
 
 from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models import DiskUsageSnapshot
+from .executors import run_blocking, io_executor
+from .leader import LeaderElection, leads
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+RESULT_SUFFIX = "_analysis.json"
+
+# File in a job directory naming the blob its video is linked to
+BLOB_MANIFEST = ".blob"
+
+# Directory of the blob store mapping shortcodes to the blob of their video
+BLOB_HINTS_DIR = "shortcodes"
+
+_SHORTCODE_PATTERN = re.compile(r"[A-Za-z0-9_-]+")
+
+# First bytes of a gzip stream. Result files are either gzip-compressed
+# or plain JSON (always starting with "{"), so these bytes mark the format
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def dumps_json(document: Any, pretty: bool = False) -> bytes:
+    """
+    Serialize a document to UTF-8 JSON, with orjson when it is installed.
+    
+    Args:
+        document: JSON-compatible document
+        pretty: Indent the output by two spaces
+        
+    Returns:
+        JSON bytes
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(document, option=orjson.OPT_INDENT_2 if pretty else 0)
+        except TypeError:
+            # Outside orjson's types (e.g. integers beyond 64 bits)
+            pass
+    if pretty:
+        return json.dumps(document, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(document, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads_json(data: bytes) -> Any:
+    """
+    Parse UTF-8 JSON, with orjson when it is installed.
+    
+    Args:
+        data: JSON bytes
+        
+    Returns:
+        Parsed document
+    """
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def write_file_atomic(path: Path, data: bytes):
+    """
+    Replace a file's contents so readers see the old or the new file, never a partial one.
+    
+    Writes and fsyncs a temporary file in the same directory, then
+    renames it over the target.
+    
+    Args:
+        path: File to write
+        data: New contents
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            os.fchmod(f.fileno(), 0o644)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def encode_result_document(document: Dict[str, Any], compress: bool = True, pretty: bool = False) -> bytes:
+    """
+    Serialize a result document as stored on disk.
+    
+    Args:
+        document: Result document
+        compress: Whether to gzip the JSON
+        pretty: Indent the JSON, for debugging
+        
+    Returns:
+        File contents
+    """
+    data = dumps_json(document, pretty=pretty)
+    if compress:
+        # Fixed mtime so identical documents produce identical files
+        data = gzip.compress(data, compresslevel=settings.result_compression_level, mtime=0)
+    return data
+
+
+class ResultFileCache:
+    """
+    Size-bounded LRU cache of parsed result documents.
+    
+    Entries are keyed by job_id and remember the modification time of the
+    file they were parsed from; a lookup with a different mtime misses, so
+    rewritten files are never served stale. Sizes are the JSON lengths of
+    the documents. Cached documents are shared and must not be mutated.
+    """
+    
+    def __init__(self, max_bytes: int):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_bytes: Total JSON size of the documents kept (0 disables the cache)
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[int, int, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, job_id: str, mtime_ns: int) -> Optional[Dict[str, Any]]:
+        """
+        Look up the document parsed from a job's result file.
+        
+        Args:
+            job_id: Unique job identifier
+            mtime_ns: Current modification time of the file
+            
+        Returns:
+            Parsed document, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(job_id)
+            if entry and entry[0] == mtime_ns:
+                self._entries.move_to_end(job_id)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+            return None
+    
+    def put(self, job_id: str, mtime_ns: int, document: Dict[str, Any], size: int):
+        """
+        Store a parsed document, evicting the least recently used ones.
+        
+        Args:
+            job_id: Unique job identifier
+            mtime_ns: Modification time of the file the document came from
+            document: Parsed document
+            size: JSON size of the document in bytes
+        """
+        if size > self.max_bytes:
+            self.discard(job_id)
+            return
+        
+        with self._lock:
+            old = self._entries.pop(job_id, None)
+            if old:
+                self.size -= old[1]
+            self._entries[job_id] = (mtime_ns, size, document)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+    
+    def discard(self, job_id: str):
+        """
+        Drop a job's document.
+        
+        Args:
+            job_id: Unique job identifier
+        """
+        with self._lock:
+            entry = self._entries.pop(job_id, None)
+            if entry:
+                self.size -= entry[1]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache size and hit statistics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self.size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+def shard_prefix(job_id: str) -> Path:
+    """
+    Get the two-level shard directory of a job, e.g. ``ab/cd``.
+    
+    Derived from a hash of the job_id, so jobs spread evenly over 65536
+    directories whatever the job_id format.
+    
+    Args:
+        job_id: Unique job identifier
+        
+    Returns:
+        Relative shard path
+    """
+    digest = hashlib.sha1(job_id.encode("utf-8")).hexdigest()
+    return Path(digest[:2], digest[2:4])
+
+
+def is_shard_name(name: str) -> bool:
+    """Whether a directory name is a shard level (two hex digits)."""
+    return len(name) == 2 and all(c in "0123456789abcdef" for c in name)
+
+
+def _subdirectories(path) -> List[os.DirEntry]:
+    """List the subdirectories of a directory; empty if it is missing."""
+    try:
+        with os.scandir(path) as entries:
+            return [entry for entry in entries if entry.is_dir(follow_symlinks=False)]
+    except FileNotFoundError:
+        return []
+
+
+def sha256_file(path: Path) -> str:
+    """
+    Hash a file in 1 MB chunks.
+    
+    Args:
+        path: File to hash
+        
+    Returns:
+        Hex sha256 digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def scan_tree(path: Path, skip_linked: bool = False) -> Tuple[int, int]:
+    """
+    Total the regular files below a directory with ``os.scandir``.
+    
+    Uses the stat data cached by the directory listing where the platform
+    provides it; symlinks are not followed.
+    
+    Args:
+        path: Directory to scan
+        skip_linked: Leave out files with more than one hard link, i.e.
+            videos shared with the blob store, which counts them once
+        
+    Returns:
+        Tuple of (total bytes, file count); (0, 0) if the directory is missing
+    """
+    total_size = file_count = 0
+    pending = [path]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            stat = entry.stat(follow_symlinks=False)
+                            if skip_linked and stat.st_nlink > 1:
+                                continue
+                            total_size += stat.st_size
+                            file_count += 1
+                    except FileNotFoundError:
+                        # Deleted while scanning
+                        continue
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+    return total_size, file_count
+
 
 class FileManager:
-    """File management service."""
+    """
+    File management service.
+    
+    Result files and job directories live in hash-sharded subdirectories
+    (``results/ab/cd/<job_id>_analysis.json``, ``videos/ab/cd/<job_id>/``).
+    Files from the older flat layout are still found until
+    ``app.services.layout_migration`` moves them.
+    
+    Downloaded videos are deduplicated through a content-addressed blob
+    store (``blobs/ab/cd/<sha256>.mp4``): a job directory holds a hard link
+    to the blob, and the link count is the reference count, so the blob is
+    deleted together with the last job directory linking to it.
     
-    def __init__(self):
-        """Initialize file manager."""
+    Keeps a ledger of the bytes and files in each managed directory,
+    adjusted by every write and delete made through this class, so disk
+    usage reads never touch the filesystem. A background task rescans the
+    directories every ``disk_usage_reconcile_interval`` seconds to pick up
+    changes made behind its back and correct any drift. With an election,
+    only its leader rescans and stores the totals in
+    ``disk_usage_snapshots``; the other processes adopt them instead.
+    """
+    
+    def __init__(self, leader: Optional[LeaderElection] = None):
+        """
+        Initialize file manager.
+        
+        Args:
+            leader: Election deciding which process rescans; None rescans here
+        """
+        self.leader = leader
         self.upload_dir = Path(settings.upload_dir)
         self.results_dir = Path(settings.results_dir)
         self.temp_dir = Path(settings.temp_dir)
+        self.blob_dir = Path(settings.blob_dir)
         
         # Ensure directories exist
-        for directory in [self.upload_dir, self.results_dir, self.temp_dir]:
+        for directory in [self.upload_dir, self.results_dir, self.temp_dir, self.blob_dir]:
             directory.mkdir(parents=True, exist_ok=True)
+        
+        self.directories = {
+            "upload": self.upload_dir,
+            "results": self.results_dir,
+            "temp": self.temp_dir,
+            "blobs": self.blob_dir
+        }
+        self.dedup_videos = settings.video_dedup_enabled
+        self.reconcile_interval = settings.disk_usage_reconcile_interval
+        self.compress_results = settings.result_compression
+        self.pretty_results = settings.result_pretty_json
+        self.result_cache = ResultFileCache(settings.result_file_cache_max_bytes)
+        
+        # [total bytes, file count] per managed directory
+        self._usage: Dict[str, list] = {name: [0, 0] for name in self.directories}
+        # (total bytes, file count) recorded for each job download directory
+        self._job_usage: Dict[str, Tuple[int, int]] = {}
+        self._usage_lock = threading.Lock()
+        self._reconcile_lock = threading.Lock()
+        self.reconciled_at: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    async def start(self):
+        """Start the periodic disk usage reconciliation."""
+        if self._task:
+            return
+        
+        self._task = asyncio.create_task(self._reconciler())
+    
+    async def stop(self):
+        """Stop the disk usage reconciliation."""
+        if not self._task:
+            return
+        
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+    
+    def _adjust_usage(self, name: str, size_delta: int, count_delta: int = 0):
+        """Apply a change to the ledger of a managed directory."""
+        with self._usage_lock:
+            usage = self._usage[name]
+            usage[0] += size_delta
+            usage[1] += count_delta
+    
+    def record_job_directory(self, job_id: str):
+        """
+        Rescan a job's download directory and update the ledger.
+        
+        Called once a download has finished writing into the directory.
+        
+        Args:
+            job_id: Unique job identifier
+        """
+        total_size, file_count = scan_tree(self.find_job_directory(job_id), skip_linked=True)
+        with self._usage_lock:
+            old_size, old_count = self._job_usage.get(job_id, (0, 0))
+            self._job_usage[job_id] = (total_size, file_count)
+            self._usage["upload"][0] += total_size - old_size
+            self._usage["upload"][1] += file_count - old_count
+    
+    def reconcile_disk_usage(self, force: bool = True):
+        """
+        Rebuild the ledger from a scan of the managed directories.
+        
+        Writes made while the scan runs may be counted twice or missed;
+        the next pass corrects them.
+        
+        Args:
+            force: Rescan even if the ledger was already built
+        """
+        with self._reconcile_lock:
+            if not force and self.reconciled_at:
+                return
+            
+            usage = {name: [0, 0] for name in self.directories}
+            job_usage = {}
+            for name, directory in self.directories.items():
+                if name == "blobs":
+                    usage[name] = list(self._collect_blobs())
+                    continue
+                if name != "upload":
+                    usage[name] = list(scan_tree(directory))
+                    continue
+                
+                # Keep per-job totals so deleting a job directory needs no scan
+                for job_id, job_dir in self.iter_job_directories():
+                    total_size, file_count = job_usage[job_id] = scan_tree(job_dir, skip_linked=True)
+                    usage[name][0] += total_size
+                    usage[name][1] += file_count
+            
+            with self._usage_lock:
+                drift = {
+                    name: usage[name][0] - self._usage[name][0]
+                    for name in usage if usage[name][0] != self._usage[name][0]
+                }
+                self._usage = usage
+                self._job_usage = job_usage
+            
+            if drift and self.reconciled_at:
+                logger.info(f"Disk usage ledger corrected by {drift} bytes")
+            self.reconciled_at = datetime.utcnow()
+    
+    def save_usage_snapshot(self):
+        """Store the ledger totals for processes that do not rescan themselves."""
+        with self._usage_lock:
+            snapshot = {name: tuple(usage) for name, usage in self._usage.items()}
+        
+        db = SessionLocal()
+        try:
+            for name, (total_size, file_count) in snapshot.items():
+                db.merge(DiskUsageSnapshot(
+                    directory=name, total_size=total_size, file_count=file_count, reconciled_at=self.reconciled_at
+                ))
+            db.commit()
+        finally:
+            db.close()
+    
+    def load_usage_snapshot(self) -> bool:
+        """
+        Adopt the ledger totals of the last rescan made by the leader.
+        
+        Per-job totals are kept, so they only cover jobs downloaded here.
+        
+        Returns:
+            True if a snapshot newer than the ledger was adopted
+        """
+        db = SessionLocal()
+        try:
+            rows = db.query(DiskUsageSnapshot).filter(DiskUsageSnapshot.directory.in_(list(self.directories))).all()
+        finally:
+            db.close()
+        
+        if len(rows) < len(self.directories):
+            return False
+        reconciled_at = min(row.reconciled_at for row in rows)
+        if self.reconciled_at and reconciled_at <= self.reconciled_at:
+            return False
+        
+        with self._usage_lock:
+            for row in rows:
+                self._usage[row.directory] = [row.total_size, row.file_count]
+        self.reconciled_at = reconciled_at
+        return True
+    
+    def job_directory_paths(self, job_id: str) -> Tuple[Path, Path]:
+        """
+        Get the sharded and the legacy flat location of a job directory.
+        
+        Args:
+            job_id: Unique job identifier
+            
+        Returns:
+            Tuple of (sharded path, legacy path)
+        """
+        return self.upload_dir / shard_prefix(job_id) / job_id, self.upload_dir / job_id
+    
+    def result_file_paths(self, job_id: str) -> Tuple[Path, Path]:
+        """
+        Get the sharded and the legacy flat location of a result file.
+        
+        Args:
+            job_id: Unique job identifier
+            
+        Returns:
+            Tuple of (sharded path, legacy path)
+        """
+        name = f"{job_id}{RESULT_SUFFIX}"
+        return self.results_dir / shard_prefix(job_id) / name, self.results_dir / name
+    
+    def _resolve(self, sharded: Path, legacy: Path) -> Path:
+        """
+        Pick the sharded path unless only the legacy one exists.
+        
+        Checked in this order, a file moved by the migration between the
+        two checks is still found at the sharded path.
+        """
+        if sharded.exists() or not legacy.exists():
+            return sharded
+        return legacy
+    
+    def find_job_directory(self, job_id: str) -> Path:
+        """
+        Locate a job's directory without creating it.
+        
+        Args:
+            job_id: Unique job identifier
+            
+        Returns:
+            Existing directory, or its sharded path if there is none
+        """
+        return self._resolve(*self.job_directory_paths(job_id))
+    
+    def iter_job_directories(self) -> Iterator[Tuple[str, Path]]:
+        """
+        Iterate over the job directories in both layouts.
+        
+        Yields:
+            Tuples of (job_id, directory)
+        """
+        for entry in _subdirectories(self.upload_dir):
+            if not is_shard_name(entry.name):
+                yield entry.name, Path(entry.path)
+                continue
+            for shard in _subdirectories(entry.path):
+                if is_shard_name(shard.name):
+                    for job_dir in _subdirectories(shard.path):
+                        yield job_dir.name, Path(job_dir.path)
     
     def get_job_directory(self, job_id: str) -> Path:
         """
@@ -37,14 +564,59 @@ class FileManager:
         Returns:
             Path to job directory
         """
-        job_dir = self.upload_dir / job_id
+        job_dir = self.find_job_directory(job_id)
         job_dir.mkdir(parents=True, exist_ok=True)
         return job_dir
     
+    def get_result_file(self, job_id: str) -> Path:
+        """
+        Get the path of a job's analysis result file.
+        
+        Args:
+            job_id: Unique job identifier
+            
+        Returns:
+            Path to the result file, in the legacy layout if only that one exists
+        """
+        return self._resolve(*self.result_file_paths(job_id))
+    
+    def has_analysis_result(self, job_id: str) -> bool:
+        """
+        Check whether a job's analysis result file exists.
+        
+        Args:
+            job_id: Unique job identifier
+            
+        Returns:
+            True if the result file exists
+        """
+        return self.get_result_file(job_id).exists()
+    
+    def build_result_document(self, job_id: str, analysis_result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Wrap an analysis result with job metadata, as stored on disk.
+        
+        Args:
+            job_id: Unique job identifier
+            analysis_result: Analysis result dictionary
+            
+        Returns:
+            Result document
+        """
+        return {
+            "job_id": job_id,
+            "timestamp": datetime.utcnow().isoformat(),
+            "analysis": analysis_result
+        }
+    
     def save_analysis_result(self, job_id: str, analysis_result: Dict[str, Any]) -> str:
         """
         Save analysis result to file.
         
+        Written as compact JSON, gzipped unless ``result_compression`` is
+        off, through a temporary file so a crash never leaves a truncated
+        result. Blocking; callers on the event loop go through ``run_blocking``.
+        
         Args:
             job_id: Unique job identifier
             analysis_result: Analysis result dictionary
@@ -53,17 +625,24 @@ class FileManager:
             Path to saved result file
         """
         try:
-            result_file = self.results_dir / f"{job_id}_analysis.json"
+            result_file, legacy_file = self.result_file_paths(job_id)
             
             # Add metadata
-            result_with_metadata = {
-                "job_id": job_id,
-                "timestamp": datetime.utcnow().isoformat(),
-                "analysis": analysis_result
-            }
+            result_with_metadata = self.build_result_document(job_id, analysis_result)
+            
+            old_size = self._file_size(result_file)
+            data = encode_result_document(
+                result_with_metadata, compress=self.compress_results, pretty=self.pretty_results
+            )
+            write_file_atomic(result_file, data)
+            self._adjust_usage("results", len(data) - (old_size or 0), 0 if old_size is not None else 1)
             
-            with open(result_file, 'w', encoding='utf-8') as f:
-                json.dump(result_with_metadata, f, indent=2, ensure_ascii=False)
+            # Drop a copy left in the legacy layout so it cannot shadow this one
+            legacy_size = self._file_size(legacy_file)
+            if legacy_size is not None:
+                legacy_file.unlink(missing_ok=True)
+                self._adjust_usage("results", -legacy_size, -1)
+            self.result_cache.discard(job_id)
             
             logger.info(f"Analysis result saved: {result_file}")
             return str(result_file)
@@ -76,6 +655,9 @@ class FileManager:
         """
         Load analysis result from file.
         
+        Served from the parsed result cache while the file's mtime is
+        unchanged; the returned dictionary must not be mutated.
+        
         Args:
             job_id: Unique job identifier
             
@@ -83,13 +665,24 @@ class FileManager:
             Analysis result dictionary or None if not found
         """
         try:
-            result_file = self.results_dir / f"{job_id}_analysis.json"
+            result_file = self.get_result_file(job_id)
             
-            if not result_file.exists():
+            try:
+                mtime_ns = result_file.stat().st_mtime_ns
+            except FileNotFoundError:
+                self.result_cache.discard(job_id)
                 return None
             
-            with open(result_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            document = self.result_cache.get(job_id, mtime_ns)
+            if document is not None:
+                return document
+            
+            data = result_file.read_bytes()
+            if data.startswith(GZIP_MAGIC):
+                data = gzip.decompress(data)
+            document = loads_json(data)
+            self.result_cache.put(job_id, mtime_ns, document, len(data))
+            return document
                 
         except Exception as e:
             logger.error(f"Error loading analysis result: {e}")
@@ -140,17 +733,17 @@ class FileManager:
         """
         try:
             # Clean up job directory (videos and temp files)
-            job_dir = self.upload_dir / job_id
-            if job_dir.exists():
-                shutil.rmtree(job_dir)
-                logger.info(f"Cleaned up job directory: {job_dir}")
+            self.remove_job_directory(job_id)
             
             # Optionally clean up results
             if not keep_results:
-                result_file = self.results_dir / f"{job_id}_analysis.json"
-                if result_file.exists():
+                result_file = self.get_result_file(job_id)
+                size = self._file_size(result_file)
+                if size is not None:
                     result_file.unlink()
+                    self._adjust_usage("results", -size, -1)
                     logger.info(f"Cleaned up result file: {result_file}")
+                self.result_cache.discard(job_id)
             
             return True
             
@@ -158,43 +751,286 @@ class FileManager:
             logger.error(f"Error cleaning up job files: {e}")
             return False
     
+    def remove_job_directory(self, job_id: str) -> int:
+        """
+        Delete a job's download directory.
+        
+        Args:
+            job_id: Unique job identifier
+            
+        Returns:
+            Bytes freed (0 if there was no directory)
+        """
+        job_dir = self.find_job_directory(job_id)
+        if not job_dir.exists():
+            return 0
+        
+        blob = self._linked_blob(job_dir)
+        freed, _ = scan_tree(job_dir, skip_linked=True)
+        shutil.rmtree(job_dir)
+        
+        # Remove what the ledger recorded; unrecorded files were never counted
+        with self._usage_lock:
+            recorded_size, recorded_count = self._job_usage.pop(job_id, (0, 0))
+            self._usage["upload"][0] -= recorded_size
+            self._usage["upload"][1] -= recorded_count
+        
+        if blob:
+            freed += self._release_blob(blob)
+        
+        logger.info(f"Cleaned up job directory: {job_dir}")
+        return freed
+    
+    def blob_path(self, digest: str, suffix: str = ".mp4") -> Path:
+        """
+        Get the blob store path of a video.
+        
+        Args:
+            digest: Hex sha256 of the video
+            suffix: File extension of the video
+            
+        Returns:
+            Path of the blob
+        """
+        return self.blob_dir / digest[:2] / digest[2:4] / f"{digest}{suffix}"
+    
+    def store_video_blob(self, job_id: str, video_path: str, shortcode: Optional[str] = None) -> bool:
+        """
+        Deduplicate a downloaded video through the blob store.
+        
+        If a blob with the same content exists, the job's copy is replaced
+        by a hard link to it; otherwise the job's file becomes the blob.
+        The video path stays the same either way.
+        
+        Args:
+            job_id: Unique job identifier
+            video_path: Downloaded video inside the job directory
+            shortcode: Instagram shortcode, remembered as a hint for later jobs
+            
+        Returns:
+            True if the video is now shared with the blob store
+        """
+        if not self.dedup_videos:
+            return False
+        
+        video = Path(video_path)
+        try:
+            blob = self.blob_path(sha256_file(video), video.suffix)
+            # Two attempts: the blob may appear or disappear concurrently
+            for _ in range(2):
+                if blob.exists():
+                    if self._link_over(blob, video):
+                        break
+                    continue
+                try:
+                    blob.parent.mkdir(parents=True, exist_ok=True)
+                    os.link(video, blob)
+                    self._adjust_usage("blobs", blob.stat().st_size, 1)
+                    break
+                except FileExistsError:
+                    continue
+            else:
+                return False
+            
+            relative = str(blob.relative_to(self.blob_dir))
+            (video.parent / BLOB_MANIFEST).write_text(relative, encoding="utf-8")
+            if shortcode and _SHORTCODE_PATTERN.fullmatch(shortcode):
+                write_file_atomic(self.blob_dir / BLOB_HINTS_DIR / shortcode, relative.encode("utf-8"))
+            return True
+            
+        except OSError as e:
+            # e.g. the blob store is on another filesystem than the uploads
+            logger.warning(f"Not deduplicating video of job {job_id}: {e}")
+            return False
+    
+    def link_known_video(self, job_id: str, shortcode: Optional[str]) -> Optional[str]:
+        """
+        Link the stored video of a shortcode into a job directory.
+        
+        Lets a job reuse the video an earlier job downloaded for the same
+        post instead of downloading it again.
+        
+        Args:
+            job_id: Unique job identifier
+            shortcode: Instagram shortcode
+            
+        Returns:
+            Path of the linked video, or None if no blob is known for the shortcode
+        """
+        if not self.dedup_videos or not shortcode or not _SHORTCODE_PATTERN.fullmatch(shortcode):
+            return None
+        
+        hint = self.blob_dir / BLOB_HINTS_DIR / shortcode
+        try:
+            relative = hint.read_text(encoding="utf-8").strip()
+        except FileNotFoundError:
+            return None
+        
+        blob = self.blob_dir / relative
+        job_dir = self.get_job_directory(job_id)
+        video = job_dir / f"{shortcode}{blob.suffix}"
+        try:
+            os.link(blob, video)
+        except FileNotFoundError:
+            # Blob released since the hint was written
+            hint.unlink(missing_ok=True)
+            return None
+        except OSError as e:
+            logger.warning(f"Cannot link stored video of {shortcode}: {e}")
+            return None
+        
+        (job_dir / BLOB_MANIFEST).write_text(relative, encoding="utf-8")
+        logger.info(f"Reusing stored video {blob.name} for job {job_id}")
+        return str(video)
+    
+    def _link_over(self, blob: Path, video: Path) -> bool:
+        """Replace a file with a hard link to a blob; False if the blob is gone."""
+        temp_link = video.with_name(f".{video.name}.link")
+        temp_link.unlink(missing_ok=True)
+        try:
+            os.link(blob, temp_link)
+        except FileNotFoundError:
+            return False
+        os.replace(temp_link, video)
+        return True
+    
+    def _linked_blob(self, job_dir: Path) -> Optional[Path]:
+        """Get the blob a job directory's manifest points to."""
+        try:
+            relative = (job_dir / BLOB_MANIFEST).read_text(encoding="utf-8").strip()
+        except FileNotFoundError:
+            return None
+        return self.blob_dir / relative if relative else None
+    
+    def _release_blob(self, blob: Path) -> int:
+        """
+        Delete a blob no job directory links to anymore.
+        
+        Returns:
+            Bytes freed
+        """
+        try:
+            stat = blob.stat()
+            if stat.st_nlink > 1:
+                return 0
+            blob.unlink()
+        except FileNotFoundError:
+            return 0
+        self._adjust_usage("blobs", -stat.st_size, -1)
+        logger.info(f"Released video blob: {blob.name}")
+        return stat.st_size
+    
+    def _collect_blobs(self) -> Tuple[int, int]:
+        """
+        Total the blob store, deleting blobs without any job link.
+        
+        Such orphans are left when a job directory is removed behind the
+        FileManager's back or a process dies between the two deletes.
+        
+        Returns:
+            Tuple of (total bytes, blob count)
+        """
+        total_size = blob_count = 0
+        for first in _subdirectories(self.blob_dir):
+            if not is_shard_name(first.name):
+                continue
+            for second in _subdirectories(first.path):
+                try:
+                    with os.scandir(second.path) as entries:
+                        blobs = [entry for entry in entries if entry.is_file(follow_symlinks=False)]
+                except FileNotFoundError:
+                    continue
+                for entry in blobs:
+                    try:
+                        stat = entry.stat(follow_symlinks=False)
+                        if stat.st_nlink == 1:
+                            os.unlink(entry.path)
+                            logger.info(f"Deleted orphaned video blob: {entry.name}")
+                            continue
+                    except FileNotFoundError:
+                        continue
+                    total_size += stat.st_size
+                    blob_count += 1
+        return total_size, blob_count
+    
+    def compress_analysis_result(self, job_id: str) -> int:
+        """
+        Rewrite a plain JSON result file as compact gzip in place.
+        
+        Converts files written before results were compressed on save. The
+        file keeps its name; readers recognize the gzip header.
+        
+        Args:
+            job_id: Unique job identifier
+            
+        Returns:
+            Bytes saved (0 if the file is missing, already compressed or would not shrink)
+        """
+        result_file = self.get_result_file(job_id)
+        try:
+            with open(result_file, 'rb') as f:
+                if f.read(len(GZIP_MAGIC)) == GZIP_MAGIC:
+                    return 0
+                f.seek(0)
+                data = f.read()
+        except FileNotFoundError:
+            return 0
+        
+        compressed = encode_result_document(loads_json(data), pretty=self.pretty_results)
+        if len(compressed) >= len(data):
+            return 0
+        write_file_atomic(result_file, compressed)
+        self._adjust_usage("results", len(compressed) - len(data))
+        return len(data) - len(compressed)
+    
     def get_disk_usage(self) -> Dict[str, Any]:
         """
         Get disk usage information for managed directories.
         
+        Read from the ledger; only the first call before the initial
+        reconciliation scans the directories.
+        
         Returns:
             Dictionary with disk usage information
         """
         try:
-            usage = {}
-            
-            for name, directory in [
-                ("upload", self.upload_dir),
-                ("results", self.results_dir),
-                ("temp", self.temp_dir)
-            ]:
-                if directory.exists():
-                    total_size = sum(
-                        f.stat().st_size for f in directory.rglob('*') if f.is_file()
-                    )
-                    file_count = sum(1 for f in directory.rglob('*') if f.is_file())
-                    
-                    usage[name] = {
-                        "path": str(directory),
-                        "total_size": total_size,
-                        "total_size_mb": round(total_size / (1024 * 1024), 2),
-                        "file_count": file_count
-                    }
-                else:
-                    usage[name] = {
-                        "path": str(directory),
-                        "total_size": 0,
-                        "total_size_mb": 0,
-                        "file_count": 0
-                    }
-            
-            return usage
+            self.reconcile_disk_usage(force=False)
+            
+            with self._usage_lock:
+                snapshot = {name: tuple(usage) for name, usage in self._usage.items()}
+            
+            return {
+                name: {
+                    "path": str(self.directories[name]),
+                    "total_size": total_size,
+                    "total_size_mb": round(total_size / (1024 * 1024), 2),
+                    "file_count": file_count
+                }
+                for name, (total_size, file_count) in snapshot.items()
+            }
             
         except Exception as e:
             logger.error(f"Error getting disk usage: {e}")
             return {}
+    
+    def _file_size(self, path: Path) -> Optional[int]:
+        """Size of a file, or None if it does not exist."""
+        try:
+            return path.stat().st_size
+        except FileNotFoundError:
+            return None
+    
+    async def _reconciler(self):
+        """Reconcile the ledger now and then every interval, or adopt the leader's totals."""
+        while True:
+            try:
+                if leads(self.leader):
+                    await run_blocking(io_executor, self.reconcile_disk_usage)
+                    if self.leader:
+                        await run_blocking(io_executor, self.save_usage_snapshot)
+                elif not await run_blocking(io_executor, self.load_usage_snapshot):
+                    # No newer snapshot yet; build the ledger here once
+                    await run_blocking(io_executor, self.reconcile_disk_usage, False)
+            except Exception as e:
+                logger.error(f"Error reconciling disk usage: {e}")
+            await asyncio.sleep(self.reconcile_interval)
@@ -3,6 +3,7 @@ Instagram video downloader service using Instaloader.
 """
 import os
 import re
+import copy
 import logging
 from pathlib import Path
 from typing import Optional, Tuple, Callable
@@ -12,10 +13,34 @@ import instaloader
 from instaloader import Post
 
 from ..core.config import settings
+from .cancellation import CancellationToken, JobCancelled
 
 logger = logging.getLogger(__name__)
 
 
+class _CancellableStream:
+    """Response body that stops the transfer reading it once its job is cancelled."""
+    
+    def __init__(self, stream, cancel_token: CancellationToken):
+        """
+        Wrap a response body.
+        
+        Args:
+            stream: File-like raw response body
+            cancel_token: Token checked before every read
+        """
+        self.stream = stream
+        self.cancel_token = cancel_token
+    
+    def read(self, *args, **kwargs):
+        """Read the next chunk, raising JobCancelled if the job was cancelled."""
+        self.cancel_token.raise_if_cancelled()
+        return self.stream.read(*args, **kwargs)
+    
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
 class InstagramDownloader:
     """Instagram video downloader using Instaloader."""
     
@@ -30,6 +55,7 @@ class InstagramDownloader:
             download_comments=False,
             save_metadata=True,
             compress_json=False,
+            request_timeout=settings.instagram_request_timeout,
         )
         
         # Login if credentials are provided and valid
@@ -72,55 +98,115 @@ class InstagramDownloader:
         
         return None
     
-    def download_video(
-        self, 
-        instagram_url: str, 
-        output_dir: str,
-        progress_callback: Optional[Callable[[float], None]] = None
-    ) -> Tuple[bool, Optional[str], Optional[str]]:
+    def fetch_post(self, instagram_url: str) -> Tuple[Optional[Post], Optional[str]]:
         """
-        Download video from Instagram URL.
+        Fetch post metadata from Instagram.
         
         Args:
             instagram_url: Instagram post URL
-            output_dir: Directory to save the video
-            progress_callback: Optional callback for progress updates
             
         Returns:
-            Tuple of (success, video_path, error_message)
+            Tuple of (post, error_message)
         """
         try:
             # Extract shortcode from URL
             shortcode = self.extract_shortcode_from_url(instagram_url)
             if not shortcode:
-                return False, None, "Invalid Instagram URL format"
-            
-            # Create output directory
-            output_path = Path(output_dir)
-            output_path.mkdir(parents=True, exist_ok=True)
-            
-            # Get post
-            if progress_callback:
-                progress_callback(0.1)
+                return None, "Invalid Instagram URL format"
             
             post = Post.from_shortcode(self.loader.context, shortcode)
             
-            if progress_callback:
-                progress_callback(0.3)
-            
             # Check if post has video
             if not post.is_video:
-                return False, None, "Post does not contain a video"
+                return None, "Post does not contain a video"
+            
+            return post, None
+            
+        except Exception as e:
+            error_msg = f"Error downloading video: {str(e)}"
+            logger.error(error_msg)
+            return None, error_msg
+    
+    def _loader_for(
+        self,
+        output_dir: Path,
+        cancel_token: Optional[CancellationToken] = None
+    ) -> instaloader.Instaloader:
+        """
+        Get a view of the shared loader that downloads into ``output_dir``.
+
+        Instaloader sanitizes "{target}" like any other path component and
+        turns its slashes into lookalike characters, so the directory must
+        be the dirname pattern itself. The shallow copy shares the session
+        with ``self.loader``, so concurrent downloads into different
+        directories never touch each other's pattern.
+
+        With a token, the copy also gets its own shallow copy of the
+        context whose responses check the token on every chunk read, so a
+        cancel stops the transfer itself instead of waiting for it to end.
+
+        Args:
+            output_dir: Directory to save the files of the post in
+            cancel_token: Optional token of the job downloading
+
+        Returns:
+            Loader bound to the directory
+        """
+        loader = copy.copy(self.loader)
+        loader.dirname_pattern = str(output_dir).replace("{", "{{").replace("}", "}}")
+        
+        if cancel_token:
+            loader.context = copy.copy(self.loader.context)
+            get_raw = loader.context.get_raw
+            
+            def get_cancellable_raw(url, *args, **kwargs):
+                response = get_raw(url, *args, **kwargs)
+                response.raw = _CancellableStream(response.raw, cancel_token)
+                return response
+            
+            loader.context.get_raw = get_cancellable_raw
+        return loader
+    
+    def download_post(
+        self,
+        post: Post,
+        output_dir: str,
+        progress_callback: Optional[Callable[[float], None]] = None,
+        cancel_token: Optional[CancellationToken] = None
+    ) -> Tuple[bool, Optional[str], Optional[str]]:
+        """
+        Download the video of an already fetched post.
+        
+        Args:
+            post: Instaloader post returned by fetch_post
+            output_dir: Directory to save the video
+            progress_callback: Optional callback for progress updates
+            cancel_token: Optional token checked before, during and after the transfer
+            
+        Returns:
+            Tuple of (success, video_path, error_message)
+            
+        Raises:
+            JobCancelled: If the token was cancelled
+        """
+        try:
+            shortcode = post.shortcode
+            
+            # Create output directory
+            output_path = Path(output_dir)
+            output_path.mkdir(parents=True, exist_ok=True)
             
             # Download the post
             if progress_callback:
                 progress_callback(0.5)
             
-            # Set target directory
-            self.loader.dirname_pattern = str(output_path)
+            if cancel_token:
+                cancel_token.raise_if_cancelled()
+            
+            self._loader_for(output_path, cancel_token).download_post(post, target=post.shortcode)
             
-            # Download
-            self.loader.download_post(post, target=str(output_path))
+            if cancel_token:
+                cancel_token.raise_if_cancelled()
             
             if progress_callback:
                 progress_callback(0.9)
@@ -156,6 +242,9 @@ class InstagramDownloader:
             logger.info(f"Successfully downloaded video: {video_path}")
             return True, video_path, None
             
+        except JobCancelled:
+            logger.info(f"Download of {post.shortcode} cancelled")
+            raise
         except Exception as e:
             error_msg = f"Error downloading video: {str(e)}"
             logger.error(error_msg)
@@ -0,0 +1,108 @@
+"""
+Publish/subscribe bus for live job events.
+"""
+import asyncio
+import logging
+from typing import Optional, Dict, Any, Set
+
+from ..models import JobStatus
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = {JobStatus.COMPLETED.value, JobStatus.FAILED.value, JobStatus.CANCELLED.value}
+
+
+def is_terminal(event: Dict[str, Any]) -> bool:
+    """Check whether an event carries a job's final state."""
+    return event.get("status") in TERMINAL_STATUSES
+
+
+class JobEventBus:
+    """
+    Fan-out of stage, progress and final-state events to subscribers.
+
+    Subscribers are asyncio queues owned by SSE or WebSocket handlers.
+    Events may be published from worker threads; delivery always happens
+    on the event loop, in publish order.
+    """
+
+    def __init__(self, queue_size: int = 100):
+        """
+        Initialize the bus.
+
+        Args:
+            queue_size: Bound of every subscriber queue
+        """
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def start(self):
+        """Bind the bus to the running event loop."""
+        self._loop = asyncio.get_running_loop()
+
+    def new_queue(self) -> asyncio.Queue:
+        """Create a subscriber queue."""
+        return asyncio.Queue(maxsize=self.queue_size)
+
+    def subscribe(self, job_id: str, queue: asyncio.Queue):
+        """
+        Deliver events of a job to a queue.
+
+        Args:
+            job_id: Unique job identifier
+            queue: Subscriber queue from new_queue()
+        """
+        self._subscribers.setdefault(job_id, set()).add(queue)
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue):
+        """
+        Stop delivering events of a job to a queue.
+
+        Args:
+            job_id: Unique job identifier
+            queue: Subscriber queue
+        """
+        queues = self._subscribers.get(job_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[job_id]
+
+    def publish(self, job_id: str, event: Dict[str, Any]):
+        """
+        Publish an event; safe to call from any thread.
+
+        Args:
+            job_id: Unique job identifier
+            event: Event payload
+        """
+        if self._loop is None or job_id not in self._subscribers:
+            return
+        event = {"job_id": job_id, **event}
+        try:
+            self._loop.call_soon_threadsafe(self._dispatch, job_id, event)
+        except RuntimeError:
+            # Loop already closed during shutdown
+            pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get subscription statistics."""
+        return {
+            "watched_jobs": len(self._subscribers),
+            "subscriptions": sum(len(queues) for queues in self._subscribers.values())
+        }
+
+    def _dispatch(self, job_id: str, event: Dict[str, Any]):
+        """Deliver an event to the subscribers of a job (loop thread only)."""
+        for queue in list(self._subscribers.get(job_id, ())):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                if not is_terminal(event):
+                    # Slow consumer: progress updates are safe to drop
+                    continue
+                # Never drop the final state; make room for it
+                queue.get_nowait()
+                queue.put_nowait(event)
@@ -0,0 +1,795 @@
+"""
+Video job processing executed by the job queue workers.
+
+A job runs through explicit stages (fetch metadata -> download -> upload
+to Gemini -> wait until ACTIVE -> generate -> persist), each with its own
+concurrency limit, so downloads of new jobs overlap Gemini work on older
+ones without raising the per-stage rate against either service.
+"""
+import os
+import time
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import or_
+
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models import VideoJob, JobStatus
+from .instagram_downloader import InstagramDownloader
+from .video_analyzer import VideoAnalyzer
+from .file_manager import FileManager
+from .job_queue import JobQueue
+from .pipeline import JobContext, JobPipeline, PipelineStage, DeadlineExceeded
+from .executors import run_blocking, instagram_executor, gemini_executor, io_executor
+from .result_cache import ResultCache
+from .progress import ProgressRegistry
+from .job_events import JobEventBus
+from .cancellation import CancellationToken, JobCancelled
+from .metrics import MetricsRecorder
+from .retention import RetentionManager
+from .disk_quota import DiskQuotaManager
+from .leader import LeaderElection
+
+logger = logging.getLogger(__name__)
+
+# Global service instances shared by the API routes and the workers
+# Picks the one worker process running retention, disk usage rescans,
+# quota checks and metrics pruning
+maintenance_leader = LeaderElection("maintenance")
+instagram_downloader = InstagramDownloader()
+video_analyzer = VideoAnalyzer()
+file_manager = FileManager(maintenance_leader)
+result_cache = ResultCache(video_analyzer, file_manager)
+progress_registry = ProgressRegistry()
+job_events = JobEventBus()
+metrics_recorder = MetricsRecorder(leader=maintenance_leader)
+retention_manager = RetentionManager(file_manager, maintenance_leader)
+disk_quota = DiskQuotaManager(file_manager, maintenance_leader)
+
+# Jobs currently running the pipeline, keyed by (shortcode, analysis_type).
+# The future resolves to the job whose result file holds the leader's
+# result, or None on failure.
+_inflight_leaders: Dict[Tuple[str, str], asyncio.Future] = {}
+
+# Cancel tokens of the jobs claimed by this process
+_cancel_tokens: Dict[str, CancellationToken] = {}
+
+
+def _update_job(job_id: str, **fields) -> bool:
+    """
+    Update columns of a job in a short-lived session.
+
+    Cancelled jobs are never written to, so work that finishes after a
+    cancel cannot overwrite the CANCELLED status.
+
+    Args:
+        job_id: Unique job identifier
+        **fields: Column values to set
+
+    Returns:
+        True if the job was updated, False if it is missing or cancelled
+    """
+    db = SessionLocal()
+    try:
+        job = (
+            db.query(VideoJob)
+            .filter(VideoJob.job_id == job_id, VideoJob.status != JobStatus.CANCELLED)
+            .first()
+        )
+        if not job:
+            logger.warning(f"Job not found or cancelled, skipping update: {job_id}")
+            return False
+        for name, value in fields.items():
+            setattr(job, name, value)
+        db.commit()
+        return True
+    finally:
+        db.close()
+
+
+def _load_context(job_id: str):
+    """
+    Build the pipeline context for a claimed job.
+
+    Args:
+        job_id: Unique job identifier
+
+    Returns:
+        JobContext, or None if the job does not exist or was cancelled
+    """
+    db = SessionLocal()
+    try:
+        job = db.query(VideoJob).filter(VideoJob.job_id == job_id).first()
+        if not job or job.status != JobStatus.PROCESSING:
+            return None
+        progress_registry.start(job.job_id, created_at=job.created_at, started_at=job.started_at)
+
+        # Work left behind by an interrupted run of a recovered job
+        video_path = job.video_path if job.video_path and os.path.exists(job.video_path) else None
+
+        # Jobs submitted without a deadline get the default budget from their
+        # claim, so time spent queued or before a recovery does not count
+        deadline_at = job.deadline_at
+        if deadline_at is None and settings.job_deadline_seconds:
+            deadline_at = datetime.utcnow() + timedelta(seconds=settings.job_deadline_seconds)
+
+        return JobContext(
+            job_id=job.job_id,
+            instagram_url=job.instagram_url,
+            analysis_type=job.analysis_type or "comprehensive",
+            shortcode=job.shortcode or instagram_downloader.extract_shortcode_from_url(job.instagram_url),
+            video_path=video_path,
+            gemini_file_name=job.gemini_file_name if video_path else None,
+            deadline_at=deadline_at.replace(tzinfo=None) if deadline_at else None
+        )
+    finally:
+        db.close()
+
+
+def recover_orphaned_jobs() -> int:
+    """
+    Requeue PROCESSING jobs whose worker process is gone.
+
+    A worker holds a lease on every job it runs and renews it while the
+    job is in flight, so only jobs whose lease lapsed, or that were
+    claimed before leases existed, are requeued. Jobs of other live
+    processes sharing the database are left alone. Requeued jobs keep
+    their downloaded video and recorded Gemini file, so the pipeline
+    resumes them after the last completed stage instead of starting over.
+    A deadline requested at submission is pushed back so the resumed run
+    gets the full budget again; jobs without one get the default budget
+    when they are claimed.
+
+    Returns:
+        Number of recovered jobs
+    """
+    now = datetime.utcnow()
+    lease_lapsed = or_(VideoJob.lease_expires_at.is_(None), VideoJob.lease_expires_at < now)
+
+    db = SessionLocal()
+    try:
+        orphans = (
+            db.query(VideoJob.job_id, VideoJob.created_at, VideoJob.deadline_at)
+            .filter(VideoJob.status == JobStatus.PROCESSING, lease_lapsed)
+            .all()
+        )
+
+        recovered = 0
+        for job_id, created_at, deadline_at in orphans:
+            if deadline_at and created_at:
+                budget = deadline_at.replace(tzinfo=None) - created_at.replace(tzinfo=None)
+                deadline_at = now + max(budget, timedelta(0))
+
+            # Still PROCESSING with a lapsed lease: another process may have
+            # recovered and claimed it since the read
+            recovered += (
+                db.query(VideoJob)
+                .filter(VideoJob.job_id == job_id, VideoJob.status == JobStatus.PROCESSING, lease_lapsed)
+                .update(
+                    {
+                        VideoJob.status: JobStatus.PENDING,
+                        VideoJob.lease_owner: None,
+                        VideoJob.lease_expires_at: None,
+                        VideoJob.deadline_at: deadline_at
+                    },
+                    synchronize_session=False
+                )
+            )
+        db.commit()
+        if recovered:
+            logger.info(f"Recovered {recovered} orphaned jobs")
+        return recovered
+    finally:
+        db.close()
+
+
+def release_inline_results(batch_size: int = 500) -> int:
+    """
+    Drop analysis payloads that older releases stored in video_jobs rows.
+
+    Those releases wrote every payload both to the row and to the result
+    file. Rows whose result file exists lose the duplicate; rows without
+    one keep it, as it is the only copy left.
+
+    Args:
+        batch_size: Rows examined per transaction
+
+    Returns:
+        Number of rows cleared
+    """
+    released = 0
+    last_id = 0
+    while True:
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(VideoJob.id, VideoJob.job_id)
+                .filter(VideoJob.analysis_result.isnot(None), VideoJob.id > last_id)
+                .order_by(VideoJob.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            ids = [row.id for row in rows if file_manager.has_analysis_result(row.job_id)]
+            if ids:
+                db.query(VideoJob).filter(VideoJob.id.in_(ids)).update(
+                    {VideoJob.analysis_result: None}, synchronize_session=False
+                )
+                db.commit()
+                released += len(ids)
+        finally:
+            db.close()
+
+    if released:
+        logger.info(f"Released {released} inline analysis payloads")
+    return released
+
+
+def _complete_job(job_id: str, analysis_result: Dict[str, Any], cancel_token: Optional[CancellationToken] = None):
+    """
+    Store a finished analysis result and mark the job completed.
+
+    Args:
+        job_id: Unique job identifier
+        analysis_result: Analysis result dictionary
+        cancel_token: Optional token of the job; nothing is stored once cancelled
+
+    Raises:
+        JobCancelled: If the job was cancelled before it could be completed
+    """
+    if cancel_token:
+        cancel_token.raise_if_cancelled()
+
+    result_path = file_manager.save_analysis_result(job_id, analysis_result)
+    document = file_manager.build_result_document(job_id, analysis_result)
+    if not _mark_completed(job_id, result_path, document):
+        # Cancelled while the result was being stored
+        file_manager.cleanup_job_files(job_id, keep_results=False)
+        raise JobCancelled("Job cancelled")
+
+
+def _complete_from_source(job_id: str, source_job_id: str, cancel_token: Optional[CancellationToken] = None) -> bool:
+    """
+    Mark a job completed with the result another job already stored.
+
+    The job points at the source job's result file instead of writing a
+    copy of the payload.
+
+    Args:
+        job_id: Unique job identifier
+        source_job_id: Job whose result file holds the result
+        cancel_token: Optional token of the job
+
+    Returns:
+        True if the job was completed, False if the source result is gone
+
+    Raises:
+        JobCancelled: If the job was cancelled before it could be completed
+    """
+    if cancel_token:
+        cancel_token.raise_if_cancelled()
+
+    document = file_manager.load_analysis_result(source_job_id)
+    if document is None:
+        return False
+    result_path = str(file_manager.get_result_file(source_job_id))
+    if not _mark_completed(job_id, result_path, document, source_job_id=source_job_id):
+        raise JobCancelled("Job cancelled")
+    return True
+
+
+def _mark_completed(job_id: str, result_path: str, document: Dict[str, Any], **fields) -> bool:
+    """
+    Mark a job completed and publish its final event.
+
+    Args:
+        job_id: Unique job identifier
+        result_path: Result file holding the job's analysis
+        document: Result document, as stored in the file
+        **fields: Further column values to set
+
+    Returns:
+        True if the job was updated, False if it was cancelled meanwhile
+    """
+    completed_at = datetime.utcnow()
+    completed = _update_job(
+        job_id,
+        status=JobStatus.COMPLETED,
+        download_progress=1.0,
+        analysis_progress=1.0,
+        result_path=result_path,
+        completed_at=completed_at,
+        **fields
+    )
+    progress_registry.discard(job_id)
+    if completed:
+        job_events.publish(job_id, {
+            "event": "completed",
+            "status": JobStatus.COMPLETED.value,
+            "progress": 1.0,
+            "completed_at": completed_at.isoformat(),
+            "analysis_result": document
+        })
+    return completed
+
+
+def _publish_progress(job_id: str, event: str = "progress"):
+    """
+    Publish the current progress record of a running job.
+
+    Args:
+        job_id: Unique job identifier
+        event: Event name
+    """
+    record = progress_registry.get(job_id)
+    if record:
+        job_events.publish(job_id, {
+            "event": event,
+            "status": JobStatus.PROCESSING.value,
+            "stage": record.stage,
+            "progress": record.progress
+        })
+
+
+async def _report_progress(job_id: str, **progress):
+    """
+    Record progress in memory, persisting it only when a flush is due.
+
+    Args:
+        job_id: Unique job identifier
+        **progress: download_progress and/or analysis_progress
+    """
+    flush_due = progress_registry.update(job_id, **progress)
+    _publish_progress(job_id)
+    if flush_due:
+        await run_blocking(io_executor, progress_registry.flush, job_id)
+
+
+async def enter_stage(ctx: JobContext, stage: str):
+    """
+    Record a stage transition; transitions are always persisted.
+
+    Args:
+        ctx: Job context
+        stage: Name of the stage the job entered
+    """
+    if progress_registry.set_stage(ctx.job_id, stage):
+        _publish_progress(ctx.job_id, event="stage")
+        await run_blocking(io_executor, progress_registry.flush, ctx.job_id)
+
+
+def _timed(ctx: JobContext, metric_name: str):
+    """
+    Time a block of a job's work into the stage metrics.
+
+    Args:
+        ctx: Job context
+        metric_name: Metric name, e.g. ``download_seconds``
+
+    Returns:
+        Context manager recording the block's duration on success
+    """
+    return metrics_recorder.timer(metric_name, job_id=ctx.job_id, analysis_type=ctx.analysis_type)
+
+
+async def fetch_metadata_stage(ctx: JobContext):
+    """Fetch the Instagram post and check it contains a video."""
+    logger.info(f"Starting video processing for job: {ctx.job_id}")
+
+    # Serve repeated submissions without touching Instagram or Gemini
+    source_job_id = await run_blocking(io_executor, result_cache.lookup, ctx.shortcode, ctx.analysis_type)
+    if source_job_id and await run_blocking(
+        io_executor, _complete_from_source, ctx.job_id, source_job_id, ctx.cancel_token
+    ):
+        ctx.result_job_id = source_job_id
+        ctx.finished = True
+        logger.info(f"Video processing completed from cache for job: {ctx.job_id}")
+        return
+
+    # A recovered job that already downloaded its video skips Instagram
+    if ctx.video_path:
+        logger.info(f"Resuming job {ctx.job_id} with downloaded video: {ctx.video_path}")
+        return
+
+    await _report_progress(ctx.job_id, download_progress=0.1)
+
+    with _timed(ctx, "fetch_metadata_seconds"):
+        post, error_msg = await run_blocking(instagram_executor, instagram_downloader.fetch_post, ctx.instagram_url)
+    if not post:
+        raise RuntimeError(error_msg)
+
+    ctx.post = post
+    await _report_progress(ctx.job_id, download_progress=0.3)
+
+
+async def download_stage(ctx: JobContext):
+    """Download the video into the job directory."""
+    if ctx.video_path:
+        await _report_progress(ctx.job_id, download_progress=1.0)
+        return
+
+    job_dir = await run_blocking(io_executor, file_manager.get_job_directory, ctx.job_id)
+
+    def download_progress(progress: float):
+        # Called on the instagram pool, so flushing inline is fine
+        flush_due = progress_registry.update(ctx.job_id, download_progress=progress)
+        _publish_progress(ctx.job_id)
+        if flush_due:
+            progress_registry.flush(ctx.job_id)
+
+    def download():
+        # Runs to the end on the instagram pool even if the stage is
+        # abandoned, so a cancelled download cleans up after itself
+        try:
+            # A video stored by an earlier job for the same post is linked, not downloaded
+            video_path = file_manager.link_known_video(ctx.job_id, ctx.post.shortcode)
+            if video_path:
+                download_progress(1.0)
+                result = True, video_path, None, False
+            else:
+                # Evict older videos first if the new one could exceed the quota
+                disk_quota.reserve(ctx.job_id)
+                success, video_path, error_msg = instagram_downloader.download_post(
+                    ctx.post,
+                    str(job_dir),
+                    progress_callback=download_progress,
+                    cancel_token=ctx.cancel_token
+                )
+                if success:
+                    file_manager.store_video_blob(ctx.job_id, video_path, ctx.post.shortcode)
+                result = success, video_path, error_msg, True
+            file_manager.record_job_directory(ctx.job_id)
+            disk_quota.release(ctx.job_id)
+            return result
+        except JobCancelled:
+            file_manager.cleanup_job_files(ctx.job_id)
+            raise
+
+    with _timed(ctx, "download_seconds"):
+        success, video_path, error_msg, downloaded = await run_blocking(instagram_executor, download)
+    if not success:
+        raise RuntimeError(error_msg)
+
+    # Update job with video info
+    video_info = await run_blocking(io_executor, file_manager.get_video_info, video_path)
+    ctx.video_path = video_path
+    if downloaded:
+        metrics_recorder.record("download_bytes", video_info.get("size", 0), "bytes", ctx.job_id, ctx.analysis_type)
+    await run_blocking(
+        io_executor,
+        _update_job,
+        ctx.job_id,
+        video_path=video_path,
+        download_progress=1.0,
+        video_size=video_info.get("size", 0),
+        video_filename=video_info.get("filename", "")
+    )
+
+
+async def upload_stage(ctx: JobContext):
+    """Upload the video to Gemini."""
+    ctx.file_size = await run_blocking(io_executor, video_analyzer.validate_video, ctx.video_path)
+    await _report_progress(ctx.job_id, analysis_progress=0.1)
+
+    if ctx.gemini_file_name:
+        ctx.uploaded_file = await run_blocking(gemini_executor, _get_reusable_file, ctx.gemini_file_name)
+        if ctx.uploaded_file:
+            logger.info(f"Resuming job {ctx.job_id} with Gemini file: {ctx.gemini_file_name}")
+
+    if not ctx.uploaded_file:
+        with _timed(ctx, "upload_seconds"):
+            ctx.uploaded_file = await run_blocking(gemini_executor, _upload_video, ctx)
+        metrics_recorder.record("upload_bytes", ctx.file_size, "bytes", ctx.job_id, ctx.analysis_type)
+        await run_blocking(io_executor, _update_job, ctx.job_id, gemini_file_name=ctx.gemini_file_name)
+
+    await _report_progress(ctx.job_id, analysis_progress=0.2)
+
+
+def _upload_video(ctx: JobContext):
+    """
+    Upload a job's video to Gemini.
+
+    Runs to the end on the gemini pool even if the stage is abandoned, so
+    a file whose upload finishes after a cancel is deleted again.
+
+    Args:
+        ctx: Job context
+
+    Returns:
+        Uploaded Gemini file
+    """
+    ctx.cancel_token.raise_if_cancelled()
+    uploaded_file = video_analyzer.upload_video(ctx.video_path)
+    ctx.gemini_file_name = uploaded_file.name
+    if ctx.cancel_token.cancelled:
+        video_analyzer.delete_file(uploaded_file.name)
+        raise JobCancelled("Job cancelled")
+    return uploaded_file
+
+
+def _get_reusable_file(file_name: str):
+    """
+    Fetch a previously uploaded Gemini file if it can still be used.
+
+    Args:
+        file_name: Gemini file name recorded on the job
+
+    Returns:
+        Gemini file information, or None if it expired or failed
+    """
+    try:
+        file_info = video_analyzer.get_file(file_name)
+    except Exception as e:
+        logger.warning(f"Recorded Gemini file {file_name} is unavailable: {e}")
+        return None
+
+    if file_info.state in ("ACTIVE", "PROCESSING"):
+        return file_info
+    return None
+
+
+async def wait_active_stage(ctx: JobContext):
+    """Wait until Gemini has finished processing the uploaded file."""
+    max_wait = settings.gemini_file_max_wait
+    poll_interval = settings.gemini_file_poll_interval
+    waited = 0.0
+    started = time.perf_counter()
+
+    while waited < max_wait:
+        try:
+            file_info = await run_blocking(gemini_executor, video_analyzer.get_file, ctx.uploaded_file.name)
+        except Exception as e:
+            logger.error(f"Error checking file status: {e}")
+            break
+
+        if file_info.state == "ACTIVE":
+            break
+        if file_info.state == "FAILED":
+            raise RuntimeError("File processing failed!")
+
+        await asyncio.sleep(poll_interval)
+        waited += poll_interval
+    else:
+        logger.warning(f"Timeout waiting for Gemini file of job {ctx.job_id}, proceeding anyway...")
+
+    metrics_recorder.record(
+        "wait_active_seconds", time.perf_counter() - started, "seconds", ctx.job_id, ctx.analysis_type
+    )
+    await _report_progress(ctx.job_id, analysis_progress=0.5)
+
+
+async def generate_stage(ctx: JobContext):
+    """Run the analysis prompt against the uploaded file."""
+    with _timed(ctx, "generate_seconds"):
+        # Awaited on the async client: an abandoned stage aborts the request
+        # instead of holding a gemini thread until Gemini answers
+        ctx.response_text = await video_analyzer.generate_analysis(ctx.uploaded_file, ctx.analysis_type)
+    await _report_progress(ctx.job_id, analysis_progress=0.9)
+
+
+async def persist_stage(ctx: JobContext):
+    """Parse the response and store the result."""
+    with _timed(ctx, "parse_seconds"):
+        ctx.analysis_result = await run_blocking(
+            io_executor,
+            video_analyzer.build_result,
+            ctx.response_text,
+            ctx.analysis_type,
+            ctx.file_size
+        )
+    with _timed(ctx, "persist_seconds"):
+        await run_blocking(io_executor, _complete_job, ctx.job_id, ctx.analysis_result, ctx.cancel_token)
+        ctx.result_job_id = ctx.job_id
+        await run_blocking(io_executor, result_cache.store, ctx.shortcode, ctx.analysis_type, ctx.job_id)
+    logger.info(f"Video processing completed for job: {ctx.job_id}")
+
+
+async def mark_job_failed(ctx: JobContext, stage: str, error: Exception):
+    """
+    Record a stage failure on the job.
+
+    Args:
+        ctx: Job context
+        stage: Name of the failing stage
+        error: Raised exception
+    """
+    logger.error(f"Error processing video job {ctx.job_id} in stage {stage}: {error}")
+    ctx.error = str(error)
+
+    if isinstance(error, DeadlineExceeded):
+        # Stop abandoned executor work and release the Gemini file
+        ctx.cancel_token.cancel()
+        if ctx.gemini_file_name:
+            await run_blocking(gemini_executor, video_analyzer.delete_file, ctx.gemini_file_name)
+
+    completed_at = datetime.utcnow()
+    failed = await run_blocking(
+        io_executor,
+        _update_job,
+        ctx.job_id,
+        status=JobStatus.FAILED,
+        error_message=str(error),
+        completed_at=completed_at
+    )
+    progress_registry.discard(ctx.job_id)
+    if not failed:
+        return
+    job_events.publish(ctx.job_id, {
+        "event": "failed",
+        "status": JobStatus.FAILED.value,
+        "progress": 1.0,
+        "stage": stage,
+        "completed_at": completed_at.isoformat(),
+        "error_message": str(error)
+    })
+
+
+def _publish_cancelled(job_id: str):
+    """
+    Publish the final event of a cancelled job.
+
+    Args:
+        job_id: Unique job identifier
+    """
+    job_events.publish(job_id, {
+        "event": "cancelled",
+        "status": JobStatus.CANCELLED.value,
+        "completed_at": datetime.utcnow().isoformat()
+    })
+
+
+async def handle_job_cancelled(ctx: JobContext, stage: str):
+    """
+    Release what a cancelled job holds: its Gemini file and local files.
+
+    Args:
+        ctx: Job context
+        stage: Name of the stage the job was in
+    """
+    ctx.error = "Job cancelled"
+    progress_registry.discard(ctx.job_id)
+
+    if ctx.gemini_file_name:
+        await run_blocking(gemini_executor, video_analyzer.delete_file, ctx.gemini_file_name)
+    await run_blocking(io_executor, file_manager.cleanup_job_files, ctx.job_id)
+
+    _publish_cancelled(ctx.job_id)
+    logger.info(f"Cancelled job {ctx.job_id} in stage {stage}")
+
+
+def notify_job_cancelled(job_id: str) -> bool:
+    """
+    Stop a job that was just marked CANCELLED.
+
+    A job running in this process is signalled through its token; the
+    pipeline then abandons its current stage and cleans up. Queued jobs
+    are never claimed, so only their final event is published.
+
+    Args:
+        job_id: Unique job identifier
+
+    Returns:
+        True if the job was running here, False otherwise
+    """
+    progress_registry.discard(job_id)
+    token = _cancel_tokens.get(job_id)
+    if not token:
+        _publish_cancelled(job_id)
+        return False
+    token.cancel()
+    return True
+
+
+video_pipeline = JobPipeline(
+    [
+        PipelineStage("fetch_metadata", fetch_metadata_stage, settings.stage_fetch_concurrency, settings.stage_queue_size),
+        PipelineStage("download", download_stage, settings.stage_download_concurrency, settings.stage_queue_size),
+        PipelineStage("upload", upload_stage, settings.stage_upload_concurrency, settings.stage_queue_size),
+        PipelineStage("wait_active", wait_active_stage, settings.stage_wait_concurrency, settings.stage_queue_size),
+        PipelineStage("generate", generate_stage, settings.stage_generate_concurrency, settings.stage_queue_size),
+        PipelineStage("persist", persist_stage, settings.stage_persist_concurrency, settings.stage_queue_size),
+    ],
+    on_failure=mark_job_failed,
+    on_stage_start=enter_stage,
+    on_cancel=handle_job_cancelled
+)
+
+
+async def process_video_job(job_id: str):
+    """
+    Process a claimed video analysis job through the pipeline.
+
+    Args:
+        job_id: Unique job identifier
+    """
+    # Registered before the job is loaded, so a cancel that lands after
+    # the load is always seen by the token
+    token = CancellationToken()
+    _cancel_tokens[job_id] = token
+    # The job's video must not be evicted while it is being processed
+    disk_quota.pin(job_id)
+    try:
+        ctx = await run_blocking(io_executor, _load_context, job_id)
+        if not ctx:
+            logger.warning(f"Job not found or cancelled: {job_id}")
+            return
+
+        ctx.cancel_token = token
+        await _run_single_flight(ctx)
+    finally:
+        del _cancel_tokens[job_id]
+        progress_registry.discard(job_id)
+        disk_quota.unpin(job_id)
+
+
+async def _run_single_flight(ctx: JobContext):
+    """
+    Run a job through the pipeline, coalescing it with identical jobs.
+
+    Args:
+        ctx: Job context
+    """
+    job_id = ctx.job_id
+    if not ctx.shortcode:
+        await video_pipeline.run(ctx)
+        return
+
+    # Single flight: duplicates that slipped past submission-time coalescing
+    # wait for the leader and reuse its result instead of redoing the work
+    key = (ctx.shortcode, ctx.analysis_type)
+    while key in _inflight_leaders:
+        logger.info(f"Job {job_id} waiting on in-flight job for {ctx.shortcode} ({ctx.analysis_type})")
+        leader_wait = asyncio.ensure_future(asyncio.shield(_inflight_leaders[key]))
+        cancel_wait = asyncio.create_task(ctx.cancel_token.wait())
+        timeout = ctx.remaining_seconds()
+        await asyncio.wait(
+            {leader_wait, cancel_wait},
+            timeout=max(timeout, 0) if timeout is not None else None,
+            return_when=asyncio.FIRST_COMPLETED
+        )
+        cancel_wait.cancel()
+
+        if ctx.cancel_token.cancelled:
+            leader_wait.cancel()
+            _publish_cancelled(job_id)
+            logger.info(f"Cancelled job {job_id} while waiting on in-flight job")
+            return
+
+        if not leader_wait.done():
+            leader_wait.cancel()
+            await mark_job_failed(ctx, "wait_inflight", DeadlineExceeded("wait_inflight"))
+            return
+
+        # Share the leader's result file; if it is already gone, run again
+        source_job_id = leader_wait.result()
+        if source_job_id is not None:
+            try:
+                completed = await run_blocking(
+                    io_executor, _complete_from_source, job_id, source_job_id, ctx.cancel_token
+                )
+            except JobCancelled:
+                _publish_cancelled(job_id)
+                return
+            if completed:
+                logger.info(f"Video processing completed from in-flight job for job: {job_id}")
+                return
+
+    leader = asyncio.get_running_loop().create_future()
+    _inflight_leaders[key] = leader
+    try:
+        await video_pipeline.run(ctx)
+    finally:
+        del _inflight_leaders[key]
+        leader.set_result(None if ctx.error else ctx.result_job_id)
+
+
+# Global job queue feeding process_video_job; it also requeues the jobs of
+# worker processes that died while others keep running, and stops jobs
+# cancelled through another process
+job_queue = JobQueue(process_video_job, recover=recover_orphaned_jobs, on_cancelled=notify_job_cancelled)
@@ -0,0 +1,264 @@
+"""
+Bounded in-process worker pool fed from the video_jobs table.
+"""
+import os
+import uuid
+import socket
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Any, List, Optional, Set
+
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models import VideoJob, JobStatus
+from .executors import run_blocking, io_executor
+from .prometheus import ACTIVE_WORKERS
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueue:
+    """
+    Persistent job queue backed by PENDING rows in ``video_jobs``.
+
+    Jobs are claimed oldest-first with a conditional PENDING -> PROCESSING
+    update, so a job is only ever handed to one worker and nothing is lost
+    when the process restarts: unclaimed rows simply stay PENDING.
+    The pool size bounds how many claimed jobs are in flight at once.
+
+    A claim is a lease held by this process and renewed while the job
+    runs. Several processes can share the table; when one dies, its
+    leases lapse and ``recover`` hands its jobs back to the queue, while
+    jobs of live processes are left alone. Renewal also notices claimed
+    jobs that were cancelled or deleted through another process and hands
+    them to ``on_cancelled``.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[str], Awaitable[None]],
+        pool_size: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        recover: Optional[Callable[[], int]] = None,
+        on_cancelled: Optional[Callable[[str], Any]] = None
+    ):
+        """
+        Initialize the job queue.
+
+        Args:
+            handler: Coroutine function that processes a claimed job_id
+            pool_size: Maximum number of jobs in flight
+            poll_interval: Seconds idle workers wait before rescanning
+            recover: Function requeuing jobs whose lease lapsed, run with every renewal
+            on_cancelled: Function stopping a claimed job whose row was cancelled or
+                deleted; called from an executor thread
+        """
+        self.handler = handler
+        self.pool_size = pool_size or settings.worker_pool_size
+        self.poll_interval = poll_interval or settings.queue_poll_interval
+        self.recover = recover
+        self.on_cancelled = on_cancelled
+        self.lease_seconds = settings.job_lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+        self._workers: List[asyncio.Task] = []
+        self._lease_task: Optional[asyncio.Task] = None
+        self._claimed: Set[str] = set()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._running = False
+        self._active_workers = 0
+        self._processed_jobs = 0
+
+    async def start(self):
+        """Start the worker pool."""
+        if self._running:
+            return
+
+        self._running = True
+        self._wakeup = asyncio.Event()
+        self._workers = [
+            asyncio.create_task(self._worker(index))
+            for index in range(self.pool_size)
+        ]
+        self._lease_task = asyncio.create_task(self._lease_keeper())
+        logger.info(f"Job queue {self.owner} started with {self.pool_size} workers")
+
+    async def stop(self):
+        """Stop the worker pool, leaving unclaimed jobs PENDING."""
+        if not self._running:
+            return
+
+        self._running = False
+        for task in [*self._workers, self._lease_task]:
+            task.cancel()
+        await asyncio.gather(*self._workers, self._lease_task, return_exceptions=True)
+        self._workers = []
+        self._lease_task = None
+
+        logger.info("Job queue stopped")
+
+    def notify(self):
+        """Wake idle workers after new jobs were committed."""
+        if self._wakeup:
+            self._wakeup.set()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get worker utilisation and leases held by this process.
+
+        Returns:
+            Dictionary with queue statistics
+        """
+        return {
+            "pool_size": self.pool_size,
+            "active_workers": self._active_workers,
+            "idle_workers": self.pool_size - self._active_workers,
+            "utilisation": round(self._active_workers / self.pool_size, 2) if self.pool_size else 0.0,
+            "processed_jobs": self._processed_jobs,
+            "leased_jobs": len(self._claimed),
+            "owner": self.owner,
+            "running": self._running
+        }
+
+    def renew_leases(self) -> int:
+        """
+        Extend the leases of the jobs this process is running.
+
+        Claimed jobs that are no longer PROCESSING under this lease and
+        were cancelled or deleted meanwhile are passed to ``on_cancelled``.
+
+        Returns:
+            Number of leases renewed
+        """
+        claimed = list(self._claimed)
+        if not claimed:
+            return 0
+
+        db = SessionLocal()
+        try:
+            renewed = (
+                db.query(VideoJob)
+                .filter(
+                    VideoJob.job_id.in_(claimed),
+                    VideoJob.lease_owner == self.owner,
+                    VideoJob.status == JobStatus.PROCESSING
+                )
+                .update(
+                    {VideoJob.lease_expires_at: datetime.utcnow() + timedelta(seconds=self.lease_seconds)},
+                    synchronize_session=False
+                )
+            )
+            db.commit()
+
+            if renewed < len(claimed) and self.on_cancelled:
+                # Jobs finishing here are missing from the renewal too; only
+                # rows gone or CANCELLED mean the job must be stopped
+                live = {
+                    job_id for job_id, in db.query(VideoJob.job_id).filter(
+                        VideoJob.job_id.in_(claimed),
+                        VideoJob.status != JobStatus.CANCELLED
+                    )
+                }
+                for job_id in claimed:
+                    if job_id not in live and job_id in self._claimed:
+                        logger.info(f"Claimed job {job_id} was cancelled elsewhere, stopping it")
+                        self.on_cancelled(job_id)
+            return renewed
+        finally:
+            db.close()
+
+    async def _worker(self, index: int):
+        """
+        Worker loop: claim a job, run it to completion, repeat.
+
+        Args:
+            index: Worker number, used for logging
+        """
+        while self._running:
+            try:
+                job_id = await run_blocking(io_executor, self._claim_next_job)
+            except Exception as e:
+                logger.error(f"Worker {index} failed to claim a job: {e}")
+                job_id = None
+
+            if job_id is None:
+                await self._wait_for_work()
+                continue
+
+            self._active_workers += 1
+            ACTIVE_WORKERS.inc()
+            try:
+                logger.info(f"Worker {index} processing job: {job_id}")
+                await self.handler(job_id)
+            except Exception as e:
+                logger.error(f"Worker {index} crashed on job {job_id}: {e}")
+            finally:
+                self._claimed.discard(job_id)
+                self._active_workers -= 1
+                ACTIVE_WORKERS.dec()
+                self._processed_jobs += 1
+
+    async def _lease_keeper(self):
+        """Renew this process's leases and requeue lapsed ones, a few times per lease."""
+        interval = max(self.lease_seconds / 3, 1.0)
+        while True:
+            try:
+                await run_blocking(io_executor, self.renew_leases)
+                if self.recover and await run_blocking(io_executor, self.recover):
+                    self.notify()
+            except Exception as e:
+                logger.error(f"Error renewing job leases: {e}")
+            await asyncio.sleep(interval)
+
+    async def _wait_for_work(self):
+        """Sleep until notified or until the poll interval elapses."""
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    def _claim_next_job(self) -> Optional[str]:
+        """
+        Atomically claim the oldest PENDING job under a lease held by this process.
+
+        Returns:
+            Claimed job_id, or None if the queue is empty
+        """
+        db = SessionLocal()
+        try:
+            while True:
+                candidate = (
+                    db.query(VideoJob.job_id)
+                    .filter(VideoJob.status == JobStatus.PENDING)
+                    .order_by(VideoJob.created_at, VideoJob.id)
+                    .first()
+                )
+                if not candidate:
+                    return None
+
+                claimed = (
+                    db.query(VideoJob)
+                    .filter(
+                        VideoJob.job_id == candidate.job_id,
+                        VideoJob.status == JobStatus.PENDING
+                    )
+                    .update(
+                        {
+                            VideoJob.status: JobStatus.PROCESSING,
+                            VideoJob.started_at: datetime.utcnow(),
+                            VideoJob.lease_owner: self.owner,
+                            VideoJob.lease_expires_at: datetime.utcnow() + timedelta(seconds=self.lease_seconds)
+                        },
+                        synchronize_session=False
+                    )
+                )
+                db.commit()
+
+                # Another worker won the race; try the next candidate
+                if claimed:
+                    self._claimed.add(candidate.job_id)
+                    return candidate.job_id
+        finally:
+            db.close()
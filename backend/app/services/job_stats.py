@@ -0,0 +1,133 @@
+"""
+Job statistics read from the incrementally maintained counters.
+"""
+import math
+from typing import Dict, Any, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.database import engine
+from ..models import VideoJob, JobStatus, JobStatusCount, JobDurationBucket
+from .metrics import PERCENTILES
+
+# Counters are maintained by SQLite triggers (see app.database)
+COUNTERS_ENABLED = engine.dialect.name == "sqlite"
+
+
+def _counts_statement():
+    """Select (status, count) pairs from the counters, or aggregate the jobs."""
+    if COUNTERS_ENABLED:
+        return select(JobStatusCount.status, JobStatusCount.job_count)
+    return select(VideoJob.status, func.count(VideoJob.id)).group_by(VideoJob.status)
+
+
+def histogram_percentile(buckets: List[Tuple[float, int]], pct: float) -> float:
+    """
+    Estimate a percentile from histogram buckets.
+
+    Interpolates linearly inside the bucket holding the rank; ranks in the
+    unbounded last bucket return its lower bound.
+
+    Args:
+        buckets: (upper bound, count) pairs in ascending order, total count > 0
+        pct: Percentile between 0 and 100
+
+    Returns:
+        Estimated percentile value
+    """
+    rank = sum(count for _, count in buckets) * pct / 100
+    cumulative = 0
+    lower = 0.0
+    for upper, count in buckets:
+        if count and cumulative + count >= rank:
+            if math.isinf(upper):
+                return lower
+            return lower + (upper - lower) * (rank - cumulative) / count
+        cumulative += count
+        lower = upper
+    return lower
+
+
+def summarize_durations(rows: List[Tuple[float, int, float]]) -> Optional[Dict[str, Any]]:
+    """
+    Summarize the processing time histogram.
+
+    Args:
+        rows: (upper bound, count, total seconds) per bucket
+
+    Returns:
+        Dictionary with count, mean and percentiles, or None without samples
+    """
+    buckets = sorted((upper, count) for upper, count, _ in rows)
+    total = sum(count for _, count in buckets)
+    if not total:
+        return None
+
+    summary = {"count": total, "mean": sum(seconds for _, _, seconds in rows) / total}
+    for pct in PERCENTILES:
+        summary[f"p{pct}"] = histogram_percentile(buckets, pct)
+    return summary
+
+
+def get_job_counts(db: Session) -> Dict[JobStatus, int]:
+    """
+    Get the number of jobs per status.
+
+    Args:
+        db: Database session
+
+    Returns:
+        Job count for every status
+    """
+    counts = dict(db.execute(_counts_statement()).all())
+    return {status: counts.get(status, 0) for status in JobStatus}
+
+
+async def count_jobs(db: AsyncSession, status: Optional[JobStatus] = None) -> int:
+    """
+    Count jobs, optionally in one status, from the counters when available.
+
+    Args:
+        db: Async database session
+        status: Optional status filter
+
+    Returns:
+        Number of jobs
+    """
+    if not COUNTERS_ENABLED:
+        query = select(func.count(VideoJob.id))
+        if status:
+            query = query.where(VideoJob.status == status)
+        return await db.scalar(query)
+
+    query = select(func.coalesce(func.sum(JobStatusCount.job_count), 0))
+    if status:
+        query = query.where(JobStatusCount.status == status)
+    return await db.scalar(query)
+
+
+async def get_job_stats(db: AsyncSession) -> Dict[str, Any]:
+    """
+    Get job counts and processing time statistics.
+
+    Reads a handful of counter rows, independent of the number of jobs.
+
+    Args:
+        db: Async database session
+
+    Returns:
+        Dictionary with per-status counts and the processing time summary
+    """
+    counts = dict((await db.execute(_counts_statement())).all())
+    counts = {status: counts.get(status, 0) for status in JobStatus}
+
+    processing_time = None
+    if COUNTERS_ENABLED:
+        rows = await db.execute(
+            select(JobDurationBucket.upper_bound, JobDurationBucket.job_count, JobDurationBucket.total_seconds)
+        )
+        processing_time = summarize_durations(rows.all())
+
+    return {"counts": counts, "processing_time": processing_time}
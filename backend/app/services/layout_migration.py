@@ -0,0 +1,208 @@
+"""
+One-shot migration of result files and job directories to the sharded layout.
+
+Moves every ``<job_id>_analysis.json`` at the top of the results directory
+and every job directory at the top of the upload directory into its
+``ab/cd`` shard, updating ``result_path`` (also of the jobs sharing a
+result file) and ``video_path`` in batches.
+Each move is a rename within the same filesystem, so it is atomic and
+the FileManager resolver finds the file before and after it: the
+migration can run while the API serves requests. Directories of pending
+or processing jobs are left for a later run, since a worker may be
+writing to them; running the migration again picks them up.
+
+Usage (from the backend directory):
+    python -m app.services.layout_migration [--dry-run]
+"""
+import os
+import sys
+import logging
+import argparse
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from sqlalchemy import func, or_, select, update
+
+from ..core.database import SessionLocal
+from ..models import VideoJob, JobStatus, ArchivedJob
+from .file_manager import FileManager, RESULT_SUFFIX, is_shard_name
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = (JobStatus.PENDING, JobStatus.PROCESSING)
+
+
+def _legacy_result_files(file_manager: FileManager) -> List[str]:
+    """List the job_ids of result files in the flat layout."""
+    with os.scandir(file_manager.results_dir) as entries:
+        return [
+            entry.name[:-len(RESULT_SUFFIX)] for entry in entries
+            if entry.name.endswith(RESULT_SUFFIX) and entry.is_file(follow_symlinks=False)
+        ]
+
+
+def _legacy_job_directories(file_manager: FileManager) -> List[str]:
+    """List the job_ids of job directories in the flat layout."""
+    with os.scandir(file_manager.upload_dir) as entries:
+        return [
+            entry.name for entry in entries
+            if entry.is_dir(follow_symlinks=False) and not is_shard_name(entry.name)
+        ]
+
+
+def _move(source: Path, target: Path) -> bool:
+    """
+    Rename a file or directory into its shard.
+
+    Returns:
+        False if the target already exists
+    """
+    if target.exists():
+        return False
+    target.parent.mkdir(parents=True, exist_ok=True)
+    os.rename(source, target)
+    return True
+
+
+def migrate_results(file_manager: FileManager, batch_size: int, dry_run: bool) -> Dict[str, int]:
+    """
+    Move flat result files into their shards.
+
+    A legacy file whose sharded copy already exists was superseded by a
+    later save and is deleted.
+
+    Args:
+        file_manager: File manager owning the results directory
+        batch_size: Files moved per database transaction
+        dry_run: Only count what would be moved
+
+    Returns:
+        Counts of moved and superseded files
+    """
+    stats = {"moved": 0, "superseded": 0}
+    job_ids = _legacy_result_files(file_manager)
+    if dry_run:
+        stats["moved"] = len(job_ids)
+        return stats
+
+    for start in range(0, len(job_ids), batch_size):
+        moved: List[Tuple[str, str]] = []
+        for job_id in job_ids[start:start + batch_size]:
+            sharded, legacy = file_manager.result_file_paths(job_id)
+            try:
+                if _move(legacy, sharded):
+                    moved.append((job_id, str(sharded)))
+                else:
+                    legacy.unlink(missing_ok=True)
+                    stats["superseded"] += 1
+            except FileNotFoundError:
+                # Rewritten or deleted since the listing
+                continue
+
+        db = SessionLocal()
+        try:
+            for model in (VideoJob, ArchivedJob):
+                for job_id, path in moved:
+                    db.execute(
+                        update(model)
+                        .where(
+                            or_(model.job_id == job_id, model.source_job_id == job_id),
+                            model.result_path.isnot(None)
+                        )
+                        .values(result_path=path)
+                    )
+            db.commit()
+        finally:
+            db.close()
+        stats["moved"] += len(moved)
+
+    return stats
+
+
+def migrate_job_directories(file_manager: FileManager, batch_size: int, dry_run: bool) -> Dict[str, int]:
+    """
+    Move flat job directories into their shards.
+
+    Args:
+        file_manager: File manager owning the upload directory
+        batch_size: Directories moved per database transaction
+        dry_run: Only count what would be moved
+
+    Returns:
+        Counts of moved, skipped (active job) and conflicting directories
+    """
+    stats = {"moved": 0, "skipped_active": 0, "conflicts": 0}
+    job_ids = _legacy_job_directories(file_manager)
+
+    for start in range(0, len(job_ids), batch_size):
+        batch = job_ids[start:start + batch_size]
+        db = SessionLocal()
+        try:
+            active = set(db.scalars(
+                select(VideoJob.job_id).where(VideoJob.job_id.in_(batch), VideoJob.status.in_(ACTIVE_STATUSES))
+            ))
+            stats["skipped_active"] += len(active)
+            if dry_run:
+                stats["moved"] += len(batch) - len(active)
+                continue
+
+            for job_id in batch:
+                if job_id in active:
+                    continue
+                sharded, legacy = file_manager.job_directory_paths(job_id)
+                try:
+                    if not _move(legacy, sharded):
+                        stats["conflicts"] += 1
+                        logger.warning(f"Not moving {legacy}: {sharded} already exists")
+                        continue
+                except FileNotFoundError:
+                    continue
+
+                db.execute(
+                    update(VideoJob)
+                    .where(VideoJob.job_id == job_id, VideoJob.video_path.isnot(None))
+                    .values(video_path=func.replace(VideoJob.video_path, str(legacy), str(sharded)))
+                )
+                stats["moved"] += 1
+            db.commit()
+        finally:
+            db.close()
+
+    return stats
+
+
+def migrate_to_sharded_layout(file_manager: FileManager, batch_size: int = 500, dry_run: bool = False) -> Dict[str, Dict[str, int]]:
+    """
+    Move all files of the flat layout into the sharded one.
+
+    Args:
+        file_manager: File manager owning the data directories
+        batch_size: Moves per database transaction
+        dry_run: Only count what would be moved
+
+    Returns:
+        Counts per tree
+    """
+    report = {
+        "results": migrate_results(file_manager, batch_size, dry_run),
+        "uploads": migrate_job_directories(file_manager, batch_size, dry_run)
+    }
+    logger.info(f"Layout migration {'(dry run) ' if dry_run else ''}finished: {report}")
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=500, help="Moves per database transaction")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be moved")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    report = migrate_to_sharded_layout(FileManager(), args.batch_size, args.dry_run)
+    for tree, counts in report.items():
+        print(f"{tree}: " + ", ".join(f"{name}={count}" for name, count in counts.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""
+Leader election for background tasks that must run in one process only.
+"""
+import os
+import time
+import uuid
+import socket
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any
+
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models import LeaderLease
+from .executors import run_blocking, io_executor
+
+logger = logging.getLogger(__name__)
+
+
+class NotLeaderError(RuntimeError):
+    """Raised when work reserved to the leader is requested from another process."""
+
+
+class LeaderElection:
+    """
+    Lease on a ``leader_leases`` row electing one process among several.
+
+    Works like the job leases: the row names its owner and an expiry,
+    the owner renews it a few times per lease, and any process may take
+    it over once it lapsed. Processes sharing the database thus agree on
+    a single leader, and a dead leader is replaced within one lease.
+    Leadership is only assumed while the last successful renewal is
+    younger than the lease, so a process cut off from the database stops
+    acting as leader before another one can take over.
+    """
+
+    def __init__(self, name: str, lease_seconds: Optional[int] = None):
+        """
+        Initialize the election.
+
+        Args:
+            name: Lease row shared by the candidates
+            lease_seconds: Seconds a lease lasts unless renewed
+        """
+        self.name = name
+        self.lease_seconds = lease_seconds or settings.job_lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+        # Monotonic time until which this process holds the lease
+        self._held_until = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_leader(self) -> bool:
+        """Whether this process currently holds the lease."""
+        return time.monotonic() < self._held_until
+
+    async def start(self):
+        """Try to take the lease now, then keep renewing or contending for it."""
+        if self._task:
+            return
+
+        try:
+            await run_blocking(io_executor, self.acquire)
+        except Exception as e:
+            logger.error(f"Error acquiring {self.name} lease: {e}")
+        self._task = asyncio.create_task(self._keeper())
+
+    async def stop(self):
+        """Stop renewing and release the lease, so another process takes over at once."""
+        if not self._task:
+            return
+
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        try:
+            await run_blocking(io_executor, self.release)
+        except Exception as e:
+            logger.error(f"Error releasing {self.name} lease: {e}")
+
+    def acquire(self) -> bool:
+        """
+        Renew the lease if held, or take it over if free or lapsed.
+
+        Returns:
+            True if this process holds the lease
+        """
+        started = time.monotonic()
+        now = datetime.utcnow()
+        values = {
+            LeaderLease.owner: self.owner,
+            LeaderLease.expires_at: now + timedelta(seconds=self.lease_seconds)
+        }
+
+        db = SessionLocal()
+        try:
+            held = (
+                db.query(LeaderLease)
+                .filter(
+                    LeaderLease.name == self.name,
+                    or_(LeaderLease.owner == self.owner, LeaderLease.expires_at < now)
+                )
+                .update(values, synchronize_session=False)
+            )
+            if not held and db.query(LeaderLease.name).filter(LeaderLease.name == self.name).first() is None:
+                # First candidate ever; a concurrent insert wins instead
+                db.add(LeaderLease(name=self.name, owner=self.owner, expires_at=values[LeaderLease.expires_at]))
+                held = 1
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            held = 0
+        finally:
+            db.close()
+
+        was_leader = self.is_leader
+        self._held_until = started + self.lease_seconds if held else 0.0
+        if held and not was_leader:
+            logger.info(f"Process {self.owner} became {self.name} leader")
+        elif was_leader and not held:
+            logger.warning(f"Process {self.owner} lost the {self.name} lease")
+        return bool(held)
+
+    def release(self):
+        """Expire the lease if this process holds it."""
+        self._held_until = 0.0
+        db = SessionLocal()
+        try:
+            db.query(LeaderLease).filter(
+                LeaderLease.name == self.name,
+                LeaderLease.owner == self.owner
+            ).update({LeaderLease.expires_at: datetime.utcnow()}, synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the lease name, this process's identity and whether it leads."""
+        return {
+            "name": self.name,
+            "owner": self.owner,
+            "leader": self.is_leader
+        }
+
+    async def _keeper(self):
+        """Renew or contend for the lease a few times per lease."""
+        interval = max(self.lease_seconds / 3, 1.0)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await run_blocking(io_executor, self.acquire)
+            except Exception as e:
+                logger.error(f"Error renewing {self.name} lease: {e}")
+
+
+def leads(leader: Optional[LeaderElection]) -> bool:
+    """
+    Whether a service should run its leader-only tasks.
+
+    Args:
+        leader: Election the service was given, or None when it runs alone
+
+    Returns:
+        True without an election or while holding its lease
+    """
+    return leader is None or leader.is_leader
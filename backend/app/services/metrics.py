@@ -0,0 +1,312 @@
+"""
+Per-stage timing metrics persisted to ``system_metrics`` in batches.
+"""
+import math
+import time
+import asyncio
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List, Iterator
+
+from sqlalchemy import delete, insert, select
+
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models import SystemMetrics
+from .executors import run_blocking, io_executor
+from .prometheus import observe_sample
+from .leader import LeaderElection, leads
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (50, 90, 99)
+
+# Seconds between deletions of samples older than the longest window
+PRUNE_INTERVAL = 3600
+# Samples deleted per transaction
+PRUNE_BATCH = 5000
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of already sorted values.
+
+    Args:
+        sorted_values: Values in ascending order (not empty)
+        pct: Percentile between 0 and 100
+
+    Returns:
+        The percentile value
+    """
+    rank = max(1, math.ceil(len(sorted_values) * pct / 100))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(values: List[float]) -> Dict[str, Any]:
+    """
+    Summarize a list of samples.
+
+    Args:
+        values: Samples (not empty)
+
+    Returns:
+        Dictionary with count, mean and percentiles
+    """
+    ordered = sorted(values)
+    summary = {"count": len(ordered), "mean": sum(ordered) / len(ordered)}
+    for pct in PERCENTILES:
+        summary[f"p{pct}"] = percentile(ordered, pct)
+    return summary
+
+
+class MetricsRecorder:
+    """
+    Buffered writer of pipeline metrics.
+
+    Stages record samples in memory from any thread; every sample also
+    feeds the Prometheus series. A background task
+    writes the buffer to ``system_metrics`` with one multi-row INSERT every
+    flush interval, or earlier once a batch is full, so instrumenting a
+    stage never adds a commit to the job's critical path. The same task
+    deletes samples older than the longest supported window once per
+    ``PRUNE_INTERVAL``, so the table stays bounded; with an election,
+    only its leader prunes.
+    """
+
+    def __init__(
+        self,
+        flush_interval: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        leader: Optional[LeaderElection] = None
+    ):
+        """
+        Initialize the recorder.
+
+        Args:
+            flush_interval: Maximum seconds a sample stays in memory
+            batch_size: Buffered samples that trigger an early flush
+            leader: Election deciding which process prunes; None prunes here
+        """
+        self.leader = leader
+        self.flush_interval = settings.metrics_flush_interval if flush_interval is None else flush_interval
+        self.batch_size = batch_size or settings.metrics_batch_size
+        self.enabled = settings.metrics_enabled
+        self.max_window = settings.metrics_max_window
+
+        self._buffer: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._pruned_at = 0.0
+        self.recorded = 0
+        self.written = 0
+        self.pruned = 0
+
+    async def start(self):
+        """Start the background flusher."""
+        if self._task or not self.enabled:
+            return
+
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._flusher())
+        logger.info("Metrics recorder started")
+
+    async def stop(self):
+        """Stop the flusher and write what is still buffered."""
+        if not self._task:
+            return
+
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        await run_blocking(io_executor, self.flush)
+        logger.info("Metrics recorder stopped")
+
+    def record(
+        self,
+        metric_name: str,
+        metric_value: float,
+        metric_unit: str = "seconds",
+        job_id: Optional[str] = None,
+        analysis_type: Optional[str] = None
+    ):
+        """
+        Buffer a sample; safe to call from any thread.
+
+        Args:
+            metric_name: Metric name, e.g. ``download_seconds``
+            metric_value: Sample value
+            metric_unit: Unit of the value
+            job_id: Job the sample belongs to
+            analysis_type: Analysis type of the job
+        """
+        observe_sample(metric_name, metric_value, analysis_type)
+        if not self.enabled:
+            return
+
+        sample = {
+            "metric_name": metric_name,
+            "metric_value": float(metric_value),
+            "metric_unit": metric_unit,
+            "job_id": job_id,
+            "analysis_type": analysis_type,
+            "timestamp": datetime.utcnow()
+        }
+        with self._lock:
+            self._buffer.append(sample)
+            self.recorded += 1
+            batch_full = len(self._buffer) >= self.batch_size
+
+        if batch_full and self._loop:
+            try:
+                self._loop.call_soon_threadsafe(self._wakeup.set)
+            except RuntimeError:
+                # Loop already closed during shutdown
+                pass
+
+    @contextmanager
+    def timer(self, metric_name: str, job_id: Optional[str] = None, analysis_type: Optional[str] = None) -> Iterator[None]:
+        """
+        Record the duration of a block that completes without raising.
+
+        Args:
+            metric_name: Metric name, e.g. ``download_seconds``
+            job_id: Job the sample belongs to
+            analysis_type: Analysis type of the job
+        """
+        started = time.perf_counter()
+        yield
+        self.record(metric_name, time.perf_counter() - started, "seconds", job_id, analysis_type)
+
+    def flush(self):
+        """Write all buffered samples in one transaction."""
+        with self._lock:
+            samples, self._buffer = self._buffer, []
+        if not samples:
+            return
+
+        db = SessionLocal()
+        try:
+            db.execute(insert(SystemMetrics), samples)
+            db.commit()
+            self.written += len(samples)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error writing {len(samples)} metrics: {e}")
+        finally:
+            db.close()
+
+    def prune(self) -> int:
+        """
+        Delete samples older than the longest supported window, in batches.
+
+        Returns:
+            Number of samples deleted
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=self.max_window)
+        deleted = 0
+        while True:
+            db = SessionLocal()
+            try:
+                expired = (
+                    select(SystemMetrics.id)
+                    .where(SystemMetrics.timestamp < cutoff)
+                    .limit(PRUNE_BATCH)
+                    .scalar_subquery()
+                )
+                batch = db.execute(delete(SystemMetrics).where(SystemMetrics.id.in_(expired))).rowcount
+                db.commit()
+            finally:
+                db.close()
+
+            deleted += batch
+            if batch < PRUNE_BATCH:
+                break
+
+        self.pruned += deleted
+        if deleted:
+            logger.info(f"Pruned {deleted} metric samples older than {self.max_window} seconds")
+        return deleted
+
+    def get_summary(self, window_seconds: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Percentiles of every metric over a sliding window.
+
+        Args:
+            window_seconds: Window length; defaults to the configured window,
+                capped at the longest supported window
+
+        Returns:
+            Dictionary with per-metric and per-analysis-type summaries
+        """
+        window_seconds = min(window_seconds or settings.metrics_window, self.max_window)
+        since = datetime.utcnow() - timedelta(seconds=window_seconds)
+
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(
+                    SystemMetrics.metric_name,
+                    SystemMetrics.metric_unit,
+                    SystemMetrics.analysis_type,
+                    SystemMetrics.metric_value
+                )
+                .filter(SystemMetrics.timestamp >= since)
+                .all()
+            )
+        finally:
+            db.close()
+
+        units: Dict[str, str] = {}
+        overall: Dict[str, List[float]] = {}
+        by_type: Dict[str, Dict[str, List[float]]] = {}
+        for metric_name, metric_unit, analysis_type, metric_value in rows:
+            units[metric_name] = metric_unit
+            overall.setdefault(metric_name, []).append(metric_value)
+            by_type.setdefault(analysis_type or "unknown", {}).setdefault(metric_name, []).append(metric_value)
+
+        return {
+            "window_seconds": window_seconds,
+            "metrics": {
+                name: {"unit": units[name], **summarize(values)}
+                for name, values in sorted(overall.items())
+            },
+            "by_analysis_type": {
+                analysis_type: {
+                    name: {"unit": units[name], **summarize(values)}
+                    for name, values in sorted(metrics.items())
+                }
+                for analysis_type, metrics in sorted(by_type.items())
+            }
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get recorder statistics."""
+        return {
+            "enabled": self.enabled,
+            "buffered": len(self._buffer),
+            "recorded": self.recorded,
+            "written": self.written,
+            "pruned": self.pruned
+        }
+
+    async def _flusher(self):
+        """Flush the buffer periodically or when a batch fills up, pruning old samples now and then."""
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await run_blocking(io_executor, self.flush)
+
+            if leads(self.leader) and time.monotonic() - self._pruned_at >= PRUNE_INTERVAL:
+                self._pruned_at = time.monotonic()
+                try:
+                    await run_blocking(io_executor, self.prune)
+                except Exception as e:
+                    logger.error(f"Error pruning metrics: {e}")
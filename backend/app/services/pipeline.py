@@ -0,0 +1,280 @@
+"""
+Stage-pipelined execution of video jobs.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .cancellation import CancellationToken, JobCancelled
+
+logger = logging.getLogger(__name__)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a job runs out of its end-to-end time budget."""
+
+    def __init__(self, stage: str, started: bool = True):
+        self.stage = stage
+        if started:
+            message = f"Deadline exceeded during stage '{stage}'"
+        else:
+            message = f"Deadline exceeded before stage '{stage}' could start"
+        super().__init__(message)
+
+
+@dataclass
+class JobContext:
+    """State handed from one pipeline stage to the next."""
+    job_id: str
+    instagram_url: str
+    analysis_type: str = "comprehensive"
+    shortcode: Optional[str] = None
+
+    # Filled in by the stages as the job moves through the pipeline; a
+    # recovered job starts with the video_path and gemini_file_name it had
+    post: Any = None
+    video_path: Optional[str] = None
+    file_size: int = 0
+    uploaded_file: Any = None
+    gemini_file_name: Optional[str] = None
+    response_text: Optional[str] = None
+    analysis_result: Optional[Dict[str, Any]] = None
+
+    # Set by a stage that already produced the final result; result_job_id
+    # names the job whose result file holds it once the job completed
+    finished: bool = False
+    result_job_id: Optional[str] = None
+    error: Optional[str] = None
+    cancel_token: Optional[CancellationToken] = field(default=None, repr=False)
+    deadline_at: Optional[datetime] = None
+    done: Optional[asyncio.Future] = field(default=None, repr=False)
+
+    def remaining_seconds(self) -> Optional[float]:
+        """Seconds left until the job's deadline, or None without one."""
+        if self.deadline_at is None:
+            return None
+        return (self.deadline_at - datetime.utcnow()).total_seconds()
+
+
+StageHandler = Callable[[JobContext], Awaitable[None]]
+FailureHandler = Callable[[JobContext, str, Exception], Awaitable[None]]
+StageStartHandler = Callable[[JobContext, str], Awaitable[None]]
+CancelHandler = Callable[[JobContext, str], Awaitable[None]]
+
+
+class PipelineStage:
+    """A pipeline stage with its own concurrency limit and hand-off queue."""
+
+    def __init__(self, name: str, handler: StageHandler, concurrency: int, queue_size: int = 0):
+        """
+        Initialize a pipeline stage.
+
+        Args:
+            name: Stage name, used for logging and stats
+            handler: Coroutine run for every job reaching the stage
+            concurrency: Maximum number of jobs in the stage at once
+            queue_size: Bound of the hand-off queue (0 for unbounded)
+        """
+        self.name = name
+        self.handler = handler
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+
+        self.queue: Optional[asyncio.Queue] = None
+        self.active = 0
+        self.processed = 0
+        self.failed = 0
+        self.cancelled = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get stage statistics."""
+        return {
+            "concurrency": self.concurrency,
+            "queued": self.queue.qsize() if self.queue else 0,
+            "active": self.active,
+            "processed": self.processed,
+            "failed": self.failed,
+            "cancelled": self.cancelled
+        }
+
+
+class JobPipeline:
+    """
+    Runs jobs through an ordered list of stages.
+
+    Every stage has its own pool of workers reading from its hand-off
+    queue, so job N+1 can be in an early stage while job N is still in a
+    later one. Bounded queues apply backpressure to upstream stages.
+
+    A job whose cancel token fires, or whose deadline passes, leaves the
+    pipeline at once: the running stage handler is abandoned and the stage
+    worker moves on to the next job.
+    """
+
+    def __init__(
+        self,
+        stages: List[PipelineStage],
+        on_failure: FailureHandler,
+        on_stage_start: Optional[StageStartHandler] = None,
+        on_cancel: Optional[CancelHandler] = None
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            stages: Stages in execution order
+            on_failure: Coroutine called when a stage raises
+            on_stage_start: Optional coroutine called when a job enters a stage
+            on_cancel: Optional coroutine called when a job is cancelled
+        """
+        self.stages = stages
+        self.on_failure = on_failure
+        self.on_stage_start = on_stage_start
+        self.on_cancel = on_cancel
+        self._workers: List[asyncio.Task] = []
+        self._running = False
+
+    async def start(self):
+        """Start the stage workers."""
+        if self._running:
+            return
+
+        self._running = True
+        for index, stage in enumerate(self.stages):
+            stage.queue = asyncio.Queue(maxsize=stage.queue_size)
+            for _ in range(stage.concurrency):
+                self._workers.append(asyncio.create_task(self._stage_worker(index)))
+
+        logger.info(
+            "Pipeline started: "
+            + ", ".join(f"{stage.name}x{stage.concurrency}" for stage in self.stages)
+        )
+
+    async def stop(self):
+        """Stop the stage workers."""
+        if not self._running:
+            return
+
+        self._running = False
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        logger.info("Pipeline stopped")
+
+    async def run(self, ctx: JobContext):
+        """
+        Submit a job to the first stage and wait until it leaves the pipeline.
+
+        Args:
+            ctx: Job context
+        """
+        ctx.done = asyncio.get_running_loop().create_future()
+        await self.stages[0].queue.put(ctx)
+        await ctx.done
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-stage statistics."""
+        return {stage.name: stage.get_stats() for stage in self.stages}
+
+    async def _stage_worker(self, index: int):
+        """
+        Worker loop for one stage.
+
+        Args:
+            index: Position of the stage in the pipeline
+        """
+        stage = self.stages[index]
+        next_stage = self.stages[index + 1] if index + 1 < len(self.stages) else None
+
+        while True:
+            ctx = await stage.queue.get()
+            stage.active += 1
+            try:
+                if ctx.cancel_token:
+                    ctx.cancel_token.raise_if_cancelled()
+                if self.on_stage_start:
+                    await self.on_stage_start(ctx, stage.name)
+                await self._run_handler(stage, ctx)
+                stage.processed += 1
+            except asyncio.CancelledError:
+                self._finish(ctx)
+                raise
+            except JobCancelled:
+                stage.cancelled += 1
+                logger.info(f"Job {ctx.job_id} cancelled in stage {stage.name}")
+                if self.on_cancel:
+                    try:
+                        await self.on_cancel(ctx, stage.name)
+                    except Exception as cancel_error:
+                        logger.error(f"Error cleaning up cancelled job {ctx.job_id}: {cancel_error}")
+                self._finish(ctx)
+                continue
+            except Exception as e:
+                stage.failed += 1
+                logger.error(f"Stage {stage.name} failed for job {ctx.job_id}: {e}")
+                try:
+                    await self.on_failure(ctx, stage.name, e)
+                except Exception as failure_error:
+                    logger.error(f"Error recording failure for job {ctx.job_id}: {failure_error}")
+                self._finish(ctx)
+                continue
+            finally:
+                stage.active -= 1
+                stage.queue.task_done()
+
+            if ctx.finished or next_stage is None:
+                self._finish(ctx)
+            else:
+                # Blocks while the next stage is saturated (backpressure)
+                await next_stage.queue.put(ctx)
+
+    async def _run_handler(self, stage: PipelineStage, ctx: JobContext):
+        """
+        Run a stage handler, abandoning it on cancellation or deadline.
+
+        Args:
+            stage: Stage to run
+            ctx: Job context
+
+        Raises:
+            JobCancelled: If the job was cancelled before the handler finished
+            DeadlineExceeded: If the job's deadline passed first
+        """
+        timeout = ctx.remaining_seconds()
+        if timeout is not None and timeout <= 0:
+            raise DeadlineExceeded(stage.name, started=False)
+
+        if ctx.cancel_token is None and timeout is None:
+            await stage.handler(ctx)
+            return
+
+        handler_task = asyncio.create_task(stage.handler(ctx))
+        waiters = {handler_task}
+        cancel_task = None
+        if ctx.cancel_token:
+            cancel_task = asyncio.create_task(ctx.cancel_token.wait())
+            waiters.add(cancel_task)
+
+        try:
+            done, _ = await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            if cancel_task:
+                cancel_task.cancel()
+            if not handler_task.done():
+                handler_task.cancel()
+                await asyncio.gather(handler_task, return_exceptions=True)
+
+        if handler_task in done:
+            handler_task.result()
+        elif cancel_task in done:
+            raise JobCancelled("Job cancelled")
+        else:
+            raise DeadlineExceeded(stage.name)
+
+    def _finish(self, ctx: JobContext):
+        """Release whoever is waiting on the job."""
+        if ctx.done and not ctx.done.done():
+            ctx.done.set_result(None)
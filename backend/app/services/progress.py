@@ -0,0 +1,201 @@
+"""
+In-memory progress registry with throttled persistence.
+"""
+import time
+import logging
+import threading
+from datetime import datetime
+from typing import Optional, Dict, Any
+
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models import VideoJob
+
+logger = logging.getLogger(__name__)
+
+
+class JobProgress:
+    """Compact progress record of a running job."""
+
+    __slots__ = (
+        "job_id", "stage", "download_progress", "analysis_progress",
+        "created_at", "started_at", "flushed_at", "dirty"
+    )
+
+    def __init__(self, job_id: str, created_at: Optional[datetime], started_at: Optional[datetime]):
+        self.job_id = job_id
+        self.stage: Optional[str] = None
+        self.download_progress = 0.0
+        self.analysis_progress = 0.0
+        self.created_at = created_at
+        self.started_at = started_at
+        self.flushed_at = time.monotonic()
+        self.dirty = False
+
+    @property
+    def progress(self) -> float:
+        """Overall progress, matching the status endpoint's formula."""
+        return (self.download_progress + self.analysis_progress) / 2
+
+
+class ProgressRegistry:
+    """
+    Progress of running jobs, kept in process memory.
+
+    Progress callbacks only touch memory. A record is written to
+    ``video_jobs`` when the job changes stage, or at most once per flush
+    interval, so a busy download no longer commits on every callback and
+    status reads for running jobs never touch the database.
+    """
+
+    def __init__(self, flush_interval: Optional[float] = None):
+        """
+        Initialize the registry.
+
+        Args:
+            flush_interval: Minimum seconds between progress writes of a job
+        """
+        self.flush_interval = settings.progress_flush_interval if flush_interval is None else flush_interval
+        self._records: Dict[str, JobProgress] = {}
+        self._lock = threading.Lock()
+        self.updates = 0
+        self.flushes = 0
+
+    def start(self, job_id: str, created_at: Optional[datetime] = None, started_at: Optional[datetime] = None) -> JobProgress:
+        """
+        Start tracking a job.
+
+        Args:
+            job_id: Unique job identifier
+            created_at: Job creation time
+            started_at: Time the job was claimed
+
+        Returns:
+            The job's progress record
+        """
+        with self._lock:
+            record = JobProgress(job_id, created_at, started_at)
+            self._records[job_id] = record
+            return record
+
+    def get(self, job_id: str) -> Optional[JobProgress]:
+        """
+        Get the progress record of a running job.
+
+        Args:
+            job_id: Unique job identifier
+
+        Returns:
+            Progress record, or None if the job is not running here
+        """
+        return self._records.get(job_id)
+
+    def discard(self, job_id: str):
+        """
+        Stop tracking a job once its final state is persisted.
+
+        Args:
+            job_id: Unique job identifier
+        """
+        with self._lock:
+            self._records.pop(job_id, None)
+
+    def update(
+        self,
+        job_id: str,
+        download_progress: Optional[float] = None,
+        analysis_progress: Optional[float] = None
+    ) -> bool:
+        """
+        Record progress in memory.
+
+        Args:
+            job_id: Unique job identifier
+            download_progress: New download progress
+            analysis_progress: New analysis progress
+
+        Returns:
+            True if the record is due to be flushed
+        """
+        with self._lock:
+            record = self._records.get(job_id)
+            if not record:
+                return False
+
+            if download_progress is not None:
+                record.download_progress = download_progress
+            if analysis_progress is not None:
+                record.analysis_progress = analysis_progress
+            record.dirty = True
+            self.updates += 1
+
+            return time.monotonic() - record.flushed_at >= self.flush_interval
+
+    def set_stage(self, job_id: str, stage: str) -> bool:
+        """
+        Record a stage transition.
+
+        Args:
+            job_id: Unique job identifier
+            stage: Name of the stage the job entered
+
+        Returns:
+            True if the record must be flushed (always, for a tracked job)
+        """
+        with self._lock:
+            record = self._records.get(job_id)
+            if not record:
+                return False
+
+            record.stage = stage
+            record.dirty = True
+            return True
+
+    def flush(self, job_id: str):
+        """
+        Persist a job's progress to ``video_jobs`` if it changed.
+
+        Args:
+            job_id: Unique job identifier
+        """
+        with self._lock:
+            record = self._records.get(job_id)
+            if not record or not record.dirty:
+                return
+            values = {
+                VideoJob.stage: record.stage,
+                VideoJob.download_progress: record.download_progress,
+                VideoJob.analysis_progress: record.analysis_progress
+            }
+            record.dirty = False
+            record.flushed_at = time.monotonic()
+
+        db = SessionLocal()
+        try:
+            db.query(VideoJob).filter(VideoJob.job_id == job_id).update(values, synchronize_session=False)
+            db.commit()
+            self.flushes += 1
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error flushing progress of job {job_id}: {e}")
+        finally:
+            db.close()
+
+    def flush_all(self):
+        """Persist every dirty record, e.g. on shutdown."""
+        for job_id in list(self._records):
+            self.flush(job_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get registry statistics.
+
+        Returns:
+            Dictionary with tracked jobs and write counters
+        """
+        return {
+            "tracked_jobs": len(self._records),
+            "updates": self.updates,
+            "flushes": self.flushes,
+            "flush_interval": self.flush_interval
+        }
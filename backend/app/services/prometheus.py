@@ -0,0 +1,172 @@
+"""
+Prometheus exporter for the backend.
+
+Counters and histograms aggregate in process memory, so an observation
+is a lock and an addition. When ``PROMETHEUS_MULTIPROC_DIR``
+is configured, every uvicorn worker writes its values to memory-mapped
+files in that directory and a scrape of any worker returns the totals of
+all of them. The directory must exist and be emptied before the workers
+start.
+"""
+import os
+import time
+import logging
+from typing import Optional, Tuple
+
+from ..core.config import settings
+
+# prometheus_client picks the multiprocess mode up when it is imported
+if settings.prometheus_multiproc_dir:
+    os.makedirs(settings.prometheus_multiproc_dir, exist_ok=True)
+    os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", settings.prometheus_multiproc_dir)
+
+from prometheus_client import (  # noqa: E402
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+)
+from prometheus_client.core import GaugeMetricFamily  # noqa: E402
+from ..core.database import SessionLocal  # noqa: E402
+from ..models import JobStatus  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time until the response headers were sent, per route",
+    ["method", "route", "status_code"]
+)
+ACTIVE_WORKERS = Gauge(
+    "job_queue_active_workers",
+    "Job queue workers currently processing a job",
+    multiprocess_mode="livesum"
+)
+STAGE_DURATION = Histogram(
+    "pipeline_stage_duration_seconds",
+    "Duration of pipeline stage work",
+    ["stage", "analysis_type"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+)
+GEMINI_LATENCY = Histogram(
+    "gemini_request_duration_seconds",
+    "Latency of Gemini uploads and generate_content calls",
+    ["operation"],
+    buckets=(0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+)
+DOWNLOAD_BYTES = Counter("instagram_download_bytes_total", "Bytes of video downloaded from Instagram")
+UPLOAD_BYTES = Counter("gemini_upload_bytes_total", "Bytes of video uploaded to Gemini")
+CACHE_LOOKUPS = Counter("analysis_cache_lookups_total", "Analysis result cache lookups", ["result"])
+RETENTION_JOBS = Counter("retention_jobs_total", "Jobs processed by a retention policy", ["policy"])
+RETENTION_RECLAIMED_BYTES = Counter("retention_reclaimed_bytes_total", "Disk bytes reclaimed by a retention policy", ["policy"])
+QUOTA_EVICTIONS = Counter("video_quota_evictions_total", "Job videos evicted to stay within the disk quota", ["reason"])
+QUOTA_RECLAIMED_BYTES = Counter("video_quota_reclaimed_bytes_total", "Disk bytes reclaimed by video quota evictions", ["reason"])
+
+# Stage metric samples that are Gemini round-trips
+_GEMINI_OPERATIONS = {"upload_seconds": "upload", "generate_seconds": "generate"}
+
+
+def observe_sample(metric_name: str, metric_value: float, analysis_type: Optional[str] = None):
+    """
+    Feed a stage metric sample into the Prometheus series.
+
+    Args:
+        metric_name: Stage metric name, e.g. ``download_seconds``
+        metric_value: Sample value
+        analysis_type: Analysis type of the job
+    """
+    if metric_name == "download_bytes":
+        DOWNLOAD_BYTES.inc(metric_value)
+    elif metric_name == "upload_bytes":
+        UPLOAD_BYTES.inc(metric_value)
+    elif metric_name.endswith("_seconds"):
+        STAGE_DURATION.labels(metric_name[:-len("_seconds")], analysis_type or "unknown").observe(metric_value)
+        operation = _GEMINI_OPERATIONS.get(metric_name)
+        if operation:
+            GEMINI_LATENCY.labels(operation).observe(metric_value)
+
+
+class JobStatsCollector:
+    """Job counts read from the database at scrape time."""
+
+    def describe(self):
+        """Skip the collect() the registry would otherwise run on register."""
+        return []
+
+    def collect(self):
+        """Yield jobs per status and the queue depth."""
+        # Imported here: job_stats -> metrics -> this module
+        from .job_stats import get_job_counts
+
+        db = SessionLocal()
+        try:
+            counts = get_job_counts(db)
+        finally:
+            db.close()
+
+        jobs = GaugeMetricFamily("video_jobs", "Video analysis jobs by status", labels=["status"])
+        for status in JobStatus:
+            jobs.add_metric([status.value], counts[status])
+        yield jobs
+
+        yield GaugeMetricFamily(
+            "job_queue_depth",
+            "Jobs waiting to be claimed by a worker",
+            value=counts[JobStatus.PENDING]
+        )
+
+
+_job_stats_collector = JobStatsCollector()
+if not settings.prometheus_multiproc_dir:
+    REGISTRY.register(_job_stats_collector)
+
+
+def render_latest() -> Tuple[bytes, str]:
+    """
+    Render all series in the Prometheus text format.
+
+    Returns:
+        Tuple of (body, content type)
+    """
+    if settings.prometheus_multiproc_dir:
+        # Aggregate the values written by every worker process
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(_job_stats_collector)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead():
+    """Drop this worker's live gauges from the multiprocess directory."""
+    if settings.prometheus_multiproc_dir:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+class PrometheusMiddleware:
+    """
+    ASGI middleware timing HTTP requests per route template.
+
+    Latency is measured until the response headers are sent, so streaming
+    responses count their time to first byte rather than their lifetime.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                route = scope.get("route")
+                HTTP_REQUEST_DURATION.labels(
+                    scope["method"],
+                    getattr(route, "path", "unmatched"),
+                    str(message["status"])
+                ).observe(time.perf_counter() - started)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,234 @@
+"""
+Analysis result cache keyed by shortcode, analysis type, model and prompt.
+"""
+import hashlib
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any
+
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models import AnalysisCacheEntry
+from .video_analyzer import VideoAnalyzer
+from .file_manager import FileManager
+from .prometheus import CACHE_LOOKUPS
+
+logger = logging.getLogger(__name__)
+
+
+class ResultCache:
+    """
+    Content-addressed cache of Gemini analysis results.
+
+    The key covers everything that determines the answer: the canonical
+    Instagram shortcode, the analysis type, the Gemini model and a hash of
+    the prompt. Changing the model or editing a prompt therefore misses
+    the cache instead of serving a stale answer.
+
+    An entry does not hold the payload: it names the job whose result file
+    holds it, and jobs served from the cache point at that same file. An
+    entry whose file is gone is dropped on lookup.
+
+    The number of entries is counted once on startup and then kept
+    running on every insert and delete, so statistics never scan the
+    table. Entries written by other worker processes are only counted
+    by this process at its next start.
+    """
+
+    def __init__(self, video_analyzer: VideoAnalyzer, file_manager: FileManager, ttl_seconds: Optional[int] = None):
+        """
+        Initialize the result cache.
+
+        Args:
+            video_analyzer: Analyzer whose model and prompts form the key
+            file_manager: File manager owning the result files entries point at
+            ttl_seconds: Entry lifetime in seconds (0 keeps entries forever)
+        """
+        self.video_analyzer = video_analyzer
+        self.file_manager = file_manager
+        self.ttl_seconds = settings.result_cache_ttl if ttl_seconds is None else ttl_seconds
+        self.enabled = settings.result_cache_enabled
+        self.hits = 0
+        self.misses = 0
+        self.entries = 0
+        self._entries_lock = threading.Lock()
+
+    def load_entry_count(self):
+        """Count the cache entries once; later changes are tracked as they happen."""
+        db = SessionLocal()
+        try:
+            entries = db.query(AnalysisCacheEntry).count()
+        finally:
+            db.close()
+        with self._entries_lock:
+            self.entries = entries
+
+    def _count_entries(self, delta: int):
+        """Adjust the running entry count."""
+        if delta:
+            with self._entries_lock:
+                self.entries = max(self.entries + delta, 0)
+
+    def make_key(self, shortcode: str, analysis_type: str) -> str:
+        """
+        Build the cache key for a post and analysis type.
+
+        Args:
+            shortcode: Canonical Instagram shortcode
+            analysis_type: Type of analysis
+
+        Returns:
+            Hex sha256 cache key
+        """
+        parts = [
+            shortcode,
+            analysis_type,
+            self.video_analyzer.model,
+            self.video_analyzer.get_prompt_hash(analysis_type)
+        ]
+        return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+    def lookup(self, shortcode: Optional[str], analysis_type: str, count_miss: bool = True) -> Optional[str]:
+        """
+        Look up a cached analysis result.
+
+        Args:
+            shortcode: Canonical Instagram shortcode
+            analysis_type: Type of analysis
+            count_miss: Count a miss in the statistics; off for a check that
+                is repeated later for the same submission
+
+        Returns:
+            Job whose result file holds the cached result, or None on a miss
+        """
+        if not self.enabled or not shortcode:
+            return None
+
+        db = SessionLocal()
+        try:
+            entry = (
+                db.query(AnalysisCacheEntry)
+                .filter(AnalysisCacheEntry.cache_key == self.make_key(shortcode, analysis_type))
+                .first()
+            )
+
+            stale = entry and (
+                (entry.expires_at and entry.expires_at <= datetime.utcnow())
+                or not entry.source_job_id
+                or not self.file_manager.has_analysis_result(entry.source_job_id)
+            )
+            if stale:
+                db.delete(entry)
+                db.commit()
+                self._count_entries(-1)
+                entry = None
+
+            if not entry:
+                self._count_miss(count_miss)
+                return None
+
+            entry.hit_count = (entry.hit_count or 0) + 1
+            db.commit()
+            self.hits += 1
+            CACHE_LOOKUPS.labels("hit").inc()
+            logger.info(f"Analysis cache hit: {shortcode} ({analysis_type})")
+            return entry.source_job_id
+
+        except Exception as e:
+            logger.error(f"Error reading analysis cache: {e}")
+            self._count_miss(count_miss)
+            return None
+        finally:
+            db.close()
+
+    def _count_miss(self, count_miss: bool):
+        """Record a miss unless the caller's lookup is repeated later."""
+        if count_miss:
+            self.misses += 1
+            CACHE_LOOKUPS.labels("miss").inc()
+
+    def store(self, shortcode: Optional[str], analysis_type: str, job_id: str):
+        """
+        Point the cache at a stored analysis result.
+
+        Args:
+            shortcode: Canonical Instagram shortcode
+            analysis_type: Type of analysis
+            job_id: Job that produced the result and owns its result file
+        """
+        if not self.enabled or not shortcode:
+            return
+
+        cache_key = self.make_key(shortcode, analysis_type)
+        expires_at = datetime.utcnow() + timedelta(seconds=self.ttl_seconds) if self.ttl_seconds else None
+
+        db = SessionLocal()
+        try:
+            entry = db.query(AnalysisCacheEntry).filter(AnalysisCacheEntry.cache_key == cache_key).first()
+            created = entry is None
+            if created:
+                entry = AnalysisCacheEntry(
+                    cache_key=cache_key,
+                    shortcode=shortcode,
+                    analysis_type=analysis_type,
+                    model=self.video_analyzer.model,
+                    prompt_hash=self.video_analyzer.get_prompt_hash(analysis_type)
+                )
+                db.add(entry)
+
+            entry.source_job_id = job_id
+            entry.expires_at = expires_at
+            db.commit()
+            if created:
+                self._count_entries(1)
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error writing analysis cache: {e}")
+        finally:
+            db.close()
+
+    def invalidate(self, shortcode: Optional[str] = None, analysis_type: Optional[str] = None) -> int:
+        """
+        Remove cache entries.
+
+        Args:
+            shortcode: Only remove entries for this shortcode
+            analysis_type: Only remove entries for this analysis type
+
+        Returns:
+            Number of removed entries
+        """
+        db = SessionLocal()
+        try:
+            query = db.query(AnalysisCacheEntry)
+            if shortcode:
+                query = query.filter(AnalysisCacheEntry.shortcode == shortcode)
+            if analysis_type:
+                query = query.filter(AnalysisCacheEntry.analysis_type == analysis_type)
+
+            removed = query.delete(synchronize_session=False)
+            db.commit()
+            self._count_entries(-removed)
+            logger.info(f"Invalidated {removed} analysis cache entries")
+            return removed
+        finally:
+            db.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics without touching the database.
+
+        Returns:
+            Dictionary with hit/miss counters and entry count
+        """
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": self.entries,
+            "ttl_seconds": self.ttl_seconds
+        }
@@ -0,0 +1,377 @@
+"""
+Retention engine for old jobs, result files and downloaded videos.
+"""
+import json
+import time
+import asyncio
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List, Set, Tuple, Callable
+
+from sqlalchemy import String, delete, insert, literal, select, tuple_, type_coerce, update
+
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models import VideoJob, JobStatus, ArchivedJob, RetentionState
+from .executors import run_blocking, io_executor
+from .file_manager import FileManager
+from .leader import LeaderElection, NotLeaderError, leads
+from .prometheus import RETENTION_JOBS, RETENTION_RECLAIMED_BYTES
+
+logger = logging.getLogger(__name__)
+
+FINISHED_STATUSES = (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+# video_jobs columns copied into video_jobs_archive
+_ARCHIVED_COLUMNS = (
+    "job_id", "batch_id", "instagram_url", "analysis_type", "shortcode", "status",
+    "created_at", "started_at", "completed_at", "error_message", "result_path", "source_job_id"
+)
+
+# (row id, job_id, status) of a job examined by a policy
+JobRow = Tuple[int, str, JobStatus]
+
+
+class RetentionManager:
+    """
+    Background sweeper applying age-based retention policies.
+
+    Every sweep runs each enabled policy over the jobs created before its
+    cutoff: ``videos`` deletes downloaded videos, ``compress`` gzips
+    result files in place and ``archive`` moves job rows to
+    ``video_jobs_archive``, keeping their result files. Jobs are read in
+    (created_at, id) order in batches of ``retention_batch_size``, each
+    written in its own short transaction, and every policy remembers
+    where it stopped, so later sweeps only look at jobs that aged past
+    the cutoff since. Jobs still pending or running when they pass a
+    cutoff are remembered by the policy and re-checked on every sweep
+    until they finish.
+
+    Watermarks and deferred jobs are kept in ``retention_state``, saved
+    after every batch and read back before every sweep, so progress
+    survives restarts and moves with the leader. With an election, only
+    its leader sweeps; other processes refuse manual sweeps.
+    """
+
+    def __init__(self, file_manager: FileManager, leader: Optional[LeaderElection] = None):
+        """
+        Initialize the retention manager.
+
+        Args:
+            file_manager: File manager owning the video and result files
+            leader: Election deciding which process sweeps; None sweeps here
+        """
+        self.file_manager = file_manager
+        self.leader = leader
+        self.enabled = settings.retention_enabled
+        self.interval = settings.retention_interval
+        self.batch_size = settings.retention_batch_size
+        self.policies: Dict[str, Tuple[int, Callable[[List[JobRow]], Tuple[int, int]]]] = {
+            "videos": (settings.retention_video_days, self._purge_videos),
+            "compress": (settings.retention_compress_days, self._compress_results),
+            "archive": (settings.retention_archive_days, self._archive_jobs),
+        }
+
+        # Last (created_at, id) examined per policy
+        self._watermarks: Dict[str, Tuple[str, int]] = {}
+        # Row ids behind the watermark that were not finished yet, per policy
+        self._deferred: Dict[str, Set[int]] = {name: set() for name in self.policies}
+        self._sweep_lock = threading.Lock()
+        self._stopping = False
+        self._task: Optional[asyncio.Task] = None
+        self.totals = {name: {"jobs": 0, "bytes": 0} for name in self.policies}
+        self.last_sweep: Optional[Dict[str, Any]] = None
+
+    async def start(self):
+        """Start the periodic sweeper."""
+        if self._task or not self.enabled:
+            return
+
+        self._stopping = False
+        self._task = asyncio.create_task(self._sweeper())
+        logger.info("Retention manager started")
+
+    async def stop(self):
+        """Stop the sweeper; a running sweep ends after its current batch."""
+        if not self._task:
+            return
+
+        self._stopping = True
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        logger.info("Retention manager stopped")
+
+    async def run_now(self) -> Dict[str, Any]:
+        """
+        Run a sweep immediately, after any sweep already in progress.
+
+        Returns:
+            Sweep report
+        """
+        if not leads(self.leader):
+            raise NotLeaderError(f"Retention sweeps run on the {self.leader.name} leader")
+        return await run_blocking(io_executor, self.sweep)
+
+    def sweep(self) -> Dict[str, Any]:
+        """
+        Apply every enabled policy once.
+
+        Returns:
+            Sweep report with jobs processed and bytes reclaimed per policy
+        """
+        with self._sweep_lock:
+            started_at = datetime.utcnow()
+            started = time.perf_counter()
+            # Another process may have swept since, as the previous leader
+            self._load_state()
+            report = {}
+            for name, (days, handler) in self.policies.items():
+                if days <= 0:
+                    continue
+                try:
+                    report[name] = self._run_policy(name, days, handler)
+                except Exception as e:
+                    logger.error(f"Retention policy {name} failed: {e}")
+                    report[name] = {"jobs": 0, "bytes": 0, "error": str(e)}
+
+            self.last_sweep = {
+                "started_at": started_at.isoformat(),
+                "duration_seconds": round(time.perf_counter() - started, 3),
+                "policies": report
+            }
+
+        reclaimed = sum(result["bytes"] for result in report.values())
+        if any(result["jobs"] for result in report.values()):
+            logger.info(f"Retention sweep reclaimed {reclaimed} bytes: {report}")
+        return self.last_sweep
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get retention policies, totals and the last sweep report."""
+        return {
+            "enabled": self.enabled,
+            "leader": leads(self.leader),
+            "interval_seconds": self.interval,
+            "policies": {name: days for name, (days, _) in self.policies.items()},
+            "deferred_jobs": {name: len(deferred) for name, deferred in self._deferred.items()},
+            "totals": self.totals,
+            "last_sweep": self.last_sweep
+        }
+
+    def _run_policy(self, name: str, days: int, handler: Callable[[List[JobRow]], Tuple[int, int]]) -> Dict[str, int]:
+        """
+        Apply a policy to every job that passed its cutoff since the last sweep.
+
+        Args:
+            name: Policy name
+            days: Age in days after which the policy applies
+            handler: Function applying the policy to a batch of jobs
+
+        Returns:
+            Jobs processed and bytes reclaimed
+        """
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        jobs = reclaimed = 0
+        deferred = self._deferred[name]
+
+        def apply(rows: List[JobRow]):
+            nonlocal jobs, reclaimed
+            finished = [row for row in rows if row[2] in FINISHED_STATUSES]
+            deferred.update(row_id for row_id, _, status in rows if status not in FINISHED_STATUSES)
+            batch_jobs, batch_bytes = handler(finished)
+            jobs += batch_jobs
+            reclaimed += batch_bytes
+            RETENTION_JOBS.labels(name).inc(batch_jobs)
+            RETENTION_RECLAIMED_BYTES.labels(name).inc(batch_bytes)
+
+        # Jobs that were still running when the watermark passed them
+        pending = sorted(deferred)
+        for start in range(0, len(pending), self.batch_size):
+            if self._stopping:
+                break
+            row_ids = pending[start:start + self.batch_size]
+            rows = self._load_rows(row_ids)
+            apply(rows)
+            # Finished now, or archived or deleted in the meantime
+            running = {row_id for row_id, _, status in rows if status not in FINISHED_STATUSES}
+            deferred.difference_update(set(row_ids) - running)
+            self._save_state(name)
+
+        while not self._stopping:
+            batch = self._next_batch(name, cutoff)
+            if not batch:
+                break
+
+            apply([(row_id, job_id, status) for row_id, job_id, status, _ in batch])
+
+            last_id, _, _, last_created_at = batch[-1]
+            self._watermarks[name] = (last_created_at, last_id)
+            self._save_state(name)
+            if len(batch) < self.batch_size:
+                break
+
+        self.totals[name]["jobs"] += jobs
+        self.totals[name]["bytes"] += reclaimed
+        return {"jobs": jobs, "bytes": reclaimed}
+
+    def _load_state(self):
+        """Read the watermarks and deferred jobs of every policy."""
+        db = SessionLocal()
+        try:
+            states = db.query(RetentionState).filter(RetentionState.policy.in_(list(self.policies))).all()
+        finally:
+            db.close()
+
+        for state in states:
+            if state.watermark_id is not None:
+                self._watermarks[state.policy] = (state.watermark_created_at, state.watermark_id)
+            self._deferred[state.policy] = set(json.loads(state.deferred))
+
+    def _save_state(self, name: str):
+        """
+        Persist a policy's watermark and deferred jobs.
+
+        Args:
+            name: Policy name
+        """
+        watermark_created_at, watermark_id = self._watermarks.get(name, (None, None))
+        db = SessionLocal()
+        try:
+            db.merge(RetentionState(
+                policy=name,
+                watermark_created_at=watermark_created_at,
+                watermark_id=watermark_id,
+                deferred=json.dumps(sorted(self._deferred[name]))
+            ))
+            db.commit()
+        finally:
+            db.close()
+
+    def _next_batch(self, name: str, cutoff: datetime) -> List[Tuple[int, str, JobStatus, str]]:
+        """
+        Read the next jobs created before the cutoff, after the policy's watermark.
+
+        Args:
+            name: Policy name
+            cutoff: Creation time before which jobs are due
+
+        Returns:
+            (row id, job_id, status, created_at as stored) per job
+        """
+        # created_at as stored, so the watermark compares exactly like ORDER BY
+        created_at_key = type_coerce(VideoJob.created_at, String).label("created_at_key")
+        query = (
+            select(VideoJob.id, VideoJob.job_id, VideoJob.status, created_at_key)
+            .where(VideoJob.created_at < cutoff)
+            .order_by(VideoJob.created_at, VideoJob.id)
+            .limit(self.batch_size)
+        )
+        watermark = self._watermarks.get(name)
+        if watermark:
+            query = query.where(
+                tuple_(VideoJob.created_at, VideoJob.id) > tuple_(literal(watermark[0], String), literal(watermark[1]))
+            )
+
+        db = SessionLocal()
+        try:
+            return [tuple(row) for row in db.execute(query).all()]
+        finally:
+            db.close()
+
+    def _load_rows(self, row_ids: List[int]) -> List[JobRow]:
+        """
+        Read the current status of jobs by row id; archived jobs are gone.
+
+        Args:
+            row_ids: Row ids of jobs in ``video_jobs``
+
+        Returns:
+            (row id, job_id, status) of the jobs still present
+        """
+        db = SessionLocal()
+        try:
+            return [
+                tuple(row) for row in
+                db.execute(select(VideoJob.id, VideoJob.job_id, VideoJob.status).where(VideoJob.id.in_(row_ids))).all()
+            ]
+        finally:
+            db.close()
+
+    def _purge_videos(self, jobs: List[JobRow]) -> Tuple[int, int]:
+        """Delete the downloaded videos of finished jobs."""
+        freed = purged = 0
+        for _, job_id, _ in jobs:
+            job_freed = self.file_manager.remove_job_directory(job_id)
+            if job_freed:
+                purged += 1
+                freed += job_freed
+
+        if jobs:
+            db = SessionLocal()
+            try:
+                db.execute(
+                    update(VideoJob)
+                    .where(VideoJob.id.in_([row_id for row_id, _, _ in jobs]), VideoJob.video_path.isnot(None))
+                    .values(video_path=None)
+                )
+                db.commit()
+            finally:
+                db.close()
+        return purged, freed
+
+    def _compress_results(self, jobs: List[JobRow]) -> Tuple[int, int]:
+        """Gzip the result files of completed jobs."""
+        saved = compressed = 0
+        for _, job_id, status in jobs:
+            if status != JobStatus.COMPLETED:
+                continue
+            job_saved = self.file_manager.compress_analysis_result(job_id)
+            if job_saved:
+                compressed += 1
+                saved += job_saved
+        return compressed, saved
+
+    def _archive_jobs(self, jobs: List[JobRow]) -> Tuple[int, int]:
+        """
+        Move finished jobs to the archive table, deleting leftover videos.
+
+        Jobs already in the archive, e.g. copied by a sweep that failed
+        before deleting them, are only deleted.
+        """
+        if not jobs:
+            return 0, 0
+
+        freed = sum(self.file_manager.remove_job_directory(job_id) for _, job_id, _ in jobs)
+        row_ids = [row_id for row_id, _, _ in jobs]
+
+        db = SessionLocal()
+        try:
+            columns = [getattr(VideoJob, column) for column in _ARCHIVED_COLUMNS]
+            db.execute(
+                insert(ArchivedJob).from_select(
+                    list(_ARCHIVED_COLUMNS),
+                    select(*columns).where(
+                        VideoJob.id.in_(row_ids),
+                        VideoJob.job_id.notin_(select(ArchivedJob.job_id))
+                    )
+                )
+            )
+            archived = db.execute(delete(VideoJob).where(VideoJob.id.in_(row_ids))).rowcount
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        return archived, freed
+
+    async def _sweeper(self):
+        """Sweep now and then every interval, while leading."""
+        while True:
+            try:
+                if leads(self.leader):
+                    await self.run_now()
+            except Exception as e:
+                logger.error(f"Retention sweep failed: {e}")
+            await asyncio.sleep(self.interval)
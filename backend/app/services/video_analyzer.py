@@ -2,6 +2,7 @@
 Video analysis service using Google Gemini API.
 """
 import os
+import hashlib
 import logging
 from pathlib import Path
 from typing import Optional, Dict, Any, Callable
@@ -22,119 +23,142 @@ class VideoAnalyzer:
         self.client = genai.Client(api_key=settings.gemini_api_key)
         self.model = "gemini-2.5-flash"
     
-    def analyze_video(
-        self, 
-        video_path: str,
-        analysis_type: str = "comprehensive",
-        progress_callback: Optional[Callable[[float], None]] = None
-    ) -> Dict[str, Any]:
-        """
-        Analyze video using Gemini API.
+    def validate_video(self, video_path: str) -> int:
+        """
+        Check that a video file exists and can be sent to Gemini.
         
         Args:
             video_path: Path to the video file
-            analysis_type: Type of analysis to perform
-            progress_callback: Optional callback for progress updates
             
         Returns:
-            Dictionary containing analysis results
+            File size in bytes
         """
-        try:
-            if progress_callback:
-                progress_callback(0.1)
-            
-            # Check if file exists and is valid
-            if not os.path.exists(video_path):
-                raise FileNotFoundError(f"Video file not found: {video_path}")
+        # Check if file exists and is valid
+        if not os.path.exists(video_path):
+            raise FileNotFoundError(f"Video file not found: {video_path}")
 
-            # Validate file is not empty
-            file_size = os.path.getsize(video_path)
-            if file_size == 0:
-                raise ValueError(f"Video file is empty: {video_path}")
+        # Validate file is not empty
+        file_size = os.path.getsize(video_path)
+        if file_size == 0:
+            raise ValueError(f"Video file is empty: {video_path}")
 
-            # Validate file extension
-            if not video_path.lower().endswith(('.mp4', '.mov', '.avi', '.mkv', '.webm')):
-                raise ValueError(f"Unsupported video format: {video_path}")
+        # Validate file extension
+        if not video_path.lower().endswith(('.mp4', '.mov', '.avi', '.mkv', '.webm')):
+            raise ValueError(f"Unsupported video format: {video_path}")
 
-            logger.info(f"Video file validated: {video_path} ({file_size} bytes)")
-            
-            if progress_callback:
-                progress_callback(0.2)
+        logger.info(f"Video file validated: {video_path} ({file_size} bytes)")
+        return file_size
+    
+    def upload_video(self, video_path: str):
+        """
+        Upload a video file to Gemini.
+        
+        Args:
+            video_path: Path to the video file
             
-            # Upload video file to Gemini
-            logger.info(f"Uploading video file: {video_path}")
-            try:
-                uploaded_file = self.client.files.upload(file=video_path)
-                logger.info(f"Successfully uploaded file to Gemini. File ID: {uploaded_file.name}")
-            except Exception as e:
-                raise RuntimeError(f"Failed to upload video to Gemini: {str(e)}")
-
-            # Wait for file to be processed
-            logger.info("Waiting for file to be processed by Gemini...")
-            import time
-            max_wait = 120  # Maximum wait time in seconds
-            wait_time = 0
-
-            while wait_time < max_wait:
-                try:
-                    file_info = self.client.files.get(name=uploaded_file.name)
-                    logger.info(f"File state: {file_info.state}")
-
-                    if file_info.state == "ACTIVE":
-                        logger.info("File is ready for processing!")
-                        break
-                    elif file_info.state == "FAILED":
-                        raise RuntimeError("File processing failed!")
-
-                    time.sleep(3)
-                    wait_time += 3
-                    logger.info(f"Waiting for file processing... ({wait_time}s/{max_wait}s)")
-                except Exception as e:
-                    logger.error(f"Error checking file status: {e}")
-                    break
-
-            if wait_time >= max_wait:
-                logger.warning("Timeout waiting for file to be processed, proceeding anyway...")
-
-            if progress_callback:
-                progress_callback(0.5)
-
-            # Generate analysis prompt based on type
-            prompt = self._get_analysis_prompt(analysis_type)
-
-            # Analyze the video
-            logger.info("Starting video analysis with Gemini")
-            try:
-                response = self.client.models.generate_content(
-                    model=self.model,
-                    contents=[uploaded_file, prompt]
-                )
-                logger.info("Successfully received response from Gemini")
-            except Exception as e:
-                raise RuntimeError(f"Failed to analyze video with Gemini: {str(e)}")
+        Returns:
+            Uploaded Gemini file
+        """
+        logger.info(f"Uploading video file: {video_path}")
+        try:
+            uploaded_file = self.client.files.upload(file=video_path)
+            logger.info(f"Successfully uploaded file to Gemini. File ID: {uploaded_file.name}")
+            return uploaded_file
+        except Exception as e:
+            raise RuntimeError(f"Failed to upload video to Gemini: {str(e)}")
+    
+    def get_file(self, file_name: str):
+        """
+        Fetch the current state of an uploaded Gemini file.
+        
+        Args:
+            file_name: Gemini file name returned by upload_video
             
-            if progress_callback:
-                progress_callback(0.9)
+        Returns:
+            Gemini file information
+        """
+        return self.client.files.get(name=file_name)
+    
+    def delete_file(self, file_name: str) -> bool:
+        """
+        Delete an uploaded file from Gemini.
+        
+        Args:
+            file_name: Gemini file name returned by upload_video
             
-            # Parse and structure the response
-            analysis_result = {
-                "analysis_type": analysis_type,
-                "model_used": self.model,
-                "file_size": file_size,
-                "raw_response": response.text,
-                "structured_analysis": self._parse_analysis_response(response.text, analysis_type)
-            }
+        Returns:
+            True if the file was deleted, False otherwise
+        """
+        try:
+            self.client.files.delete(name=file_name)
+            logger.info(f"Deleted Gemini file: {file_name}")
+            return True
+        except Exception as e:
+            logger.error(f"Error deleting Gemini file {file_name}: {e}")
+            return False
+    
+    async def generate_analysis(self, uploaded_file, analysis_type: str) -> str:
+        """
+        Run the analysis prompt against an uploaded file.
+        
+        Uses the async client, so cancelling the awaiting task (a job
+        cancel or missed deadline) aborts the request instead of leaving it
+        running on a thread.
+        
+        Args:
+            uploaded_file: Gemini file returned by upload_video
+            analysis_type: Type of analysis to perform
             
-            if progress_callback:
-                progress_callback(1.0)
+        Returns:
+            Raw response text
+        """
+        # Generate analysis prompt based on type
+        prompt = self._get_analysis_prompt(analysis_type)
+
+        # Analyze the video
+        logger.info("Starting video analysis with Gemini")
+        try:
+            response = await self.client.aio.models.generate_content(
+                model=self.model,
+                contents=[uploaded_file, prompt]
+            )
+            logger.info("Successfully received response from Gemini")
+            return response.text
+        except Exception as e:
+            raise RuntimeError(f"Failed to analyze video with Gemini: {str(e)}")
+    
+    def build_result(self, response_text: str, analysis_type: str, file_size: int) -> Dict[str, Any]:
+        """
+        Parse and structure the response.
+        
+        Args:
+            response_text: Raw response from Gemini
+            analysis_type: Type of analysis performed
+            file_size: Size of the analyzed video in bytes
             
-            logger.info("Video analysis completed successfully")
-            return analysis_result
+        Returns:
+            Dictionary containing analysis results
+        """
+        return {
+            "analysis_type": analysis_type,
+            "model_used": self.model,
+            "file_size": file_size,
+            "raw_response": response_text,
+            "structured_analysis": self._parse_analysis_response(response_text, analysis_type)
+        }
+    
+    def get_prompt_hash(self, analysis_type: str) -> str:
+        """
+        Get a stable fingerprint of the prompt used for an analysis type.
+        
+        Args:
+            analysis_type: Type of analysis to perform
             
-        except Exception as e:
-            error_msg = f"Error analyzing video: {str(e)}"
-            logger.error(error_msg)
-            raise Exception(error_msg)
+        Returns:
+            Hex sha256 of the prompt text
+        """
+        prompt = self._get_analysis_prompt(analysis_type)
+        return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
     
     def _get_analysis_prompt(self, analysis_type: str) -> str:
         """
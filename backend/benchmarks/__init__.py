@@ -0,0 +1,3 @@
+"""
+Benchmarks for the Instagram Video Analyzer backend.
+"""
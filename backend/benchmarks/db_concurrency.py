@@ -0,0 +1,222 @@
+"""
+Benchmark: job route throughput under concurrent mixed read/write load.
+
+Seeds a database with ``--rows`` jobs, then drives the job routes with
+an increasing number of concurrent clients. Every client mixes status
+lookups, paginated listings and cancellations of pending jobs. Each load
+level runs twice, once against the routes that use the async session and
+once against copies of the same handlers that use the synchronous
+``Session`` from ``get_db``, which is how the routes were served before.
+A probe measures how late a 10ms sleep wakes up throughout, so the table
+also shows how long the event loop stalls behind database work, i.e. what
+every other request, stream and WebSocket on the process waits for.
+
+With the synchronous session, a request waiting for a pooled connection
+blocks the event loop, so the requests holding the connections cannot
+finish either. Above the pool size (15 connections) sync runs stall for
+the pool timeout and show up in the errors column.
+
+Usage (from the backend directory):
+    python -m benchmarks.db_concurrency --rows 20000 --requests 600 --concurrency 1 4 8 12
+"""
+import argparse
+import asyncio
+import random
+import shutil
+import sys
+import time
+from datetime import datetime
+
+from benchmarks.stubs import configure_environment
+from benchmarks.status_latency import percentile
+
+# Seconds between event loop lag samples
+PROBE_INTERVAL = 0.01
+
+
+def build_sync_router():
+    """
+    Router with the synchronous-session versions of the benchmarked routes.
+
+    Returns:
+        APIRouter mounted under ``/sync``
+    """
+    from fastapi import APIRouter, Depends, HTTPException
+    from sqlalchemy import desc
+    from sqlalchemy.orm import Session
+
+    from app.core.database import get_db
+    from app.models import VideoJob, JobStatus
+
+    router = APIRouter(prefix="/sync")
+
+    @router.get("/jobs/")
+    async def list_jobs(page: int = 1, per_page: int = 10, db: Session = Depends(get_db)):
+        query = db.query(VideoJob)
+        total = query.count()
+        jobs = query.order_by(desc(VideoJob.created_at)).offset((page - 1) * per_page).limit(per_page).all()
+        return {"total": total, "jobs": [job.job_id for job in jobs]}
+
+    @router.get("/video/status/{job_id}")
+    async def get_job_status(job_id: str, db: Session = Depends(get_db)):
+        job = db.query(VideoJob).filter(VideoJob.job_id == job_id).first()
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return {"job_id": job.job_id, "status": job.status.value}
+
+    @router.post("/jobs/{job_id}/cancel")
+    async def cancel_job(job_id: str, db: Session = Depends(get_db)):
+        cancelled = (
+            db.query(VideoJob)
+            .filter(
+                VideoJob.job_id == job_id,
+                VideoJob.status.in_([JobStatus.PENDING, JobStatus.PROCESSING])
+            )
+            .update(
+                {VideoJob.status: JobStatus.CANCELLED, VideoJob.completed_at: datetime.utcnow()},
+                synchronize_session=False
+            )
+        )
+        db.commit()
+        if not cancelled:
+            raise HTTPException(status_code=400, detail="Cannot cancel job")
+        return {"message": "Job cancelled successfully"}
+
+    return router
+
+
+def seed(rows: int):
+    """
+    Insert completed jobs plus one pending job for every cancellation.
+
+    Args:
+        rows: Number of jobs to insert
+
+    Returns:
+        Tuple of (all job ids, pending job ids)
+    """
+    import uuid
+    from sqlalchemy import insert
+
+    from app.core.database import SessionLocal
+    from app.models import VideoJob, JobStatus
+
+    job_ids, pending = [], []
+    records = []
+    for index in range(rows):
+        job_id = str(uuid.uuid4())
+        status = JobStatus.PENDING if index % 2 else JobStatus.COMPLETED
+        records.append({
+            "job_id": job_id,
+            "instagram_url": f"https://www.instagram.com/reel/bench{index}/",
+            "status": status,
+            "analysis_type": "complete",
+            "created_at": datetime.utcnow()
+        })
+        job_ids.append(job_id)
+        if status == JobStatus.PENDING:
+            pending.append(job_id)
+
+    db = SessionLocal()
+    try:
+        db.execute(insert(VideoJob), records)
+        db.commit()
+    finally:
+        db.close()
+    return job_ids, pending
+
+
+async def run_level(client, prefix: str, concurrency: int, requests: int, job_ids, pending, write_ratio: float):
+    """
+    Run one load level against a route prefix.
+
+    Returns:
+        Tuple of (request latencies, event loop lags, errors, elapsed seconds)
+    """
+    rng = random.Random(concurrency)
+    remaining = iter(range(requests))
+    latencies, lags = [], []
+    errors = 0
+    done = asyncio.Event()
+
+    async def one_request():
+        roll = rng.random()
+        if roll < write_ratio and pending:
+            return await client.post(f"{prefix}/jobs/{pending.pop()}/cancel")
+        if roll < write_ratio + (1 - write_ratio) / 3:
+            return await client.get(f"{prefix}/jobs/", params={"page": rng.randint(1, 50)})
+        return await client.get(f"{prefix}/video/status/{rng.choice(job_ids)}")
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await one_request()
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 500:
+                errors += 1
+
+    async def probe():
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(PROBE_INTERVAL)
+            lags.append(time.perf_counter() - started - PROBE_INTERVAL)
+
+    probe_task = asyncio.create_task(probe())
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await probe_task
+    return latencies, lags, errors, elapsed
+
+
+async def run(rows: int, requests: int, levels, write_ratio: float):
+    import httpx
+    from app.main import app
+    from app.database import init_db
+    from app.core.database import async_engine
+
+    init_db()
+    app.include_router(build_sync_router())
+    job_ids, pending = seed(rows)
+
+    results = []
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for concurrency in levels:
+            for mode, prefix in (("sync", "/sync"), ("async", "/api")):
+                latencies, lags, errors, elapsed = await run_level(
+                    client, prefix, concurrency, requests, job_ids, pending, write_ratio
+                )
+                results.append((mode, concurrency, latencies, lags, errors, elapsed))
+
+    await async_engine.dispose()
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000, help="Jobs to seed")
+    parser.add_argument("--requests", type=int, default=600, help="Requests per load level and mode")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 12], help="Concurrent clients")
+    parser.add_argument("--write-ratio", type=float, default=0.2, help="Share of requests that cancel a job")
+    args = parser.parse_args()
+
+    base_dir = configure_environment()
+    try:
+        results = asyncio.run(run(args.rows, args.requests, args.concurrency, args.write_ratio))
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
+
+    print(f"{'mode':<6} {'clients':>7} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'loop lag p99 ms':>16} {'errors':>7}")
+    for mode, concurrency, latencies, lags, errors, elapsed in results:
+        lag_p99 = percentile(lags, 0.99) * 1000 if lags else 0.0
+        print(f"{mode:<6} {concurrency:>7} {len(latencies) / elapsed:>8.0f} "
+              f"{percentile(latencies, 0.50) * 1000:>8.1f} {percentile(latencies, 0.99) * 1000:>8.1f} "
+              f"{lag_p99:>16.1f} {errors:>7}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
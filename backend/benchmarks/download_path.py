@@ -0,0 +1,68 @@
+"""
+Check: a real ``InstagramDownloader.download_post`` lands in the job directory.
+
+Runs the downloader against a fake post whose HTTP transfer is stubbed,
+so Instaloader's own path formatting is exercised: several concurrent
+downloads into sharded job directories must each leave their video
+inside their own directory and nowhere else.
+
+Usage (from the backend directory):
+    python -m benchmarks.download_path --jobs 8
+"""
+import argparse
+import os
+import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.stubs import configure_environment, fake_post, install_fake_transfer
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=8, help="Concurrent downloads")
+    args = parser.parse_args()
+
+    base_dir = configure_environment()
+    cwd = os.getcwd()
+    os.chdir(base_dir)
+    try:
+        from app.services.file_manager import FileManager
+        from app.services.instagram_downloader import InstagramDownloader
+
+        file_manager = FileManager()
+        downloader = InstagramDownloader()
+        install_fake_transfer(downloader.loader, latency=0.05, video_bytes=1024)
+
+        def download(index: int):
+            job_dir = file_manager.get_job_directory(f"check-{index}")
+            post = fake_post(downloader.loader, f"check{index}")
+            return job_dir, downloader.download_post(post, str(job_dir))
+
+        with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+            results = list(pool.map(download, range(args.jobs)))
+
+        failures = []
+        for job_dir, (success, video_path, error) in results:
+            if not success:
+                failures.append(f"{job_dir}: {error}")
+            elif os.path.dirname(video_path) != str(job_dir):
+                failures.append(f"{job_dir}: video saved as {video_path}")
+
+        # Nothing may be written relative to the working directory
+        strays = [name for name in os.listdir(base_dir) if "∕" in name]
+        failures.extend(f"stray directory {name}" for name in strays)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(base_dir, ignore_errors=True)
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        return 1
+    print(f"OK: {args.jobs} downloads landed in their job directories")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
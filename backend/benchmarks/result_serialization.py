@@ -0,0 +1,123 @@
+"""
+Microbenchmark: result document serialization throughput.
+
+Builds result documents shaped like real Gemini responses (raw markdown
+answer plus the parsed sections, as produced by
+``VideoAnalyzer._parse_analysis_response``) at several response sizes
+and times each way of turning them into file contents: the previous
+``json.dump(..., indent=2)``, compact ``json``, ``orjson`` compact and
+indented, and the full ``encode_result_document`` path including gzip.
+Parsing is timed the same way.
+
+Usage (from the backend directory):
+    python -m benchmarks.result_serialization --sizes 4 32 256 --seconds 1
+"""
+import argparse
+import gzip
+import json
+import shutil
+import sys
+import time
+
+from benchmarks.stubs import configure_environment
+
+SECTIONS = (
+    "Resumo Geral", "Análise Visual", "Análise de Áudio",
+    "Temas e Mensagens", "Timestamps Importantes", "Insights e Análise"
+)
+
+PARAGRAPH = (
+    "O vídeo apresenta uma sequência de cenas em ambiente urbano, com cortes "
+    "rápidos sincronizados à trilha sonora. Aos 00:12 o apresentador aparece "
+    "em primeiro plano e explica o produto; a iluminação quente e os textos "
+    "sobrepostos reforçam a mensagem principal. "
+)
+
+
+def build_document(kilobytes: int):
+    """
+    Build a result document whose Gemini answer is about ``kilobytes`` KB.
+
+    Returns:
+        Result document as stored on disk
+    """
+    from app.services.video_analyzer import VideoAnalyzer
+
+    per_section = max(1, kilobytes * 1024 // len(SECTIONS) // len(PARAGRAPH.encode("utf-8")))
+    response_text = "\n\n".join(
+        f"**{title}**: " + PARAGRAPH * per_section for title in SECTIONS
+    )
+    analysis = {
+        "analysis_type": "comprehensive",
+        "model_used": "gemini-2.5-flash",
+        "file_size": 4_812_331,
+        "raw_response": response_text,
+        # The parser does not use the instance
+        "structured_analysis": VideoAnalyzer._parse_analysis_response(None, response_text, "comprehensive")
+    }
+    return {"job_id": "00000000-0000-4000-8000-000000000000", "timestamp": "2024-01-01T00:00:00", "analysis": analysis}
+
+
+def measure(fn, seconds: float):
+    """
+    Call ``fn`` repeatedly for about ``seconds``.
+
+    Returns:
+        Mean seconds per call
+    """
+    calls = 0
+    started = time.perf_counter()
+    deadline = started + seconds
+    while True:
+        fn()
+        calls += 1
+        now = time.perf_counter()
+        if now >= deadline:
+            return (now - started) / calls
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[4, 32, 256], help="Gemini answer sizes in KB")
+    parser.add_argument("--seconds", type=float, default=1.0, help="Time spent per measurement")
+    args = parser.parse_args()
+
+    base_dir = configure_environment()
+    try:
+        from app.services.file_manager import orjson, encode_result_document, loads_json
+
+        if orjson is None:
+            print("orjson is not installed; its rows fall back to json")
+
+        print(f"{'answer':>7} {'method':<22} {'out KB':>8} {'us/op':>10} {'MB/s':>8}")
+        for kilobytes in args.sizes:
+            document = build_document(kilobytes)
+            pretty = json.dumps(document, indent=2, ensure_ascii=False).encode("utf-8")
+            stored = encode_result_document(document)
+            reference = len(pretty)
+
+            encoders = {
+                "json indent=2 (old)": lambda: json.dumps(document, indent=2, ensure_ascii=False).encode("utf-8"),
+                "json compact": lambda: json.dumps(document, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+                "orjson compact": lambda: orjson.dumps(document) if orjson else b"",
+                "orjson indent=2": lambda: orjson.dumps(document, option=orjson.OPT_INDENT_2) if orjson else b"",
+                "encode + gzip (new)": lambda: encode_result_document(document),
+                "json.loads (old)": lambda: json.loads(pretty),
+                "load + gunzip (new)": lambda: loads_json(gzip.decompress(stored)),
+            }
+            for name, fn in encoders.items():
+                if name.startswith("orjson") and orjson is None:
+                    continue
+                output = fn()
+                size = len(output) if isinstance(output, bytes) else len(stored if "new" in name else pretty)
+                per_call = measure(fn, args.seconds)
+                # Throughput relative to the old pretty-printed document size
+                print(f"{kilobytes:>5}KB {name:<22} {size / 1024:>8.1f} {per_call * 1e6:>10.1f} "
+                      f"{reference / per_call / 1e6:>8.1f}")
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""
+Regression benchmark: status endpoint latency while jobs are running.
+
+Submits N jobs against stub services whose calls block for ``--latency``
+seconds, then polls ``GET /api/video/status/{job_id}`` and ``/health``
+until every job finishes. Exits non-zero if the p99 latency exceeds
+``--threshold-ms``, i.e. if blocking work leaked onto the event loop.
+
+Usage (from the backend directory):
+    python -m benchmarks.status_latency --jobs 20 --threshold-ms 100
+"""
+import argparse
+import asyncio
+import shutil
+import statistics
+import sys
+import time
+
+from benchmarks.stubs import configure_environment, install_stub_services
+
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of a list of samples."""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+async def run(jobs: int, latency: float, timeout: float):
+    import httpx
+    from app.main import app
+    from app.services import job_processor
+
+    install_stub_services(job_processor, latency=latency)
+
+    samples = []
+    failed = set()
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            job_ids = []
+            for index in range(jobs):
+                response = await client.post(
+                    "/api/video/analyze",
+                    json={"instagram_url": f"https://www.instagram.com/reel/bench{index}/"}
+                )
+                response.raise_for_status()
+                job_ids.append(response.json()["job_id"])
+
+            deadline = time.monotonic() + timeout
+            pending = set(job_ids)
+            while pending and time.monotonic() < deadline:
+                for job_id in list(pending):
+                    started = time.perf_counter()
+                    response = await client.get(f"/api/video/status/{job_id}")
+                    samples.append(time.perf_counter() - started)
+                    status = response.json()["status"]
+                    if status in ("completed", "failed", "cancelled"):
+                        pending.discard(job_id)
+                    if status == "failed":
+                        failed.add(job_id)
+
+                started = time.perf_counter()
+                await client.get("/health")
+                samples.append(time.perf_counter() - started)
+                await asyncio.sleep(0.05)
+
+    return samples, pending, failed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=20, help="Number of jobs to run")
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds each stubbed call blocks")
+    parser.add_argument("--threshold-ms", type=float, default=100.0, help="Maximum allowed p99 latency")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Give up after this many seconds")
+    args = parser.parse_args()
+
+    base_dir = configure_environment()
+    try:
+        samples, pending, failed = asyncio.run(run(args.jobs, args.latency, args.timeout))
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
+
+    p50 = percentile(samples, 0.50) * 1000
+    p99 = percentile(samples, 0.99) * 1000
+    print(f"requests: {len(samples)}  mean: {statistics.mean(samples) * 1000:.1f}ms  "
+          f"p50: {p50:.1f}ms  p99: {p99:.1f}ms  max: {max(samples) * 1000:.1f}ms")
+
+    if pending:
+        print(f"FAIL: {len(pending)} jobs did not finish")
+        return 1
+    if failed:
+        print(f"FAIL: {len(failed)} jobs failed")
+        return 1
+    if p99 > args.threshold_ms:
+        print(f"FAIL: p99 {p99:.1f}ms exceeds {args.threshold_ms:.1f}ms")
+        return 1
+
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+Stub Instagram and Gemini services for benchmarks.
+
+The stubs keep the real call signatures but replace network calls with
+blocking sleeps, which is exactly the behaviour that must not leak onto
+the event loop. Gemini generation runs on the async client, so its stub
+awaits instead. Downloads still go through the real
+``InstagramDownloader.download_post`` and Instaloader's file layout; only
+the HTTP transfer underneath is faked.
+"""
+import io
+import os
+import shutil
+import asyncio
+import tempfile
+import time
+from types import SimpleNamespace
+
+
+def configure_environment() -> str:
+    """
+    Point the settings at a throwaway database and data directories.
+
+    Must run before anything under ``app`` is imported.
+
+    Returns:
+        Path of the temporary directory
+    """
+    base_dir = tempfile.mkdtemp(prefix="analyzer-bench-")
+    os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{base_dir}/bench.db")
+    os.environ.setdefault("UPLOAD_DIR", f"{base_dir}/videos")
+    os.environ.setdefault("RESULTS_DIR", f"{base_dir}/results")
+    os.environ.setdefault("TEMP_DIR", f"{base_dir}/temp")
+    os.environ.setdefault("BLOB_DIR", f"{base_dir}/blobs")
+    os.environ.setdefault("LOG_FILE", f"{base_dir}/app.log")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ.setdefault("DEBUG", "false")
+    os.environ.setdefault("QUEUE_POLL_INTERVAL", "0.1")
+    os.environ.setdefault("GEMINI_FILE_POLL_INTERVAL", "0.1")
+    return base_dir
+
+
+def fake_post(loader, shortcode: str):
+    """
+    Build an Instaloader video post without asking Instagram for it.
+
+    Args:
+        loader: Instaloader whose context the post belongs to
+        shortcode: Post shortcode
+
+    Returns:
+        Post carrying every field ``Instaloader.download_post`` reads
+    """
+    from instaloader import Post
+
+    return Post(loader.context, {
+        "id": "1",
+        "shortcode": shortcode,
+        "__typename": "GraphVideo",
+        "is_video": True,
+        "video_url": f"https://cdn.invalid/{shortcode}.mp4",
+        "display_url": f"https://cdn.invalid/{shortcode}.jpg",
+        "taken_at_timestamp": 1700000000,
+        "edge_media_to_caption": {"edges": [{"node": {"text": "benchmark"}}]},
+        "owner": {"id": "1", "username": "benchmark"}
+    })
+
+
+def install_fake_transfer(loader, latency: float = 0.0, video_bytes: int = 1_000_000):
+    """
+    Replace the HTTP transfer of an Instaloader with a blocking stub.
+
+    Args:
+        loader: Instaloader whose context is patched; copies share it
+        latency: Seconds each transfer blocks for
+        video_bytes: Size of the fake downloaded video
+    """
+    def get_raw(url, *args, **kwargs):
+        time.sleep(latency)
+        return SimpleNamespace(headers={"Content-Type": "video/mp4"}, raw=io.BytesIO(os.urandom(video_bytes)))
+
+    def write_raw(response, filename):
+        with open(filename, "wb") as f:
+            shutil.copyfileobj(response.raw, f)
+
+    loader.context.get_raw = get_raw
+    loader.context.write_raw = write_raw
+
+
+def install_stub_services(job_processor, latency: float = 0.5, video_bytes: int = 1_000_000):
+    """
+    Replace the network-bound service methods with blocking stubs.
+
+    Args:
+        job_processor: The ``app.services.job_processor`` module
+        latency: Seconds each stubbed network call blocks for
+        video_bytes: Size of the fake downloaded video
+    """
+    downloader = job_processor.instagram_downloader
+    analyzer = job_processor.video_analyzer
+
+    def get_post_info(instagram_url):
+        time.sleep(latency / 5)
+        return {"shortcode": downloader.extract_shortcode_from_url(instagram_url), "is_video": True}
+
+    def fetch_post(instagram_url, *args, **kwargs):
+        time.sleep(latency)
+        shortcode = downloader.extract_shortcode_from_url(instagram_url)
+        return fake_post(downloader.loader, shortcode), None
+
+    def upload_video(video_path, *args, **kwargs):
+        time.sleep(latency)
+        return SimpleNamespace(name=f"files/{os.path.basename(video_path)}", state="ACTIVE")
+
+    def get_file(file_name, *args, **kwargs):
+        time.sleep(latency / 10)
+        return SimpleNamespace(name=file_name, state="ACTIVE")
+
+    def delete_file(file_name, *args, **kwargs):
+        time.sleep(latency / 10)
+        return True
+
+    async def generate_analysis(uploaded_file, analysis_type, *args, **kwargs):
+        await asyncio.sleep(latency)
+        return "**Resumo Geral**: benchmark\n" + "palavra " * 2000
+
+    downloader.get_post_info = get_post_info
+    downloader.fetch_post = fetch_post
+    install_fake_transfer(downloader.loader, latency, video_bytes)
+    analyzer.upload_video = upload_video
+    analyzer.get_file = get_file
+    analyzer.delete_file = delete_file
+    analyzer.generate_analysis = generate_analysis
@@ -1,3 +1,4 @@
+import { useEffect, useState } from 'react'
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
 import { 
   videoApi, 
@@ -58,55 +59,92 @@ export const useAnalyzeVideo = () => {
 }
 
 // Job Status
+const isFinalStatus = (status?: string) =>
+  status === 'completed' || status === 'failed' || status === 'cancelled'
+
 export const useJobStatus = (jobId: string | null, enabled = true) => {
   const { updateHistoryItem, setCurrentAnalysis } = useAppStore()
   const { toast } = useToast()
+  const queryClient = useQueryClient()
+  const [streaming, setStreaming] = useState(false)
+
+  const handleStatus = (data: JobStatusResponse) => {
+    // Update history
+    updateHistoryItem(data.job_id, {
+      status: data.status,
+      completed_at: data.completed_at,
+    })
+
+    // If completed, set the analysis result
+    if (data.status === 'completed' && data.analysis_result) {
+      setCurrentAnalysis(data.analysis_result)
+      toast({
+        title: "Análise Concluída",
+        description: "A análise do vídeo foi concluída com sucesso!",
+        variant: "success",
+      })
+    }
+
+    // If failed, show error
+    if (data.status === 'failed') {
+      toast({
+        title: "Análise Falhou",
+        description: data.error_message || "Erro durante a análise",
+        variant: "destructive",
+      })
+    }
+  }
+
+  // Live updates over Server-Sent Events; polling is only the fallback
+  useEffect(() => {
+    if (!enabled || !jobId || typeof EventSource === 'undefined') {
+      return
+    }
+
+    const source = videoApi.streamJobStatus(jobId)
+    setStreaming(true)
+
+    source.onmessage = (message: MessageEvent) => {
+      const previous = queryClient.getQueryData<JobStatusResponse>(['job-status', jobId])
+      const data = { ...previous, ...JSON.parse(message.data) } as JobStatusResponse
+      queryClient.setQueryData(['job-status', jobId], data)
+
+      if (isFinalStatus(data.status)) {
+        source.close()
+        handleStatus(data)
+      }
+    }
+    source.onerror = () => {
+      source.close()
+      setStreaming(false)
+    }
+
+    return () => {
+      source.close()
+      setStreaming(false)
+    }
+  }, [jobId, enabled])
 
   return useQuery({
     queryKey: ['job-status', jobId],
     queryFn: () => videoApi.getJobStatus(jobId!),
     enabled: enabled && !!jobId,
     refetchInterval: (data) => {
-      // Stop polling if job is completed or failed
-      if (data?.status === 'completed' || data?.status === 'failed') {
+      // Stop polling if job is finished or the event stream is live
+      if (isFinalStatus(data?.status) || streaming) {
         return false
       }
       return 3000 // Poll every 3 seconds
     },
-    onSuccess: (data: JobStatusResponse) => {
-      // Update history
-      updateHistoryItem(data.job_id, {
-        status: data.status,
-        completed_at: data.completed_at,
-      })
-
-      // If completed, set the analysis result
-      if (data.status === 'completed' && data.analysis_result) {
-        setCurrentAnalysis(data.analysis_result)
-        toast({
-          title: "Análise Concluída",
-          description: "A análise do vídeo foi concluída com sucesso!",
-          variant: "success",
-        })
-      }
-
-      // If failed, show error
-      if (data.status === 'failed') {
-        toast({
-          title: "Análise Falhou",
-          description: data.error_message || "Erro durante a análise",
-          variant: "destructive",
-        })
-      }
-    },
+    onSuccess: handleStatus,
   })
 }
 
 // Jobs List
-export const useJobsList = (page = 0, perPage = 20) => {
+export const useJobsList = (after?: string, perPage = 20) => {
   return useQuery({
-    queryKey: ['jobs', page, perPage],
-    queryFn: () => jobsApi.getJobs(page, perPage),
+    queryKey: ['jobs', after ?? null, perPage],
+    queryFn: () => jobsApi.listJobs(1, perPage, undefined, after),
     staleTime: 30000, // Consider data fresh for 30 seconds
   })
 }
@@ -23,7 +23,7 @@ import { ptBR } from 'date-fns/locale'
 
 const Dashboard: React.FC = () => {
   const { data: stats } = useSystemStats()
-  const { data: jobsList } = useJobsList(0, 5) // Get last 5 jobs
+  const { data: jobsList } = useJobsList(undefined, 5) // Get last 5 jobs
   const { setCurrentJobId, setCurrentAnalysis } = useAppStore()
 
   const handleJobCreated = (jobId: string) => {
@@ -26,9 +26,17 @@ const History: React.FC = () => {
   const [searchTerm, setSearchTerm] = useState('')
   const [statusFilter, setStatusFilter] = useState<string>('all')
   const [currentPage, setCurrentPage] = useState(0)
+  // Cursor that starts each visited page; the first page has none
+  const [pageCursors, setPageCursors] = useState<(string | undefined)[]>([undefined])
   const perPage = 10
 
-  const { data: jobsList, isLoading, error } = useJobsList(currentPage, perPage)
+  const { data: jobsList, isLoading, error } = useJobsList(pageCursors[currentPage], perPage)
+
+  const goToNextPage = () => {
+    if (!jobsList?.next_cursor) return
+    setPageCursors([...pageCursors.slice(0, currentPage + 1), jobsList.next_cursor])
+    setCurrentPage(currentPage + 1)
+  }
 
   const getStatusIcon = (status: string) => {
     switch (status) {
@@ -273,8 +281,8 @@ const History: React.FC = () => {
                   <Button
                     variant="outline"
                     size="sm"
-                    onClick={() => setCurrentPage(currentPage + 1)}
-                    disabled={(currentPage + 1) * perPage >= jobsList.total}
+                    onClick={goToNextPage}
+                    disabled={!jobsList.next_cursor}
                   >
                     Próximo
                   </Button>
@@ -53,6 +53,11 @@ export const videoApi = {
     const response = await api.get(`/video/status/${jobId}`);
     return response.data;
   },
+
+  // Open a Server-Sent Events stream of job status updates
+  streamJobStatus: (jobId: string): EventSource => {
+    return new EventSource(`/api/video/stream/${jobId}`);
+  },
 };
 
 // Jobs Management API
@@ -61,7 +66,8 @@ export const jobsApi = {
   listJobs: async (
     page: number = 1,
     perPage: number = 10,
-    status?: string
+    status?: string,
+    after?: string
   ): Promise<JobListResponse> => {
     const params = new URLSearchParams({
       page: page.toString(),
@@ -72,6 +78,11 @@ export const jobsApi = {
       params.append('status', status);
     }
 
+    // Cursor of the previous page's last job; takes precedence over page
+    if (after) {
+      params.append('after', after);
+    }
+
     const response = await api.get(`/jobs?${params.toString()}`);
     return response.data;
   },
@@ -14,6 +14,7 @@ export interface JobStatusResponse {
   job_id: string;
   status: string;
   progress: number;
+  stage?: string;
   created_at?: string;
   started_at?: string;
   completed_at?: string;
@@ -60,6 +61,7 @@ export interface JobListResponse {
   total: number;
   page: number;
   per_page: number;
+  next_cursor: string | null;
 }
 
 export interface SystemStatsResponse {
@@ -68,6 +70,16 @@ export interface SystemStatsResponse {
   processing_jobs: number;
   completed_jobs: number;
   failed_jobs: number;
+  cancelled_jobs: number;
+  success_rate: number;
+  average_processing_time: number | null;
+  processing_time: {
+    count: number;
+    mean: number;
+    p50: number;
+    p90: number;
+    p99: number;
+  } | null;
   disk_usage: {
     [key: string]: {
       path: string;
@@ -40,6 +40,7 @@ logger = logging.getLogger(__name__)
 # Configurações do servidor
 API_BASE_URL = "http://localhost:8000"
 REQUEST_TIMEOUT = 300.0  # 5 minutos
+JOB_DEADLINE = 300  # prazo do job no backend, igual à espera máxima do cliente
 MAX_RETRIES = 3
 
 # Modelos Pydantic para validação
@@ -62,14 +63,33 @@ class JobStatusResponse(BaseModel):
     error_message: Optional[str] = None
     analysis_result: Optional[Dict[str, Any]] = None
 
+class ProcessingTimeStats(BaseModel):
+    """Modelo para a distribuição do tempo de processamento (segundos)"""
+    count: int
+    mean: float
+    p50: float
+    p90: float
+    p99: float
+
 class SystemStats(BaseModel):
     """Modelo para estatísticas do sistema"""
+    # Contadores por status mantidos pelo backend
     total_jobs: int
+    pending_jobs: int
+    processing_jobs: int
     completed_jobs: int
     failed_jobs: int
-    pending_jobs: int
+    cancelled_jobs: int
     success_rate: float
     average_processing_time: Optional[float] = None
+    processing_time: Optional[ProcessingTimeStats] = None
+    # Seções detalhadas: disco, fila, cache, progresso, retenção e cota
+    disk_usage: Dict[str, Any] = Field(default_factory=dict)
+    queue: Dict[str, Any] = Field(default_factory=dict)
+    cache: Dict[str, Any] = Field(default_factory=dict)
+    progress: Dict[str, Any] = Field(default_factory=dict)
+    retention: Dict[str, Any] = Field(default_factory=dict)
+    quota: Dict[str, Any] = Field(default_factory=dict)
 
 # Cliente HTTP global
 http_client: Optional[httpx.AsyncClient] = None
@@ -150,7 +170,9 @@ async def analyze_instagram_video(
         # Fazer requisição para API
         payload = {
             "instagram_url": url,
-            "analysis_type": analysis_type
+            "analysis_type": analysis_type,
+            # O backend falha o job em vez de continuar depois que paramos de esperar
+            "deadline_seconds": JOB_DEADLINE
         }
         
         response = await http_client.post("/api/video/analyze", json=payload)
@@ -163,7 +185,7 @@ async def analyze_instagram_video(
             
             # Aguardar conclusão da análise
             await ctx.info("⏳ Aguardando conclusão da análise...")
-            final_result = await _wait_for_completion(job_id, ctx)
+            final_result = await _wait_for_completion(job_id, ctx, max_wait=JOB_DEADLINE)
             
             return {
                 "success": True,
@@ -221,6 +243,7 @@ async def get_job_status(job_id: str, *, ctx: Context) -> Dict[str, Any]:
 async def list_recent_analyses(
     limit: int = 10,
     page: int = 1,
+    after: Optional[str] = None,
     *,
     ctx: Context
 ) -> Dict[str, Any]:
@@ -230,6 +253,7 @@ async def list_recent_analyses(
     Args:
         limit: Número máximo de análises a retornar (padrão: 10)
         page: Página para paginação (padrão: 1)
+        after: Cursor `next_cursor` da página anterior; mais rápido que `page` em páginas profundas
         
     Returns:
         Lista de análises recentes
@@ -238,6 +262,8 @@ async def list_recent_analyses(
     
     try:
         params = {"per_page": limit, "page": page}
+        if after:
+            params["after"] = after
         response = await http_client.get("/api/jobs", params=params)
         
         if response.status_code == 200:
@@ -414,10 +440,86 @@ async def get_system_statistics() -> str:
 # FUNÇÕES AUXILIARES
 # ============================================================================
 
+class _StreamUnavailable(Exception):
+    """O backend não ofereceu (ou encerrou) o stream de eventos do job"""
+
+
 async def _wait_for_completion(job_id: str, ctx: Context, max_wait: int = 300) -> Dict[str, Any]:
     """
     Aguarda a conclusão de um job.
     
+    Usa o stream SSE do backend, que entrega o resultado assim que o job
+    termina; recorre a polling se o stream não estiver disponível.
+    
+    Args:
+        job_id: ID do job
+        ctx: Contexto para logging
+        max_wait: Tempo máximo de espera em segundos
+        
+    Returns:
+        Resultado da análise
+    """
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    
+    try:
+        return await asyncio.wait_for(_stream_until_complete(job_id, ctx), timeout=max_wait)
+    except asyncio.TimeoutError:
+        await ctx.error("Timeout aguardando conclusão da análise")
+        raise Exception("Timeout aguardando conclusão da análise")
+    except _StreamUnavailable as e:
+        await ctx.debug(f"Stream indisponível ({e}), usando polling")
+    
+    remaining = max(0, int(max_wait - (loop.time() - started)))
+    return await _poll_until_complete(job_id, ctx, remaining)
+
+
+async def _stream_until_complete(job_id: str, ctx: Context) -> Dict[str, Any]:
+    """
+    Acompanha um job pelo stream SSE até o estado final.
+    
+    Args:
+        job_id: ID do job
+        ctx: Contexto para logging
+        
+    Returns:
+        Resultado da análise
+    """
+    try:
+        async with http_client.stream("GET", f"/api/video/stream/{job_id}") as response:
+            if response.status_code != 200:
+                raise _StreamUnavailable(f"status {response.status_code}")
+            
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                
+                event = json.loads(line[len("data:"):])
+                status = event.get("status")
+                await ctx.debug(
+                    f"Status: {status}, Etapa: {event.get('stage')}, Progresso: {event.get('progress', 0)}"
+                )
+                
+                if status == "completed":
+                    await ctx.info("🎉 Análise concluída com sucesso!")
+                    return event.get("analysis_result") or {}
+                elif status == "failed":
+                    error = event.get("error_message", "Erro desconhecido")
+                    await ctx.error(f"Análise falhou: {error}")
+                    raise Exception(f"Análise falhou: {error}")
+                elif status == "cancelled":
+                    await ctx.error("Análise cancelada")
+                    raise Exception("Análise cancelada")
+    except httpx.HTTPError as e:
+        raise _StreamUnavailable(str(e))
+    
+    raise _StreamUnavailable("stream encerrado antes da conclusão")
+
+
+async def _poll_until_complete(job_id: str, ctx: Context, max_wait: int) -> Dict[str, Any]:
+    """
+    Aguarda a conclusão de um job consultando o status periodicamente.
+    
     Args:
         job_id: ID do job
         ctx: Contexto para logging